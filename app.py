@@ -1,35 +1,40 @@
-from flask import Flask, render_template, request, jsonify, send_file, flash, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, send_file, flash, redirect, url_for
 import os
-import json
 import csv
+import mimetypes
 from datetime import datetime
 import threading
 import time
 from werkzeug.utils import secure_filename
-import pandas as pd
 
-# Import the scraper modules
-from integrated_scraper import (
-    create_driver, scroll_to_load_results, count_available_results,
-    scrape_results, save_to_csv, save_to_json, convert_scraped_data_to_dict_format
+# Selenium (integrated_scraper, tiling, free_email_extractor), openai (email_sender)
+# and the extractors are imported inside the routes that use them, so the web UI
+# starts without loading them
+from driver_pool import get_driver_pool
+from place_index import get_place_index
+from checkpoint import Checkpoint, list_checkpoints
+from output_writers import LIST_CARD_FIELDS, open_writer, row_to_place
+from results_store import get_results_store, parse_run_source
+from job_manager import get_job_manager
+from events import get_event_bus, stream_events
+from progress import ProgressTracker
+from enrichment import EnrichmentMerger, write_enriched_copy
+from data_cache import file_signature, get_data_cache, make_etag, select_places
+from downloads import (
+    EXPORT_MIMETYPES, PRECOMPRESSED_FORMATS, check_export_format, choose_encoding, compress_chunks, export_chunks,
+    iter_file,
+)
+from browser_profiles import get_profile_stats, measure_page_load, record_page_load, resolve_profile
+from config import (
+    BROWSER_CONFIG, DOWNLOAD_CONFIG, ENRICHMENT_CONFIG, JOB_CONFIG, PLACE_INDEX_CONFIG, PREVIEW_CONFIG,
+    SELENIUM_CONFIG,
 )
-from email_extractor import EmailExtractor
-from free_email_extractor import FreeEmailExtractor
-from email_sender import EmailSender
-from config import BROWSER_CONFIG, SELENIUM_CONFIG
 
 app = Flask(__name__)
 app.secret_key = 'your-secret-key-here'  # Change this in production
 
-# Global variables to store scraping status and results
-scraping_status = {
-    'is_running': False,
-    'progress': 0,
-    'message': '',
-    'results': [],
-    'total_found': 0,
-    'scraped_count': 0
-}
+# Scrapes run as queued background jobs, each with its own status and results
+job_manager = get_job_manager()
 
 # Global email sender instance
 email_sender = None
@@ -54,146 +59,380 @@ def email_page():
     data_dir = 'data'
     if os.path.exists(data_dir):
         for file in os.listdir(data_dir):
-            if file.endswith(('.csv', '.json')) and 'scraped_data' in file:
+            if (file.endswith(('.csv', '.json', '.jsonl')) and 'scraped_data' in file
+                    and not file.endswith(ENRICHMENT_CONFIG['sidecar_suffix']) and '_enriched.' not in file):
                 data_files.append(file)
     
-    return render_template('email.html', data_files=data_files)
-
-@app.route('/api/start-scraping', methods=['POST'])
-def start_scraping():
-    """API endpoint to start scraping process"""
-    global scraping_status
-    
-    if scraping_status['is_running']:
-        return jsonify({'error': 'Scraping is already running'}), 400
+    # Runs in the results store are offered as 'run:<id>' sources
+    data_runs = [run for run in get_results_store().list_runs() if run['places']]
     
-    data = request.get_json()
+    return render_template('email.html', data_files=data_files, data_runs=data_runs)
+
+# Scrape settings journaled in the checkpoint; a resumed run restores every one of them
+RESUMED_SETTINGS = ('max_results', 'workers', 'navigation_mode', 'parse_engine', 'streaming', 'list_only',
+                    'browser_profile', 'tile_area', 'tile_zoom', 'known_places')
+
+def _parse_scrape_request(data):
+    """
+    Read scrape parameters from a request body
+
+    Returns:
+        dict: Keyword arguments for run_scraping
+
+    Raises:
+        ValueError: If no search query is given
+        FileNotFoundError: If the run to resume has no checkpoint
+    """
+    data = data or {}
+    params = {
+        'search_query': data.get('search_query', '').replace(' ', '+'),
+        'browser_type': data.get('browser_type', 'firefox'),
+        'headless_mode': data.get('headless_mode', False),
+        'storage_format': data.get('storage_format', 'csv'),
+        'email_extraction': data.get('email_extraction', 'skip'),
+        'perplexity_api_key': data.get('perplexity_api_key', ''),
+        'max_results': data.get('max_results', 50),
+        'workers': max(1, int(data.get('workers', 1))),
+        'navigation_mode': data.get('navigation_mode', 'click'),
+        'parse_engine': data.get('parse_engine', 'live'),
+        'streaming': bool(data.get('streaming', False)),
+        'list_only': bool(data.get('list_only', False)) or data.get('navigation_mode') == 'list',
+        'browser_profile': resolve_profile(data.get('browser_profile')),
+        'tile_area': (data.get('tile_area') or '').strip() or None,
+        'tile_zoom': int(data.get('tile_zoom') or 0) or None,
+        'known_places': data.get('known_places', PLACE_INDEX_CONFIG['known_places']),
+        'resume_run_id': data.get('resume_run_id') or None,
+    }
     
-    # Extract parameters
-    search_query = data.get('search_query', '').replace(' ', '+')
-    browser_type = data.get('browser_type', 'firefox')
-    headless_mode = data.get('headless_mode', False)
-    storage_format = data.get('storage_format', 'csv')
-    email_extraction = data.get('email_extraction', 'skip')
-    perplexity_api_key = data.get('perplexity_api_key', '')
-    max_results = data.get('max_results', 50)
+    if params['resume_run_id']:
+        # A resumed run keeps the query and settings it was started with
+        settings = Checkpoint.load(params['resume_run_id']).settings
+        params['search_query'] = settings['search_query']
+        for name in RESUMED_SETTINGS:
+            params[name] = settings.get(name, params[name])  # Older journals lack some settings
     
-    if not search_query:
-        return jsonify({'error': 'Search query is required'}), 400
+    if not params['search_query']:
+        raise ValueError('Search query is required')
+    return params
+
+def _submit_scrape():
+    """Queue a scrape job from the request body and return the API response"""
+    try:
+        params = _parse_scrape_request(request.get_json(silent=True))
+    except FileNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    # Reset status
-    scraping_status = {
-        'is_running': True,
-        'progress': 0,
-        'message': 'Initializing scraper...',
-        'results': [],
-        'total_found': 0,
-        'scraped_count': 0
-    }
+    job = job_manager.submit(run_scraping, 'scrape', **params)
+    snapshot = job_manager.snapshot(job)
+    return jsonify({'message': 'Scraping job queued', 'job_id': job.id, 'job': snapshot}), 202
+
+@app.route('/api/start-scraping', methods=['POST'])
+def start_scraping():
+    """API endpoint to start scraping process (queued behind any running jobs)"""
+    return _submit_scrape()
+
+@app.route('/api/jobs', methods=['GET', 'POST'])
+def jobs():
+    """List jobs, newest first, or submit a new scrape job"""
+    if request.method == 'POST':
+        return _submit_scrape()
+    return jsonify({'jobs': [job_manager.snapshot(job) for job in job_manager.list_jobs()]})
+
+@app.route('/api/jobs/<job_id>')
+def job_detail(job_id):
+    """Status of one job (?details=1 adds its parameters and load/tiling stats)"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_manager.snapshot(job, details=request.args.get('details') in ('1', 'true')))
+
+@app.route('/api/jobs/<job_id>/results')
+def job_results(job_id):
+    """
+    Result rows added since a cursor: ?since=<next from the last call>&limit=N
+
+    Clients keep the returned 'next' and pass it back, so each poll only
+    transfers new rows.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    page_size = JOB_CONFIG['results_page_size']
+    try:
+        since = max(0, int(request.args.get('since', 0)))
+        limit = min(max(1, int(request.args.get('limit', page_size))), page_size)
+    except ValueError:
+        return jsonify({'error': 'since and limit must be integers'}), 400
     
-    # Start scraping in background thread
-    thread = threading.Thread(
-        target=run_scraping,
-        args=(search_query, browser_type, headless_mode, storage_format, 
-              email_extraction, perplexity_api_key, max_results)
+    rows, next_cursor, total = job.rows_since(since, limit)
+    return jsonify({
+        'job_id': job.id,
+        'since': since,
+        'next': next_cursor,
+        'total': total,
+        'complete': not job.is_active and next_cursor == total,
+        'rows': [row_to_place(row) for row in rows],
+    })
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued job, or ask a running one to stop after the current place"""
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job_manager.snapshot(job))
+
+def run_scraping(job, search_query, browser_type, headless_mode, storage_format, 
+                email_extraction, perplexity_api_key, max_results, workers=1,
+                navigation_mode='click', parse_engine='live', streaming=False, list_only=False,
+                browser_profile=None, tile_area=None, tile_zoom=None, known_places=None,
+                resume_run_id=None):
+    """
+    Background job that runs one scrape, reporting progress on the job
+
+    A cancelled job stops after the current place; rows extracted so far are
+    saved and its checkpoint stays open so the run can be resumed. Every
+    other exit (finished, nothing found, failed) closes the checkpoint.
+    """
+    from integrated_scraper import (
+        scroll_to_load_results, count_available_results,
+        scrape_results, stream_results, WebDriverCommandCounter, convert_scraped_data_to_dict_format
     )
-    thread.daemon = True
-    thread.start()
+    from tiling import scrape_tiled
     
-    return jsonify({'message': 'Scraping started successfully'})
-
-def run_scraping(search_query, browser_type, headless_mode, storage_format, 
-                email_extraction, perplexity_api_key, max_results):
-    """Background function to run the scraping process"""
-    global scraping_status
+    pool = get_driver_pool()
+    store = get_results_store()
+    driver = None
+    writer = None
+    recorder = None
+    checkpoint = None
     
     try:
-        scraping_status['message'] = 'Creating browser driver...'
-        driver = create_driver(browser_type, headless_mode)
+        # Every extracted row is journaled so an interrupted run can be resumed
+        if resume_run_id:
+            checkpoint = Checkpoint.load(resume_run_id)
+        else:
+            checkpoint = Checkpoint.create(search_query, {
+                'max_results': max_results, 'workers': workers, 'navigation_mode': navigation_mode,
+                'parse_engine': parse_engine, 'streaming': streaming, 'list_only': list_only,
+                'browser_profile': browser_profile, 'tile_area': tile_area, 'tile_zoom': tile_zoom,
+                'known_places': known_places,
+            })
+        previous_rows = list(checkpoint.rows)
+        remaining = max(0, max_results - len(previous_rows))
+        job.update(run_id=checkpoint.run_id, resumed_rows=len(previous_rows))
         
-        scraping_status['message'] = 'Navigating to Google Maps...'
-        driver.get(f"https://www.google.com/maps/search/{search_query}")
+        # Places are also recorded in the results store, in batched transactions
+        store_run_id = store.start_run(checkpoint.search_query.replace("+", " "), checkpoint.run_id)
+        job.update(store_run_id=store_run_id)
+        
+        job.update(message='Acquiring browser driver...')
+        driver = pool.checkout(browser_type, headless_mode, profile=browser_profile)
+        
+        job.update(message='Navigating to Google Maps...')
+        search_url = f"https://www.google.com/maps/search/{search_query}"
+        driver.get(search_url)
+        
+        # Track bandwidth and load time so profiles can be compared
+        page_load = measure_page_load(driver)
+        record_page_load(resolve_profile(browser_profile), page_load, search_url)
+        job.update(page_load=dict(page_load, profile=resolve_profile(browser_profile)))
         
         query_display = search_query.replace("+", " ")
-        scraping_status['message'] = 'Loading search results...'
-        scroll_to_load_results(driver, query_display)
         
-        scraping_status['message'] = 'Counting available results...'
-        total_results = count_available_results(driver, query_display)
-        scraping_status['total_found'] = total_results
+        # Rows are written to disk as they are extracted, so partial results survive
+        writer = open_writer(storage_format, query_display, extra_fields=LIST_CARD_FIELDS if list_only else ())
+        recorder = store.recorder(store_run_id, query_display)
+        for place_id, row in checkpoint.entries:
+            writer.write_row(row)
+            recorder.write_row(row, place_id)
+            job.add_row(row)
         
-        if total_results == 0:
-            scraping_status['message'] = 'No results found'
-            scraping_status['is_running'] = False
-            return
+        def on_row(row, place_id=None):
+            writer.write_row(row)
+            recorder.write_row(row, place_id)
+            job.add_row(row)
         
-        scraping_status['message'] = f'Scraping {min(max_results, total_results)} results...'
-        scraped_data = scrape_results(driver, query_display, min(max_results, total_results))
-        scraping_status['scraped_count'] = len(scraped_data)
+        # Per-stage counts, throughput and ETA; tiled and streamed searches load results as they scrape
+        stages = ['scrape'] if tile_area or (streaming and not list_only) else ['load', 'scrape']
+        if email_extraction != 'skip':
+            stages.append('enrichment')
+        tracker = ProgressTracker(stages, on_change=lambda report: job.update(**report))
+        
+        if remaining == 0:
+            scraped_data = []
+        elif tile_area:
+            # Split the area into map viewports so results are not capped per search
+            job.update(message=f'Scraping {query_display} across tiles of {tile_area}...')
+            scraped_data, tiling_stats = scrape_tiled(
+                driver, query_display, tile_area, zoom=tile_zoom, max_results=remaining, workers=workers,
+                navigation_mode=navigation_mode, parse_engine=parse_engine, list_only=list_only,
+                place_index=get_place_index(), known_places=known_places, checkpoint=checkpoint,
+                on_row=on_row, stop_event=job.cancel_event, meter=tracker.stage('scrape'))
+            tracker.stage('scrape').finish()
+            job.update(tiling=tiling_stats, scraped_count=len(scraped_data),
+                       total_found=tiling_stats['unique_places'])
+        elif streaming and not list_only:
+            # Extract places while the list is still loading
+            job.update(message='Streaming search results...')
+            load_stats = {}
+            scraped_data = []
+            meter = tracker.stage('scrape')
+            meter.start()
+            meter.add_total(remaining)
+            for place_info in stream_results(driver, query_display, max_results, load_stats, checkpoint, on_row,
+                                             stop_event=job.cancel_event):
+                scraped_data.append(place_info)
+                meter.tick()
+                job.update(scraped_count=len(scraped_data),
+                           total_found=max(load_stats.get('cards', 0), len(scraped_data)),
+                           message=f'Extracted {len(scraped_data)} places: {place_info[0]}')
+                if job.cancelled:
+                    break
+            meter.finish()
+            job.update(load_stats=load_stats)
+        else:
+            job.update(message='Loading search results...')
+            job.update(load_stats=scroll_to_load_results(driver, query_display, target_count=max_results,
+                                                         meter=tracker.stage('load')))
+            tracker.stage('load').finish()
+            
+            job.update(message='Counting available results...')
+            total_results = count_available_results(driver, query_display, parse_engine)
+            job.update(total_found=total_results)
+            
+            if total_results == 0 and not previous_rows:
+                writer.discard()
+                store.finish_run(store_run_id, status='empty')
+                checkpoint.finish(status='empty')
+                job.update(message='No results found')
+                return
+            
+            job.update(message=f'Scraping {min(remaining, total_results)} results...')
+            command_counter = WebDriverCommandCounter()
+            scraped_data = scrape_results(driver, query_display, remaining,
+                                          workers=workers, navigation_mode=navigation_mode,
+                                          parse_engine=parse_engine, command_counter=command_counter,
+                                          list_only=list_only, place_index=get_place_index(),
+                                          known_places=known_places, checkpoint=checkpoint,
+                                          on_row=on_row, stop_event=job.cancel_event,
+                                          meter=tracker.stage('scrape'))
+            tracker.stage('scrape').finish()
+            job.update(scraped_count=len(scraped_data), webdriver_commands=command_counter.snapshot())
         
+        scraped_data = previous_rows + scraped_data
         if not scraped_data:
-            scraping_status['message'] = 'No data was scraped'
-            scraping_status['is_running'] = False
+            writer.discard()
+            store.finish_run(store_run_id, status='empty')
+            if not job.cancelled:
+                checkpoint.finish(status='empty')
+            job.update(message='No data was scraped')
             return
         
-        # Save basic data
-        scraping_status['message'] = 'Saving scraped data...'
-        if storage_format == 'json':
-            filename = save_to_json(scraped_data, query_display)
+        # Finalize basic data
+        job.update(message='Saving scraped data...')
+        filename = writer.close()
+        job.update(output_file=filename)
+        recorder.close()
+        if job.cancelled:
+            # The checkpoint stays open so the rest of the run can be resumed
+            store.finish_run(store_run_id, status='cancelled', output_file=filename)
         else:
-            filename = save_to_csv(scraped_data, query_display)
+            store.finish_run(store_run_id, output_file=filename)
+            checkpoint.finish(filename)
         
         # Email extraction if requested
-        if email_extraction != 'skip':
-            scraping_status['message'] = 'Starting email extraction...'
+        if email_extraction != 'skip' and not job.cancelled:
+            job.update(message='Starting email extraction...')
+            meter = tracker.stage('enrichment')
+            meter.start()
+            meter.add_total(len(scraped_data))
             
+            # Results are merged by place as each business completes, not rewritten at the end
             if email_extraction == 'api' and perplexity_api_key:
+                from email_extractor import EmailExtractor
                 extractor = EmailExtractor(perplexity_api_key)
-                enhanced_data = extractor.process_scraped_data(scraped_data, delay=2)
-                
-                if storage_format == 'json':
-                    # Update JSON file with email data
-                    with open(filename, 'r', encoding='utf-8') as f:
-                        json_data = json.load(f)
-                    
-                    for i, place in enumerate(json_data['places']):
-                        if i < len(enhanced_data):
-                            place['email'] = enhanced_data[i]['email']
-                            place['background'] = enhanced_data[i]['background']
-                            place['extraction_status'] = enhanced_data[i]['extraction_status']
-                    
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        json.dump(json_data, f, indent=2, ensure_ascii=False)
-                else:
-                    extractor.save_enhanced_data_to_csv(enhanced_data, query_display)
+                with EnrichmentMerger(writer.path, store, store_run_id, method='api') as merger:
+                    def on_result(result):
+                        merger.add(result)
+                        meter.tick()
+                    extractor.process_scraped_data(scraped_data, delay=2, on_result=on_result,
+                                                  stop_event=job.cancel_event)
             
             elif email_extraction == 'free':
+                from free_email_extractor import FreeEmailExtractor
                 dict_scraped_data = convert_scraped_data_to_dict_format(scraped_data)
                 free_extractor = FreeEmailExtractor(headless=headless_mode, browser_type=browser_type)
                 
                 try:
-                    free_results = free_extractor.process_scraped_data_free(dict_scraped_data, delay=15)
-                    scraping_status['message'] = f'Free email extraction completed: {free_results["processed"]} processed'
+                    with EnrichmentMerger(writer.path, store, store_run_id, method='free') as merger:
+                        def on_result(result):
+                            merger.add(result)
+                            meter.tick()
+                        free_results = free_extractor.process_scraped_data_free(
+                            dict_scraped_data, delay=15, on_result=on_result, stop_event=job.cancel_event)
+                    job.update(message=f'Free email extraction completed: {free_results["processed"]} processed')
                 except Exception as e:
-                    scraping_status['message'] = f'Error in free email extraction: {str(e)}'
+                    job.update(message=f'Error in free email extraction: {str(e)}')
                 finally:
                     free_extractor.close()
+            meter.finish()
         
-        scraping_status['message'] = f'Scraping completed! Saved {len(scraped_data)} results to {filename}'
-        scraping_status['results'] = scraped_data
-        scraping_status['progress'] = 100
+        if job.cancelled:
+            job.update(message=f'Cancelled: saved {len(scraped_data)} results to {filename}', progress=100)
+        else:
+            job.update(message=f'Scraping completed! Saved {len(scraped_data)} results to {filename}',
+                       progress=100)
         
     except Exception as e:
-        scraping_status['message'] = f'Error during scraping: {str(e)}'
+        job.update(message=f'Error during scraping: {str(e)}')
+        if checkpoint is not None and not checkpoint.finished and not job.cancelled:
+            checkpoint.finish(status='failed')
+        raise
     finally:
-        scraping_status['is_running'] = False
-        if 'driver' in locals():
-            driver.quit()
+        if writer is not None:
+            writer.close()
+        if recorder is not None:
+            recorder.close()
+        pool.checkin(driver)
+
+@app.route('/api/events')
+def events():
+    """
+    Server-Sent Events stream of progress events
+
+    Filter with ?job_id=<id> for one scrape job or ?channel=campaign for the
+    email campaign. Reconnecting clients send Last-Event-ID and get the events
+    they missed.
+    """
+    filters = {name: request.args[name] for name in ('job_id', 'channel') if request.args.get(name)}
+    last_id = request.headers.get('Last-Event-ID') or request.args.get('last_id')
+    subscription = get_event_bus().subscribe(int(last_id) if last_id and last_id.isdigit() else None, **filters)
+    response = Response(stream_events(subscription), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/api/scraping-status')
 def get_scraping_status():
-    """API endpoint to get current scraping status"""
-    return jsonify(scraping_status)
+    """Status of the most recent job (kept for older clients; see /api/jobs)"""
+    job = job_manager.latest()
+    if job is None:
+        return jsonify({'is_running': False, 'progress': 0, 'message': '', 'total_found': 0,
+                        'scraped_count': 0, 'result_count': 0})
+    return jsonify(job_manager.snapshot(job))
+
+@app.route('/api/checkpoints')
+def get_checkpoints():
+    """API endpoint listing interrupted runs that can be resumed"""
+    return jsonify(list_checkpoints())
+
+@app.route('/api/profile-stats')
+def profile_stats():
+    """API endpoint comparing page-load cost of the browser profiles"""
+    return jsonify(get_profile_stats())
 
 @app.route('/api/send-cold-email', methods=['POST'])
 def send_cold_email():
@@ -215,13 +454,19 @@ def send_cold_email():
     if not all([file_path, sender_email, sender_name, smtp_email, smtp_password, openai_api_key]):
         return jsonify({'error': 'Missing required parameters'}), 400
     
-    # Check if file exists in data directory
-    data_file_path = os.path.join('data', file_path)
-    if not os.path.exists(data_file_path):
-        return jsonify({'error': 'Data file not found'}), 404
+    # Stored runs are passed through as 'run:<id>'; files must exist in the data directory
+    if parse_run_source(file_path) is not None:
+        if get_results_store().get_run(parse_run_source(file_path)) is None:
+            return jsonify({'error': 'Run not found'}), 404
+        data_file_path = file_path
+    else:
+        data_file_path = os.path.join('data', file_path)
+        if not os.path.exists(data_file_path):
+            return jsonify({'error': 'Data file not found'}), 404
     
     try:
         # Initialize email sender
+        from email_sender import EmailSender
         email_sender = EmailSender(openai_api_key)
         
         # Campaign configuration
@@ -242,6 +487,8 @@ def send_cold_email():
             global email_sender
             email_sender.campaign_status = status
         
+        # Clients stream campaign events from here on (?channel=campaign&last_id=...)
+        events_since = get_event_bus().last_id
         thread = threading.Thread(
             target=email_sender.run_email_campaign,
             args=(data_file_path, campaign_config, campaign_callback)
@@ -251,7 +498,8 @@ def send_cold_email():
         
         return jsonify({
             'message': 'Email campaign started successfully',
-            'status': 'running'
+            'status': 'running',
+            'events_since': events_since
         })
         
     except Exception as e:
@@ -294,6 +542,7 @@ def generate_email_content():
         return jsonify({'error': 'Missing required parameters'}), 400
     
     try:
+        from email_sender import EmailSender
         email_sender = EmailSender(openai_api_key)
         content = email_sender.generate_email_content(business_data, email_type)
         
@@ -319,23 +568,25 @@ def generate_all_email_content():
     if not all([file_path, openai_api_key]):
         return jsonify({'error': 'Missing required parameters'}), 400
     
-    # Check if file exists in data directory
+    run_id = parse_run_source(file_path)
     data_file_path = os.path.join('data', file_path)
-    if not os.path.exists(data_file_path):
+    if run_id is None and not os.path.exists(data_file_path):
         return jsonify({'error': 'Data file not found'}), 404
     
     try:
         # Load data
-        if file_path.endswith('.json'):
-            with open(data_file_path, 'r', encoding='utf-8') as f:
-                data_content = json.load(f)
-                businesses = data_content.get('places', [])
+        if run_id is not None:
+            # Only the preview rows are read from a stored run
+            store = get_results_store()
+            businesses = store.get_places(run_id, limit=5)
+            total_businesses = store.count_places(run_id)
         else:
-            import pandas as pd
-            df = pd.read_csv(data_file_path)
-            businesses = df.to_dict('records')
+            # Same parsed (and cached) data the preview uses
+            businesses = get_data_cache().get(data_file_path)['places']
+            total_businesses = len(businesses)
         
         # Generate content for first 5 businesses (for preview)
+        from email_sender import EmailSender
         email_sender = EmailSender(openai_api_key)
         generated_content = []
         
@@ -359,45 +610,152 @@ def generate_all_email_content():
         
         return jsonify({
             'generated_content': generated_content,
-            'total_businesses': len(businesses)
+            'total_businesses': total_businesses
         })
         
     except Exception as e:
         return jsonify({'error': f'Error generating content: {str(e)}'}), 500
 
+def _export_response(run_id, storage_format):
+    """Stream a stored run as a download, compressed when the client accepts it"""
+    store = get_results_store()
+    run = store.get_run(run_id)
+    if run is None:
+        return jsonify({'error': 'Run not found'}), 404
+    try:
+        check_export_format(storage_format)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except RuntimeError as e:
+        return jsonify({'error': str(e)}), 501
+    
+    chunks = export_chunks(store, run_id, storage_format)
+    headers = {'Content-Disposition': f'attachment; filename="run_{run_id}.{storage_format}"',
+               'Vary': 'Accept-Encoding'}
+    encoding = None if storage_format in PRECOMPRESSED_FORMATS else choose_encoding(request.accept_encodings)
+    if encoding:
+        chunks = compress_chunks(chunks, encoding)
+        headers['Content-Encoding'] = encoding
+    return app.response_class(chunks, mimetype=EXPORT_MIMETYPES[storage_format], headers=headers)
+
+@app.route('/api/export/<source>')
+def export_data(source):
+    """Stream a stored run ('run:<id>') as ?format=csv|jsonl|parquet, straight from the results store"""
+    run_id = parse_run_source(source)
+    if run_id is None:
+        return jsonify({'error': 'Exports are available for stored runs (run:<id>)'}), 400
+    return _export_response(run_id, request.args.get('format', 'csv'))
+
 @app.route('/api/download/<filename>')
 def download_file(filename):
-    """Download scraped data files"""
-    try:
-        file_path = os.path.join('data', filename)
-        if os.path.exists(file_path):
-            return send_file(file_path, as_attachment=True)
-        else:
-            return jsonify({'error': 'File not found'}), 404
-    except FileNotFoundError:
+    """
+    Download scraped data files, or a stored run (?format=csv|jsonl|parquet)
+
+    Files are gzip/zstd encoded on the fly when the client accepts it. Range
+    requests (resumed downloads) are answered uncompressed with 206 partial
+    content, so byte offsets always refer to the file on disk.
+    """
+    run_id = parse_run_source(filename)
+    if run_id is not None:
+        return _export_response(run_id, request.args.get('format', 'csv'))
+    
+    file_path = os.path.join('data', filename)
+    if not os.path.exists(file_path):
         return jsonify({'error': 'File not found'}), 404
+    
+    # Files with extracted emails are downloaded with the enrichment merged in
+    path = os.path.abspath(write_enriched_copy(file_path))
+    encoding = choose_encoding(request.accept_encodings)
+    if (request.range is not None or encoding is None
+            or os.path.getsize(path) < DOWNLOAD_CONFIG['compress_min_bytes']):
+        response = send_file(path, as_attachment=True, download_name=filename, conditional=True)
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+    
+    return app.response_class(
+        compress_chunks(iter_file(path), encoding),
+        mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+        headers={
+            'Content-Disposition': f'attachment; filename="{secure_filename(filename)}"',
+            'Content-Encoding': encoding,
+            'Vary': 'Accept-Encoding',
+        },
+    )
+
+def _preview_args():
+    """Paging, projection and filter arguments shared by file and run previews"""
+    offset = max(0, request.args.get('offset', 0, type=int))
+    limit = request.args.get('limit', PREVIEW_CONFIG['default_limit'], type=int)
+    limit = max(0, min(limit, PREVIEW_CONFIG['max_limit']))
+    columns = [column for column in request.args.get('columns', '').split(',') if column] or None
+    email_filter = request.args.get('has_email')
+    if email_filter is not None:
+        email_filter = email_filter.lower() in ('1', 'true', 'yes')
+    return offset, limit, columns, email_filter
+
+def _not_modified(etag):
+    """Empty 304 response when the client already has this version"""
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        return response
+    return None
 
 @app.route('/api/preview-data/<filename>')
 def preview_data(filename):
-    """Preview scraped data files"""
-    try:
-        file_path = os.path.join('data', filename)
+    """
+    Preview scraped data files, or a stored run
+
+    Query parameters: offset, limit (capped at PREVIEW_CONFIG['max_limit']),
+    columns (comma-separated keys to return) and has_email (true/false).
+    Responses carry an ETag; a matching If-None-Match gets an empty 304.
+    """
+    offset, limit, columns, email_filter = _preview_args()
+    
+    run_id = parse_run_source(filename)
+    if run_id is not None:
+        store = get_results_store()
+        run = store.get_run(run_id)
+        if run is None:
+            return jsonify({'error': 'Run not found'}), 404
+        etag = make_etag(filename, store.run_version(run_id), request.query_string)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        places, _ = select_places(store.get_places(run_id, offset=offset, limit=limit, has_email=email_filter),
+                                  columns=columns)
+        preview = {
+            'search_query': run['search_query'],
+            'scraped_at': run['started_at'],
+            'places': places,
+            'total_results': store.count_places(run_id, has_email=email_filter),
+            'emails': store.count_places(run_id, has_email=True),
+        }
+    else:
+        file_path = os.path.join('data', os.path.basename(filename))
         if not os.path.exists(file_path):
             return jsonify({'error': 'File not found'}), 404
-            
-        if filename.endswith('.csv'):
-            df = pd.read_csv(file_path)
-            return jsonify(df.to_dict('records'))
-        elif filename.endswith('.json'):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return jsonify(data)
-        else:
+        if not filename.endswith(('.csv', '.json', '.jsonl')):
             return jsonify({'error': 'Unsupported file format'}), 400
-    except FileNotFoundError:
-        return jsonify({'error': 'File not found'}), 404
-    except Exception as e:
-        return jsonify({'error': f'Error reading file: {str(e)}'}), 500
+        etag = make_etag(filename, file_signature(file_path), request.query_string)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        try:
+            # Parsed files are cached until the file or its enrichment journal changes
+            entry = get_data_cache().get(file_path)
+        except FileNotFoundError:
+            return jsonify({'error': 'File not found'}), 404
+        except Exception as e:
+            return jsonify({'error': f'Error reading file: {str(e)}'}), 500
+        places, total = select_places(entry['places'], offset, limit, columns, email_filter)
+        preview = dict(entry['meta'], places=places, total_results=total, emails=entry['emails'])
+    
+    preview.update(offset=offset, limit=limit)
+    response = jsonify(preview)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000) 
\ No newline at end of file
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Non-interactive batch runner: scrape a list of queries read from CSV or YAML
+
+Usage:
+    python batch_scraper.py queries.csv --workers 3 --headless --format json
+
+The input is either a CSV with a `query` column (and optional `max_results`,
+`area` and `zoom`) or a YAML list of queries / mappings with the same keys.
+Entries with an `area` are scraped tile by tile over that area (see tiling.py).
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from config import BATCH_CONFIG, BROWSER_CONFIG, PLACE_INDEX_CONFIG
+from driver_pool import get_driver_pool
+from integrated_scraper import scrape_query
+from output_writers import WRITERS
+from place_index import get_place_index
+from results_store import get_results_store
+from tiling import scrape_tiled
+
+# Load outcomes that mean the search page never showed a result list
+FAILED_STOP_REASONS = {'sidebar_not_found'}
+
+
+def _parse_limit(value, default):
+    if value in (None, ''):
+        return default
+    return int(value)
+
+
+def load_queries(path, default_max_results=None):
+    """
+    Read the batch definition
+
+    Args:
+        path (str): CSV or YAML file listing the queries
+        default_max_results (int): Limit for entries that do not set one
+
+    Returns:
+        list: Dicts with 'query', 'max_results', 'area' and 'zoom'
+
+    Raises:
+        ValueError: Listing every entry whose max_results or zoom is not an integer
+    """
+    default_max_results = default_max_results or BATCH_CONFIG['default_max_results']
+
+    if path.endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError("Reading YAML batches requires PyYAML (pip install pyyaml)")
+        with open(path, 'r', encoding='utf-8') as f:
+            entries = yaml.safe_load(f) or []
+        if isinstance(entries, dict):
+            entries = entries.get('queries', [])
+        entries = [entry if isinstance(entry, dict) else {'query': entry} for entry in entries]
+    else:
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            entries = list(csv.DictReader(f))
+    # CSV rows are reported by line number (after the header), YAML entries by position
+    first_line = 1 if path.endswith(('.yaml', '.yml')) else 2
+
+    jobs, errors = [], []
+    for line, entry in enumerate(entries, first_line):
+        query = str(entry.get('query') or '').strip()
+        if not query:
+            continue
+        job = {'query': query, 'max_results': default_max_results,
+               'area': str(entry.get('area') or '').strip() or None, 'zoom': None}
+        for field in ('max_results', 'zoom'):
+            try:
+                job[field] = _parse_limit(entry.get(field), job[field])
+            except (TypeError, ValueError):
+                errors.append(f"row {line} ('{query}'): {field} must be a whole number, got {entry.get(field)!r}")
+        jobs.append(job)
+
+    if errors:
+        raise ValueError(f"Invalid entries in {path}:\n  " + "\n  ".join(errors))
+    return jobs
+
+
+def run_query(job, options, pool=None):
+    """
+    Scrape one query in a pooled browser, retrying with exponential backoff
+
+    An attempt fails when it raises, finds no places, or the result list
+    never loaded (FAILED_STOP_REASONS).
+
+    Args:
+        job (dict): {'query', 'max_results', 'area', 'zoom'}
+        options (dict): browser_type, headless, profile, retry_attempts, retry_backoff,
+            known_places (indexed places: 'refresh', 'skip' or 'rescrape')
+        pool (DriverPool): Pool to borrow browsers from
+
+    Returns:
+        dict: Summary entry with the scraped rows under 'rows'
+    """
+    pool = pool or get_driver_pool()
+    started = time.monotonic()
+    summary = {'query': job['query'], 'max_results': job['max_results'], 'status': 'failed',
+               'results': 0, 'attempts': 0, 'error': None, 'rows': []}
+
+    for attempt in range(options['retry_attempts'] + 1):
+        summary['attempts'] = attempt + 1
+        if attempt:
+            delay = options['retry_backoff'] * 2 ** (attempt - 1)
+            print(f"🔁 Retrying '{job['query']}' in {delay}s (attempt {attempt + 1})")
+            time.sleep(delay)
+
+        try:
+            with pool.driver(options['browser_type'], options['headless'], profile=options['profile']) as driver:
+                if job.get('area'):
+                    rows, tile_stats = scrape_tiled(driver, job['query'], job['area'], job.get('zoom'),
+                                                    job['max_results'], place_index=get_place_index(),
+                                                    known_places=options.get('known_places'))
+                    summary['tiles_searched'] = tile_stats['tiles_searched']
+                else:
+                    rows, load_stats = scrape_query(driver, job['query'], job['max_results'],
+                                                    place_index=get_place_index(),
+                                                    known_places=options.get('known_places'))
+                    summary['stop_reason'] = load_stats.get('stop_reason')
+            if summary.get('stop_reason') in FAILED_STOP_REASONS:
+                raise RuntimeError(f"results did not load ({summary['stop_reason']})")
+            if not rows:
+                raise RuntimeError("no results found")
+            summary.update(status='ok', results=len(rows), rows=rows, error=None)
+            break
+        except Exception as e:
+            summary['error'] = str(e)
+            print(f"❌ Query '{job['query']}' failed: {e}")
+
+    summary['elapsed_seconds'] = round(time.monotonic() - started, 2)
+    return summary
+
+
+class BatchOutput:
+    def __init__(self, output_dir, storage_format, store=None):
+        """
+        Consolidated output that every query appends to as soon as it finishes
+
+        Each query is also recorded as a run in the results store.
+
+        Args:
+            output_dir (str): Directory for the output and summary files
+            storage_format (str): 'csv', 'json' or 'jsonl'
+            store (ResultsStore): Results store (the process-wide one by default)
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(output_dir, exist_ok=True)
+        self.path = os.path.join(output_dir, f"batch_{timestamp}.{storage_format}")
+        self.summary_path = os.path.join(output_dir, f"batch_{timestamp}_summary.json")
+        self._writer = WRITERS[storage_format](self.path, 'batch')
+        self._store = store or get_results_store()
+
+    @property
+    def total_results(self):
+        return self._writer.count
+
+    def add(self, query, rows):
+        self._writer.write_rows(rows, search_query=query)
+        if rows:
+            self._store.record_run(query, rows, output_file=self.path)
+
+    def close(self, summaries, elapsed):
+        self._writer.close()
+        with open(self.summary_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'output_file': self.path,
+                'total_queries': len(summaries),
+                'succeeded': sum(1 for s in summaries if s['status'] == 'ok'),
+                'failed': sum(1 for s in summaries if s['status'] != 'ok'),
+                'total_results': self.total_results,
+                'elapsed_seconds': round(elapsed, 2),
+                'queries': summaries,
+            }, f, indent=2, ensure_ascii=False)
+
+
+def run_batch(jobs, options, output):
+    """
+    Scrape every query with a bounded number of concurrent browsers
+
+    Args:
+        jobs (list): Entries from load_queries()
+        options (dict): Runner options (see run_query), plus 'workers'
+        output (BatchOutput): Where rows and the summary are written
+
+    Returns:
+        list: Per-query summaries, in input order
+    """
+    pool = get_driver_pool()
+    workers = max(1, min(options['workers'], pool.size, len(jobs) or 1))
+    print(f"🚀 Running {len(jobs)} queries with {workers} browser(s)")
+
+    started = time.monotonic()
+    summaries = [None] * len(jobs)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_query, job, options, pool): i for i, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), 1):
+            summary = future.result()
+            output.add(summary['query'], summary.pop('rows'))
+            summaries[futures[future]] = summary
+            icon = '✅' if summary['status'] == 'ok' else '❌'
+            print(f"{icon} [{done}/{len(jobs)}] {summary['query']}: {summary['results']} results "
+                  f"in {summary['elapsed_seconds']}s")
+
+    output.close(summaries, time.monotonic() - started)
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape a batch of Google Maps queries without prompts")
+    parser.add_argument('input', help="CSV (query,max_results) or YAML file with the queries")
+    parser.add_argument('--workers', type=int, default=BATCH_CONFIG['workers'],
+                        help="Queries scraped in parallel")
+    parser.add_argument('--browser', choices=['firefox', 'chrome'], default=BROWSER_CONFIG['default_browser'])
+    parser.add_argument('--headless', action='store_true', default=BROWSER_CONFIG['default_headless'])
+    parser.add_argument('--profile', default=BROWSER_CONFIG['default_profile'],
+                        help="Browser performance profile (fast, balanced, compat)")
+    parser.add_argument('--format', choices=['csv', 'json', 'jsonl'], default='csv', dest='storage_format')
+    parser.add_argument('--max-results', type=int, default=BATCH_CONFIG['default_max_results'],
+                        help="Limit for queries that do not set max_results")
+    parser.add_argument('--retries', type=int, default=BATCH_CONFIG['retry_attempts'])
+    parser.add_argument('--known-places', choices=['refresh', 'skip', 'rescrape'],
+                        default=PLACE_INDEX_CONFIG['known_places'],
+                        help="How to treat places already in the place index")
+    parser.add_argument('--output-dir', default='data')
+    args = parser.parse_args()
+
+    try:
+        jobs = load_queries(args.input, args.max_results)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    if not jobs:
+        print(f"❌ No queries found in {args.input}")
+        return
+
+    options = {
+        'workers': args.workers,
+        'browser_type': args.browser,
+        'headless': args.headless,
+        'profile': args.profile,
+        'retry_attempts': args.retries,
+        'retry_backoff': BATCH_CONFIG['retry_backoff'],
+        'known_places': args.known_places,
+    }
+    output = BatchOutput(args.output_dir, args.storage_format)
+    try:
+        summaries = run_batch(jobs, options, output)
+    finally:
+        get_driver_pool().shutdown()
+
+    failed = [s['query'] for s in summaries if s['status'] != 'ok']
+    print(f"\n🎯 Batch complete: {output.total_results} places from {len(jobs) - len(failed)}/{len(jobs)} queries")
+    print(f"💾 Results saved to {output.path}")
+    print(f"📊 Summary saved to {output.summary_path}")
+    if failed:
+        print(f"⚠️  Failed queries: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
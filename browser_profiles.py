@@ -0,0 +1,143 @@
+import json
+import os
+import threading
+from datetime import datetime
+
+from config import (
+    BLOCKED_URL_PATTERNS, BROWSER_CONFIG, BROWSER_PROFILES, CHROME_OPTIONS, FIREFOX_BLOCKING_PREFS,
+    FIREFOX_OPTIONS, UNSAFE_PERFORMANCE_FLAGS,
+)
+
+PROFILE_STATS_FILE = os.path.join('data', 'profile_stats.jsonl')
+
+PAGE_LOAD_SCRIPT = """
+    var nav = performance.getEntriesByType('navigation')[0];
+    var resources = performance.getEntriesByType('resource');
+    var transfer = nav ? (nav.transferSize || 0) : 0;
+    for (var i = 0; i < resources.length; i++) {
+        transfer += resources[i].transferSize || 0;
+    }
+    return {
+        load_ms: nav ? Math.round(nav.loadEventEnd || nav.domContentLoadedEventEnd || nav.duration) : null,
+        dom_content_loaded_ms: nav ? Math.round(nav.domContentLoadedEventEnd) : null,
+        transfer_bytes: transfer,
+        resource_count: resources.length
+    };
+"""
+
+_stats_lock = threading.Lock()
+_profile_stats = {}
+_history_loaded = False
+
+
+def resolve_profile(profile=None):
+    """Return a known profile name, falling back to the configured default"""
+    if profile in BROWSER_PROFILES:
+        return profile
+    if profile:
+        print(f"⚠️  Unknown browser profile '{profile}', using '{BROWSER_CONFIG['default_profile']}'")
+    return BROWSER_CONFIG['default_profile']
+
+
+def performance_arguments(browser_type, profile):
+    """Performance flags from config for this profile, minus ones that break Maps"""
+    if not BROWSER_PROFILES[profile]['performance_flags']:
+        return []
+    flags = FIREFOX_OPTIONS['performance'] if browser_type == 'firefox' else CHROME_OPTIONS['performance']
+    return [flag for flag in flags if flag not in UNSAFE_PERFORMANCE_FLAGS]
+
+
+def firefox_blocking_prefs(profile):
+    """Firefox preferences that block the profile's resource categories"""
+    prefs = {}
+    for category in BROWSER_PROFILES[profile]['block']:
+        prefs.update(FIREFOX_BLOCKING_PREFS.get(category, {}))
+    return prefs
+
+
+def blocked_url_patterns(profile):
+    """URL patterns Chrome should refuse to load for this profile"""
+    patterns = []
+    for category in BROWSER_PROFILES[profile]['block']:
+        patterns.extend(BLOCKED_URL_PATTERNS.get(category, []))
+    return patterns
+
+
+def apply_request_blocking(driver, browser_type, profile):
+    """Install Chrome request blocking through the DevTools protocol"""
+    patterns = blocked_url_patterns(profile)
+    if browser_type != 'chrome' or not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        print(f"🚫 Blocking {len(patterns)} URL patterns ({', '.join(BROWSER_PROFILES[profile]['block'])})")
+    except Exception as e:
+        print(f"⚠️  Could not enable request blocking: {e}")
+
+
+def measure_page_load(driver):
+    """Read page-load time and transferred bytes for the current page"""
+    try:
+        return driver.execute_script(PAGE_LOAD_SCRIPT) or {}
+    except Exception as e:
+        print(f"⚠️  Could not read page-load metrics: {e}")
+        return {}
+
+
+def _add_sample(profile, metrics):
+    stats = _profile_stats.setdefault(profile, {'samples': 0, 'transfer_bytes': 0, 'load_ms': 0})
+    stats['samples'] += 1
+    stats['transfer_bytes'] += metrics.get('transfer_bytes') or 0
+    stats['load_ms'] += metrics.get('load_ms') or 0
+
+
+def _load_history():
+    """Fold measurements saved by earlier runs into the statistics (once)"""
+    global _history_loaded
+    if _history_loaded:
+        return
+    _history_loaded = True
+    if not os.path.exists(PROFILE_STATS_FILE):
+        return
+    with open(PROFILE_STATS_FILE, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get('profile') in BROWSER_PROFILES:
+                _add_sample(entry['profile'], entry)
+
+
+def record_page_load(profile, metrics, url=None):
+    """Add a page-load measurement to the per-profile statistics"""
+    if not metrics:
+        return
+    with _stats_lock:
+        _load_history()
+        _add_sample(profile, metrics)
+
+    try:
+        os.makedirs(os.path.dirname(PROFILE_STATS_FILE), exist_ok=True)
+        entry = dict(metrics, profile=profile, url=url, recorded_at=datetime.now().isoformat())
+        with open(PROFILE_STATS_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+    except OSError as e:
+        print(f"⚠️  Could not save page-load metrics: {e}")
+
+
+def get_profile_stats():
+    """Average bandwidth and page-load time per profile"""
+    with _stats_lock:
+        _load_history()
+        summary = {}
+        for profile, stats in _profile_stats.items():
+            samples = stats['samples'] or 1
+            summary[profile] = {
+                'samples': stats['samples'],
+                'avg_transfer_kb': round(stats['transfer_bytes'] / samples / 1024, 1),
+                'avg_load_ms': round(stats['load_ms'] / samples),
+                'description': BROWSER_PROFILES[profile]['description'],
+            }
+        return summary
@@ -0,0 +1,155 @@
+import json
+import os
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+
+from config import CHECKPOINT_CONFIG
+
+
+class Checkpoint:
+    def __init__(self, path):
+        """
+        Append-only journal of the rows extracted by one scraping run
+
+        Each line is a JSON record: a 'start' record with the run settings,
+        one 'row' record per extracted place (with the loop cursor) and a
+        'done' record once the output file is written. Every record is
+        flushed and fsynced, so a crash loses at most the place in flight.
+
+        Args:
+            path (str): Journal file (.jsonl)
+        """
+        self.path = path
+        self.run_id = os.path.splitext(os.path.basename(path))[0]
+        self.settings = {}
+        self.rows = []
+        self.entries = []
+        self.done_ids = set()
+        self.cursor = 0
+        self.finished = False
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            self._replay()
+
+    @classmethod
+    def create(cls, search_query, settings=None):
+        """Start a new journal for a run"""
+        os.makedirs(CHECKPOINT_CONFIG['directory'], exist_ok=True)
+        run_id = datetime.now().strftime("run_%Y%m%d_%H%M%S_%f")
+        checkpoint = cls(os.path.join(CHECKPOINT_CONFIG['directory'], f"{run_id}.jsonl"))
+        checkpoint.settings = dict(settings or {}, search_query=search_query)
+        checkpoint._append({'type': 'start', 'started_at': datetime.now().isoformat(),
+                            'settings': checkpoint.settings})
+        return checkpoint
+
+    @classmethod
+    def load(cls, run_id):
+        """Reopen the journal of an earlier run"""
+        path = os.path.join(CHECKPOINT_CONFIG['directory'], f"{os.path.basename(run_id)}.jsonl")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No checkpoint named {run_id}")
+        return cls(path)
+
+    @property
+    def search_query(self):
+        return self.settings.get('search_query')
+
+    def _replay(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # Torn last line from a crash mid-write
+                if record['type'] == 'start':
+                    self.settings = record['settings']
+                elif record['type'] == 'row':
+                    self._apply_row(record)
+                elif record['type'] == 'done':
+                    self.finished = True
+
+    def _apply_row(self, record):
+        if record['place_id'] and record['place_id'] in self.done_ids:
+            return False
+        if record['place_id']:
+            self.done_ids.add(record['place_id'])
+        self.rows.append(record['row'])
+        self.entries.append((record['place_id'], record['row']))
+        self.cursor = max(self.cursor, record.get('cursor') or 0)
+        return True
+
+    def _append(self, record):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def add(self, place_id, row, cursor=None):
+        """
+        Journal one extracted place
+
+        Snapshot parses still in flight (Futures) are journaled once they finish.
+
+        Args:
+            place_id (str): Place ID of the card (rows without one are journaled but never skipped)
+            row (list|Future): The place row
+            cursor (int): Position of the card in the results list
+        """
+        if isinstance(row, Future):
+            def journal(future):
+                if future.exception() is None:
+                    self.add(place_id, future.result(), cursor)
+            row.add_done_callback(journal)
+            return
+
+        record = {'type': 'row', 'place_id': place_id, 'cursor': cursor, 'row': row}
+        with self._lock:
+            if self._apply_row(record):
+                self._append(record)
+
+    def finish(self, output_file=None, status='finished'):
+        """
+        Mark the run complete so it is no longer offered for resuming
+
+        Args:
+            output_file (str): Data file the rows were saved to
+            status (str): 'finished', 'empty' (nothing was scraped) or 'failed'
+        """
+        with self._lock:
+            self.finished = True
+            self._append({'type': 'done', 'finished_at': datetime.now().isoformat(), 'status': status,
+                          'output_file': output_file, 'total_rows': len(self.rows)})
+
+
+def list_checkpoints(include_finished=False):
+    """
+    Journals in the checkpoint directory, newest first
+
+    Returns:
+        list: Dicts with run_id, search_query, rows, cursor, finished and updated_at
+    """
+    directory = CHECKPOINT_CONFIG['directory']
+    if not os.path.isdir(directory):
+        return []
+
+    runs = []
+    for filename in os.listdir(directory):
+        if not filename.endswith('.jsonl'):
+            continue
+        path = os.path.join(directory, filename)
+        checkpoint = Checkpoint(path)
+        if checkpoint.finished and not include_finished:
+            continue
+        runs.append({
+            'run_id': checkpoint.run_id,
+            'search_query': checkpoint.search_query,
+            'settings': checkpoint.settings,
+            'rows': len(checkpoint.rows),
+            'cursor': checkpoint.cursor,
+            'finished': checkpoint.finished,
+            'updated_at': datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+        })
+    runs.sort(key=lambda run: run['updated_at'], reverse=True)
+    return runs
@@ -17,10 +17,27 @@ SELENIUM_CONFIG = {
     'default_window_size': (1920, 1080),  # For headless mode
 }
 
+# WebDriver Pool Configuration
+DRIVER_POOL_CONFIG = {
+    'size': 4,                # Max browsers kept alive across jobs (and parallel workers)
+    'checkout_timeout': 120,  # Seconds to wait for a free browser
+    'max_uses': 25,           # Recycle a browser after this many checkouts
+}
+
+# Results list loading (scroll_to_load_results)
+SCROLL_CONFIG = {
+    'poll_interval': 0.25,    # Seconds between loader polls
+    'idle_multiplier': 3,     # Idle window = average batch gap x this
+    'min_idle_window': 2.0,   # Seconds without new cards before giving up (lower bound)
+    'max_idle_window': 8.0,   # Upper bound for the adaptive idle window
+    'max_duration': 120,      # Hard cap on total scrolling time in seconds
+}
+
 # Browser Configuration
 BROWSER_CONFIG = {
     'default_browser': 'firefox',  # 'firefox' or 'chrome'
     'default_headless': False,     # True for headless mode by default
+    'default_profile': 'compat',   # 'fast', 'balanced' or 'compat' (see BROWSER_PROFILES)
     'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
@@ -96,11 +113,58 @@ CHROME_OPTIONS = {
     ]
 }
 
+# Browser performance profiles, selectable per job
+BROWSER_PROFILES = {
+    'fast': {
+        'description': 'Performance flags, eager page loads, blocks images, fonts, map tiles and analytics',
+        'performance_flags': True,
+        'page_load_strategy': 'eager',
+        'block': ['images', 'fonts', 'map_tiles', 'analytics'],
+    },
+    'balanced': {
+        'description': 'Blocks fonts and analytics, everything else loads normally',
+        'performance_flags': False,
+        'page_load_strategy': 'normal',
+        'block': ['fonts', 'analytics'],
+    },
+    'compat': {
+        'description': 'No blocking; closest to a regular browser session',
+        'performance_flags': False,
+        'page_load_strategy': 'normal',
+        'block': [],
+    },
+}
+
+# Performance flags that would break Google Maps (it is a JavaScript app)
+UNSAFE_PERFORMANCE_FLAGS = ["--disable-javascript", "--single-process", "--no-zygote"]
+
+# URL patterns blocked per resource category (Chrome request blocking)
+BLOCKED_URL_PATTERNS = {
+    'images': ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico", "*lh3.googleusercontent.com/*",
+               "*streetviewpixels-pa.googleapis.com/*"],
+    'fonts': ["*.woff", "*.woff2", "*.ttf", "*.otf", "*fonts.gstatic.com/*", "*fonts.googleapis.com/*"],
+    'map_tiles': ["*/maps/vt*", "*/maps/vt/*", "*khms*.google.com/*", "*/kh/v=*"],
+    'analytics': ["*google-analytics.com/*", "*googletagmanager.com/*", "*doubleclick.net/*",
+                  "*/gen_204*", "*/log?*", "*play.google.com/log*"],
+}
+
+# Firefox preferences used for the same categories (Firefox has no URL blocklist)
+FIREFOX_BLOCKING_PREFS = {
+    'images': {'permissions.default.image': 2},
+    'fonts': {'browser.display.use_document_fonts': 0, 'gfx.downloadable_fonts.enabled': False},
+    'map_tiles': {'webgl.disabled': True},
+    'analytics': {'privacy.trackingprotection.enabled': True, 'browser.contentblocking.category': 'strict'},
+}
+
 # CSS Selectors (in case Google changes them, easier to update)
 SELECTORS = {
     'results_sidebar': "div[aria-label='Results for {query}']",
     'result_items': 'div.Nv2PK',
     'clickable_link': 'a',
+    'card_title': 'div.qBF1Pd',
+    'card_rating': 'span.MW4etd',
+    'card_reviews': 'span.UY7F9',
+    'card_details': 'div.W4Efsd',
     'title': 'h1.DUwDvf.lfPIob',
     'rating_div': 'div.F7nice',
     'rating_value': 'span[aria-hidden="true"]',
@@ -111,6 +175,93 @@ SELECTORS = {
     'end_of_results': "You've reached the end of the list.",
 }
 
+# Offline HTML parser (page_source snapshots)
+PARSER_CONFIG = {
+    'processes': None,  # Parser worker processes; None uses every CPU core
+}
+
+# Persistent place index shared across runs (place_index.py)
+PLACE_INDEX_CONFIG = {
+    'path': 'data/place_index.sqlite3',
+    'known_places': 'refresh',  # 'refresh' (reuse stored row, update rating), 'skip' or 'rescrape'
+    'refresh_after_days': 30,   # Known places older than this are scraped again
+}
+
+# Run journals for checkpoint/resume (checkpoint.py)
+CHECKPOINT_CONFIG = {
+    'directory': 'data/checkpoints',
+}
+
+# SQLite store of runs, places and enrichment (results_store.py)
+RESULTS_STORE_CONFIG = {
+    'path': 'data/results.sqlite3',
+    'batch_size': 50,  # Rows buffered before one insert transaction
+}
+
+# /api/preview-data paging and parsed-file cache (data_cache.py)
+PREVIEW_CONFIG = {
+    'default_limit': 100,  # Places returned when no limit is given
+    'max_limit': 1000,  # Largest page a client may request
+    'cache_entries': 16,  # Parsed data files kept in memory (least recently used are evicted)
+}
+
+# /api/download and /api/export streaming (downloads.py)
+DOWNLOAD_CONFIG = {
+    'chunk_size': 64 * 1024,  # Bytes read from disk / buffered per streamed chunk
+    'encodings': ['zstd', 'gzip'],  # Content encodings offered, in order of preference
+    'compress_min_bytes': 4096,  # Smaller files are sent as they are
+    'gzip_level': 6,
+    'zstd_level': 3,
+    'export_batch_size': 500,  # Places fetched from the store per query while exporting
+}
+
+# Email enrichment merged into saved files (enrichment.py)
+ENRICHMENT_CONFIG = {
+    'batch_size': 5,  # Extraction results buffered before each append
+    'sidecar_suffix': '.enrichment.jsonl',  # Journal stored next to the data file
+}
+
+# Background scraping jobs of the web UI (job_manager.py)
+JOB_CONFIG = {
+    'max_concurrent': 2,  # Jobs running at the same time; the rest wait in the queue
+    'max_finished': 50,   # Finished jobs kept for /api/jobs (oldest are dropped first)
+    'results_page_size': 500,  # Most rows returned per /api/jobs/<id>/results call
+}
+
+# Server-Sent Events progress stream at /api/events (events.py)
+EVENTS_CONFIG = {
+    'history': 1000,           # Recent events replayed to clients reconnecting with Last-Event-ID
+    'subscriber_queue': 1000,  # Events buffered per open stream before a stalled client is dropped
+    'keepalive_seconds': 15,   # Comment sent on idle streams so proxies keep them open
+    'retry_ms': 3000,          # Reconnect delay suggested to EventSource clients
+}
+
+# Per-stage progress, throughput and ETA of scraping jobs (progress.py)
+PROGRESS_CONFIG = {
+    'latency_window': 20,  # Recent items in the moving-average latency
+    'update_interval': 0.5,  # Seconds between progress reports to the job status
+    'stage_weights': {'load': 10, 'scrape': 80, 'enrichment': 10},  # Share of the overall progress bar
+}
+
+# Geographic tiling (tiling.py)
+TILING_CONFIG = {
+    'result_cap': 120,         # Maps stops listing results for one search around here
+    'saturation_ratio': 0.9,   # Tiles with >= cap x ratio cards are treated as capped and split
+    'default_zoom': 13,        # Starting zoom for a bounding box
+    'max_zoom': 18,            # Capped tiles at this zoom are scraped instead of split further
+    'viewport_px': (1200, 1080), # Map area of the browser window (window minus results sidebar)
+    'geocoder_url': 'https://nominatim.openstreetmap.org/search',
+    'geocoder_timeout': 15,
+}
+
+# Batch query runner (batch_scraper.py)
+BATCH_CONFIG = {
+    'workers': 2,              # Queries scraped at the same time (bounded by the driver pool size)
+    'default_max_results': 50, # Limit for rows that do not set max_results
+    'retry_attempts': 2,       # Extra attempts for a failed query
+    'retry_backoff': 10,       # Seconds before the first retry, doubled on each further retry
+}
+
 # API Rate Limiting
 RATE_LIMIT_CONFIG = {
     'requests_per_minute': 20,
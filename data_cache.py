@@ -0,0 +1,142 @@
+"""
+In-memory cache of parsed data files for previews
+
+Entries are keyed by path and invalidated when the file or its enrichment
+journal changes (mtime and size); the least recently used entry is evicted
+once the cache is full.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from config import PREVIEW_CONFIG
+from enrichment import apply_enrichment, sidecar_path
+from output_writers import CSV_HEADER, EXTRA_CSV_HEADERS, PLACE_FIELDS, read_jsonl
+from results_store import has_email
+
+# CSV columns written by the scraper, mapped to the place fields of the JSON formats
+CSV_FIELDS = dict(zip(CSV_HEADER, PLACE_FIELDS + ["search_query"]),
+                  **{header: field for field, header in EXTRA_CSV_HEADERS.items()})
+
+
+def read_data_file(path):
+    """
+    Parse a CSV, JSON or JSON Lines data file with its enrichment applied
+
+    Returns:
+        tuple: (place dicts, metadata dict with search_query / scraped_at when known)
+    """
+    meta = {}
+    if path.endswith('.jsonl'):
+        places = read_jsonl(path)
+    elif path.endswith('.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            document = json.load(f)
+        places = document.get('places', [])
+        meta = {key: document[key] for key in ('search_query', 'scraped_at') if key in document}
+    elif path.endswith('.csv'):
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            places = [{CSV_FIELDS.get(column, column): value for column, value in record.items()}
+                      for record in csv.DictReader(f)]
+    else:
+        raise ValueError(f"Unsupported file format: {path}")
+    return apply_enrichment(places, path), meta
+
+
+def file_signature(path):
+    """Identifies one version of a data file and its enrichment journal"""
+    parts = []
+    for candidate in (path, sidecar_path(path)):
+        try:
+            stat = os.stat(candidate)
+        except FileNotFoundError:
+            parts.append('-')
+            continue
+        parts.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+    return '/'.join(parts)
+
+
+def make_etag(*parts):
+    return hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def select_places(places, offset=0, limit=None, columns=None, email_filter=None):
+    """
+    Filter, page and project a list of place dicts
+
+    Args:
+        places (list): Place dicts
+        offset (int): Places to skip after filtering
+        limit (int): Maximum number of places to return (None for all)
+        columns (list): Keys to keep in each place (None for all)
+        email_filter (bool): Keep only places with (True) or without (False) an email
+
+    Returns:
+        tuple: (page of places, number of places matching the filter)
+    """
+    if email_filter is not None:
+        places = [place for place in places if has_email(place.get('email')) == email_filter]
+    page = places[offset:None if limit is None else offset + limit]
+    if columns:
+        page = [{column: place.get(column) for column in columns} for place in page]
+    return page, len(places)
+
+
+class DataFileCache:
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or PREVIEW_CONFIG['cache_entries']
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path):
+        """
+        Parsed contents of a data file, re-read only when it changed
+
+        Returns:
+            dict: {'signature', 'places', 'meta', 'emails'}
+        """
+        signature = file_signature(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry['signature'] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+
+        places, meta = read_data_file(path)
+        entry = {
+            'signature': signature,
+            'places': places,
+            'meta': meta,
+            'emails': sum(1 for place in places if has_email(place.get('email'))),
+        }
+        with self._lock:
+            self.misses += 1
+            self._entries[path] = entry
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_data_cache():
+    """Return the process-wide data file cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = DataFileCache()
+        return _cache
@@ -0,0 +1,207 @@
+"""
+Streaming downloads: on-the-fly content encoding and exports of stored runs
+
+Everything here produces generators of bytes for a streamed Flask Response,
+so large files and runs are never held in memory or staged on disk.
+"""
+
+import csv
+import io
+import json
+import zlib
+from importlib.util import find_spec
+
+from config import DOWNLOAD_CONFIG
+from enrichment import ENRICHED_CSV_HEADER
+from output_writers import EXTRA_CSV_HEADERS, LIST_CARD_FIELDS, PLACE_FIELDS
+
+# Category and Status are only filled in for runs scraped from the result list alone
+EXPORT_FIELDS = PLACE_FIELDS + ["search_query", "email", "background", "extraction_status", "place_id",
+                                *LIST_CARD_FIELDS]
+EXPORT_CSV_HEADER = ENRICHED_CSV_HEADER + ["Place ID"] + [EXTRA_CSV_HEADERS[field] for field in LIST_CARD_FIELDS]
+
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# Formats that are already compressed and gain nothing from a content encoding
+PRECOMPRESSED_FORMATS = {'parquet'}
+
+
+def supported_encodings():
+    """Content encodings this server can produce (zstd needs the zstandard package)"""
+    return [encoding for encoding in DOWNLOAD_CONFIG['encodings']
+            if encoding != 'zstd' or find_spec('zstandard') is not None]
+
+
+def choose_encoding(accept_encodings):
+    """
+    Pick the preferred content encoding the client accepts
+
+    Args:
+        accept_encodings: The request's parsed Accept-Encoding header (request.accept_encodings)
+
+    Returns:
+        str: 'zstd', 'gzip' or None for identity
+    """
+    for encoding in supported_encodings():
+        if accept_encodings.quality(encoding) > 0:
+            return encoding
+    return None
+
+
+def compress_chunks(chunks, encoding):
+    """Encode a stream of byte chunks with gzip or zstd as it is produced"""
+    if encoding == 'gzip':
+        compressor = zlib.compressobj(DOWNLOAD_CONFIG['gzip_level'], zlib.DEFLATED, 31)
+    elif encoding == 'zstd':
+        import zstandard
+        compressor = zstandard.ZstdCompressor(level=DOWNLOAD_CONFIG['zstd_level']).compressobj()
+    else:
+        yield from chunks
+        return
+
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def iter_file(path, chunk_size=None):
+    """Read a file in fixed-size chunks"""
+    chunk_size = chunk_size or DOWNLOAD_CONFIG['chunk_size']
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def check_export_format(storage_format):
+    """Raise ValueError for unknown formats and RuntimeError when an optional dependency is missing"""
+    if storage_format not in EXPORT_MIMETYPES:
+        raise ValueError(f"Unsupported export format: {storage_format}")
+    if storage_format == 'parquet' and find_spec('pyarrow') is None:
+        raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)")
+
+
+def _export_values(place):
+    return [place.get(field) for field in EXPORT_FIELDS]
+
+
+def _csv_chunks(places, chunk_size):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_CSV_HEADER)
+    for place in places:
+        writer.writerow(_export_values(place))
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+def _jsonl_chunks(places, chunk_size):
+    lines, size = [], 0
+    for place in places:
+        line = json.dumps({field: place.get(field) for field in EXPORT_FIELDS}, ensure_ascii=False) + '\n'
+        lines.append(line)
+        size += len(line)
+        if size >= chunk_size:
+            yield ''.join(lines).encode('utf-8')
+            lines, size = [], 0
+    yield ''.join(lines).encode('utf-8')
+
+
+class _ChunkSink:
+    """Write-only file object that hands what was written back as chunks"""
+
+    def __init__(self):
+        self.closed = False
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def writable(self):
+        return True
+
+    def readable(self):
+        return False
+
+    def seekable(self):
+        return False
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _parquet_chunks(places, batch_size):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(field, pa.string()) for field in EXPORT_FIELDS])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    batch = []
+    # One row group per batch, passed on as soon as it is encoded
+    for place in places:
+        batch.append({field: None if place.get(field) is None else str(place.get(field))
+                      for field in EXPORT_FIELDS})
+        if len(batch) >= batch_size:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            batch = []
+            yield sink.drain()
+    if batch:
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    writer.close()
+    yield sink.drain()
+
+
+def export_chunks(store, run_id, storage_format):
+    """
+    Stream a stored run, with its enrichment, as CSV, JSON Lines or Parquet
+
+    Places are read from the store in batches and encoded as they arrive;
+    nothing is written to disk.
+
+    Args:
+        store (ResultsStore): Store holding the run
+        run_id (int): Run to export
+        storage_format (str): 'csv', 'jsonl' or 'parquet'
+
+    Yields:
+        bytes: Consecutive pieces of the exported file
+    """
+    check_export_format(storage_format)
+    batch_size = DOWNLOAD_CONFIG['export_batch_size']
+    places = store.iter_places(run_id, batch_size=batch_size)
+    if storage_format == 'csv':
+        chunks = _csv_chunks(places, DOWNLOAD_CONFIG['chunk_size'])
+    elif storage_format == 'jsonl':
+        chunks = _jsonl_chunks(places, DOWNLOAD_CONFIG['chunk_size'])
+    else:
+        chunks = _parquet_chunks(places, batch_size)
+    for chunk in chunks:
+        if chunk:
+            yield chunk
@@ -0,0 +1,252 @@
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+
+from browser_profiles import resolve_profile
+from config import DRIVER_POOL_CONFIG, SELENIUM_CONFIG
+
+
+def _default_factory(browser_type, headless, profile):
+    """Boot a new browser using the scraper's standard options"""
+    # Imported lazily: integrated_scraper imports the extractors, which use the pool
+    from integrated_scraper import create_driver
+    return create_driver(browser_type, headless, profile)
+
+
+class DriverPool:
+    def __init__(self, size=None, factory=None, checkout_timeout=None, max_uses=None):
+        """
+        Keep a bounded set of warm WebDriver instances alive between jobs
+
+        Args:
+            size (int): Maximum number of browsers alive at the same time
+            factory (callable): factory(browser_type, headless, profile) returning a new driver
+            checkout_timeout (float): Seconds to wait for a free browser
+            max_uses (int): Recycle a browser after this many checkouts
+        """
+        self.size = size or DRIVER_POOL_CONFIG['size']
+        self.checkout_timeout = checkout_timeout or DRIVER_POOL_CONFIG['checkout_timeout']
+        self.max_uses = max_uses or DRIVER_POOL_CONFIG['max_uses']
+        self._factory = factory or _default_factory
+
+        self._cond = threading.Condition()
+        self._idle = {}       # key -> list of idle drivers
+        self._keys = {}       # id(driver) -> key
+        self._uses = {}       # id(driver) -> number of checkouts
+        self._in_use = set()  # id(driver) of borrowed drivers
+        self._pending = 0     # browsers currently booting
+        self._closed = False
+
+    @staticmethod
+    def _make_key(browser_type, headless, profile=None):
+        return (browser_type, bool(headless), resolve_profile(profile))
+
+    def _total(self):
+        return sum(len(drivers) for drivers in self._idle.values()) + len(self._in_use) + self._pending
+
+    def _forget(self, driver):
+        self._keys.pop(id(driver), None)
+        self._uses.pop(id(driver), None)
+        self._in_use.discard(id(driver))
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"⚠️  Error closing pooled browser: {e}")
+
+    def is_healthy(self, driver):
+        """Check that the browser session still responds"""
+        try:
+            driver.current_window_handle
+            driver.title
+            return True
+        except Exception:
+            return False
+
+    def reset(self, driver):
+        """Clear tabs, cookies and storage so the next borrower starts clean"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass  # about:blank and some error pages have no storage
+
+        driver.delete_all_cookies()
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # Chrome can drop cookies and cache for every origin, not just the current one
+            try:
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+                driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+            except Exception:
+                pass
+
+        driver.get('about:blank')
+        driver.implicitly_wait(SELENIUM_CONFIG['implicit_wait'])
+
+    def checkout(self, browser_type='firefox', headless=False, timeout=None, profile=None):
+        """
+        Borrow a browser, reusing a warm one when available
+
+        Args:
+            browser_type (str): 'firefox' or 'chrome'
+            headless (bool): Whether the browser runs headless
+            timeout (float): Seconds to wait for a free slot
+            profile (str): Browser performance profile (see BROWSER_PROFILES)
+
+        Returns:
+            WebDriver: A driver that must be given back with checkin()
+        """
+        key = self._make_key(browser_type, headless, profile)
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            driver = None
+            evicted = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool has been shut down")
+
+                    if self._idle.get(key):
+                        driver = self._idle[key].pop()
+                        self._in_use.add(id(driver))
+                        break
+
+                    if self._total() < self.size:
+                        self._pending += 1
+                        break
+
+                    # Make room by retiring an idle browser of a different kind
+                    other_key = next((k for k, drivers in self._idle.items() if drivers), None)
+                    if other_key is not None:
+                        evicted = self._idle[other_key].pop()
+                        self._forget(evicted)
+                        self._pending += 1
+                        break
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser available in pool (size {self.size}) after {timeout}s")
+                    self._cond.wait(remaining)
+
+            if evicted is not None:
+                self._quit(evicted)
+
+            if driver is not None:
+                if self.is_healthy(driver):
+                    with self._cond:
+                        self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+                    print(f"♻️  Reusing warm {browser_type} browser from pool")
+                    return driver
+
+                print("⚠️  Pooled browser failed health check, replacing it")
+                with self._cond:
+                    self._forget(driver)
+                    self._cond.notify()
+                self._quit(driver)
+                continue
+
+            try:
+                driver = self._factory(*key)
+            except Exception:
+                with self._cond:
+                    self._pending -= 1
+                    self._cond.notify()
+                raise
+
+            with self._cond:
+                self._pending -= 1
+                self._keys[id(driver)] = key
+                self._uses[id(driver)] = 1
+                self._in_use.add(id(driver))
+            return driver
+
+    def checkin(self, driver):
+        """Return a borrowed browser, resetting it for the next job"""
+        if driver is None:
+            return
+
+        with self._cond:
+            key = self._keys.get(id(driver))
+            uses = self._uses.get(id(driver), 0)
+            closed = self._closed
+
+        keep = key is not None and not closed and uses < self.max_uses
+        if keep:
+            try:
+                self.reset(driver)
+            except Exception as e:
+                print(f"⚠️  Could not reset browser, discarding it: {e}")
+                keep = False
+
+        with self._cond:
+            self._in_use.discard(id(driver))
+            if keep:
+                self._idle.setdefault(key, []).append(driver)
+            else:
+                self._forget(driver)
+            self._cond.notify()
+
+        if not keep:
+            self._quit(driver)
+
+    def key_for(self, driver):
+        """Return (browser_type, headless, profile) for a driver handed out by this pool"""
+        with self._cond:
+            return self._keys.get(id(driver))
+
+    @contextmanager
+    def driver(self, browser_type='firefox', headless=False, timeout=None, profile=None):
+        """Context manager that borrows a browser and always returns it"""
+        driver = self.checkout(browser_type, headless, timeout, profile)
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def stats(self):
+        """Return a snapshot of pool occupancy"""
+        with self._cond:
+            return {
+                'size': self.size,
+                'idle': sum(len(drivers) for drivers in self._idle.values()),
+                'in_use': len(self._in_use),
+                'booting': self._pending,
+            }
+
+    def shutdown(self):
+        """Quit every idle browser and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            idle = [driver for drivers in self._idle.values() for driver in drivers]
+            self._idle.clear()
+            for driver in idle:
+                self._forget(driver)
+            self._cond.notify_all()
+
+        for driver in idle:
+            self._quit(driver)
+        if idle:
+            print(f"🔒 Closed {len(idle)} pooled browser(s)")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Return the process-wide driver pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -2,6 +2,8 @@ import requests
 import json
 import time
 from datetime import datetime
+from events import publish
+from results_store import has_email
 
 class EmailExtractor:
     def __init__(self, api_key):
@@ -191,13 +193,15 @@ Return the information in the following JSON format only:
                 'error': str(e)
             }
     
-    def process_scraped_data(self, scraped_data, delay=3):
+    def process_scraped_data(self, scraped_data, delay=3, on_result=None, stop_event=None):
         """
         Process a list of scraped data and extract emails/backgrounds for each
         
         Args:
             scraped_data (list): List of scraped company data
             delay (int): Delay between API calls to avoid rate limiting
+            on_result (callable): Called with each enhanced company as soon as it is processed
+            stop_event (threading.Event): Stop before the next company once it is set
             
         Returns:
             list: Enhanced data with email and background information
@@ -207,6 +211,9 @@ Return the information in the following JSON format only:
         print(f"Processing {len(scraped_data)} companies for email extraction...")
         
         for i, company in enumerate(scraped_data, 1):
+            if stop_event is not None and stop_event.is_set():
+                print(f"⏹️  Email extraction stopped after {len(enhanced_data)} companies")
+                break
             print(f"\n--- Processing {i}/{len(scraped_data)}: {company[0]} ---")
             
             # Extract email and background
@@ -236,6 +243,10 @@ Return the information in the following JSON format only:
                 enhanced_company['raw_api_response'] = email_info['raw_response']
             
             enhanced_data.append(enhanced_company)
+            if has_email(enhanced_company['email']):
+                publish('email_found', title=company[0], email=enhanced_company['email'], method='api')
+            if on_result:
+                on_result(enhanced_company)
             
             print(f"✓ Completed processing: {company[0]}")
             
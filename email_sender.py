@@ -10,6 +10,7 @@ import time
 import threading
 from datetime import datetime
 import os
+from events import publish
 
 class EmailSender:
     def __init__(self, openai_api_key, smtp_config=None):
@@ -203,7 +204,7 @@ class EmailSender:
         Run email campaign with automatic content generation
         
         Args:
-            data_file (str): Path to scraped data file
+            data_file (str): Path to scraped data file, or 'run:<id>' for a stored run
             campaign_config (dict): Campaign configuration
             callback (function): Callback function for progress updates
         """
@@ -220,17 +221,27 @@ class EmailSender:
         try:
             # Load data
             self.campaign_status['status_message'] = 'Loading data...'
-            if callback:
-                callback(self.campaign_status)
+            self._report_progress(callback)
             
-            if data_file.endswith('.json'):
+            if data_file.startswith('run:'):
+                # Stored run: fetch only the places with an email, via the email index
+                from results_store import get_results_store, parse_run_source
+                businesses = get_results_store().get_places(parse_run_source(data_file), has_email=True)
+            elif data_file.endswith('.json'):
                 with open(data_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     businesses = data.get('places', [])
+            elif data_file.endswith('.jsonl'):
+                from output_writers import read_jsonl
+                businesses = read_jsonl(data_file)
             else:
                 import pandas as pd
                 df = pd.read_csv(data_file)
                 businesses = df.to_dict('records')
+            if not data_file.startswith('run:'):
+                # Emails found after the scrape live in the file's enrichment journal
+                from enrichment import apply_enrichment
+                apply_enrichment(businesses, data_file)
             
             # Filter businesses with email addresses
             email_businesses = []
@@ -241,14 +252,12 @@ class EmailSender:
             self.campaign_status['total_emails'] = len(email_businesses)
             self.campaign_status['status_message'] = f'Found {len(email_businesses)} businesses with email addresses'
             
-            if callback:
-                callback(self.campaign_status)
+            self._report_progress(callback)
             
             if len(email_businesses) == 0:
                 self.campaign_status['status_message'] = 'No businesses with email addresses found'
                 self.campaign_status['is_running'] = False
-                if callback:
-                    callback(self.campaign_status)
+                self._report_progress(callback)
                 return
             
             # Process each business
@@ -259,8 +268,7 @@ class EmailSender:
                 self.campaign_status['status_message'] = f'Processing {business.get("title", "Business")} ({i+1}/{len(email_businesses)})'
                 self.campaign_status['current_progress'] = int((i / len(email_businesses)) * 100)
                 
-                if callback:
-                    callback(self.campaign_status)
+                self._report_progress(callback)
                 
                 try:
                     # Check if we have edited content for this business
@@ -290,6 +298,8 @@ class EmailSender:
                         smtp_credentials=campaign_config['smtp_credentials']
                     )
                     
+                    publish('email_sent', channel='campaign', title=business.get('title', 'Unknown'),
+                            email=business['email'], success=bool(success))
                     if success:
                         self.campaign_status['sent_emails'] += 1
                     else:
@@ -305,27 +315,31 @@ class EmailSender:
                 
                 # Update progress
                 self.campaign_status['current_progress'] = int(((i + 1) / len(email_businesses)) * 100)
-                if callback:
-                    callback(self.campaign_status)
+                self._report_progress(callback)
             
             # Campaign completed
             self.campaign_status['status_message'] = f'Campaign completed! Sent: {self.campaign_status["sent_emails"]}, Failed: {self.campaign_status["failed_emails"]}'
             self.campaign_status['is_running'] = False
             
-            if callback:
-                callback(self.campaign_status)
+            self._report_progress(callback)
                 
         except Exception as e:
             self.campaign_status['status_message'] = f'Campaign error: {str(e)}'
             self.campaign_status['is_running'] = False
             self.campaign_status['errors'].append(str(e))
-            if callback:
-                callback(self.campaign_status)
+            self._report_progress(callback)
+    
+    def _report_progress(self, callback=None):
+        """Hand the campaign status to the callback and publish it on the 'campaign' event channel"""
+        if callback:
+            callback(self.campaign_status)
+        publish('progress', channel='campaign', **self.campaign_status)
     
     def stop_campaign(self):
         """Stop the running email campaign"""
         self.campaign_status['is_running'] = False
         self.campaign_status['status_message'] = 'Campaign stopped by user'
+        self._report_progress()
     
     def get_campaign_status(self):
         """Get current campaign status"""
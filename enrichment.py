@@ -0,0 +1,194 @@
+"""
+Email enrichment merged into saved data files by place identity
+
+Extraction results are appended in batches to a sidecar journal next to the
+data file (data/scraped_data_<ts>.csv.enrichment.jsonl) instead of rewriting
+the data file. Readers overlay the journal on the places they load, matched
+by place key rather than list position.
+"""
+
+import csv
+import json
+import os
+import tempfile
+import threading
+
+from config import ENRICHMENT_CONFIG
+from output_writers import CSV_HEADER, EXTRA_CSV_HEADERS, read_jsonl
+
+ENRICHMENT_FIELDS = ["email", "background", "extraction_status", "extraction_method", "source", "error_details"]
+ENRICHED_CSV_HEADER = CSV_HEADER + ["Email", "Background", "Extraction Status"]
+
+
+def _field(place, name, csv_name):
+    value = place.get(name)
+    if value is None:
+        value = place.get(csv_name)
+    return '' if value is None else str(value)
+
+
+def place_key(place):
+    """
+    Identity of a place: title and address, normalized
+
+    Works for place dicts from JSON/JSONL files and the store ('title',
+    'address') as well as CSV records ('Title', 'Address').
+    """
+    title = ' '.join(_field(place, 'title', 'Title').lower().split())
+    address = ' '.join(_field(place, 'address', 'Address').lower().split())
+    return f"{title}|{address}"
+
+
+def sidecar_path(data_file):
+    return data_file + ENRICHMENT_CONFIG['sidecar_suffix']
+
+
+class EnrichmentMerger:
+    def __init__(self, data_file, store=None, run_id=None, method=None, batch_size=None):
+        """
+        Save extraction results incrementally, keyed by place
+
+        Each batch is appended to the sidecar journal in a single write and
+        fsynced, and written to the results store in one transaction. A crash
+        loses at most the unflushed batch; a torn last line is ignored by
+        load_enrichment().
+
+        Args:
+            data_file (str): Path of the data file the places were saved to
+            store (ResultsStore): Store to update as well (optional)
+            run_id (int): Store run the places belong to
+            method (str): Extraction method recorded with each result ('api' or 'free')
+            batch_size (int): Results buffered before each flush
+        """
+        self.path = sidecar_path(data_file)
+        self.store = store
+        self.run_id = run_id
+        self.method = method
+        self.batch_size = batch_size or ENRICHMENT_CONFIG['batch_size']
+        self.count = 0
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def add(self, place):
+        """Record the extraction result of one business (a place dict with email, background, ...)"""
+        record = {'key': place_key(place), 'title': place.get('title'), 'address': place.get('address')}
+        if place.get('place_id'):
+            record['place_id'] = place['place_id']
+        for field in ENRICHMENT_FIELDS:
+            if place.get(field) is not None:
+                record[field] = place[field]
+        if self.method and 'extraction_method' not in record:
+            record['extraction_method'] = self.method
+
+        with self._lock:
+            self._buffer.append(record)
+            self.count += 1
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in self._buffer))
+            f.flush()
+            os.fsync(f.fileno())
+        if self.store is not None and self.run_id is not None:
+            self.store.set_enrichment(self.run_id, self._buffer)
+        self._buffer = []
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_enrichment(data_file):
+    """
+    Read the enrichment journal of a data file
+
+    Returns:
+        dict: place key -> enrichment fields (the latest result for each place wins)
+    """
+    path = sidecar_path(data_file)
+    if not os.path.exists(path):
+        return {}
+    enrichment = {}
+    for record in read_jsonl(path):
+        fields = {field: record[field] for field in ENRICHMENT_FIELDS if field in record}
+        enrichment.setdefault(record['key'], {}).update(fields)
+    return enrichment
+
+
+def apply_enrichment(places, data_file):
+    """Overlay the enrichment journal of data_file on its loaded place dicts (in place)"""
+    enrichment = load_enrichment(data_file)
+    if enrichment:
+        for place in places:
+            fields = enrichment.get(place_key(place))
+            if fields:
+                place.update(fields)
+    return places
+
+
+def write_enriched_copy(data_file):
+    """
+    Write data_file with its enrichment merged in, for downloads
+
+    The copy (<name>_enriched.<ext>) is replaced atomically and only rebuilt
+    when the journal or data file is newer than it.
+
+    Returns:
+        str: Path of the merged copy, or data_file itself when it has no enrichment
+    """
+    journal = sidecar_path(data_file)
+    if not os.path.exists(journal):
+        return data_file
+
+    stem, ext = os.path.splitext(data_file)
+    target = f"{stem}_enriched{ext}"
+    if os.path.exists(target) and os.path.getmtime(target) >= max(os.path.getmtime(journal),
+                                                                   os.path.getmtime(data_file)):
+        return target
+
+    enrichment = load_enrichment(data_file)
+    directory = os.path.dirname(os.path.abspath(target))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=ext + '.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8') as out:
+            if ext == '.json':
+                with open(data_file, 'r', encoding='utf-8') as f:
+                    document = json.load(f)
+                for place in document.get('places', []):
+                    place.update(enrichment.get(place_key(place), {}))
+                json.dump(document, out, indent=2, ensure_ascii=False)
+            elif ext == '.jsonl':
+                for place in read_jsonl(data_file):
+                    place.update(enrichment.get(place_key(place), {}))
+                    out.write(json.dumps(place, ensure_ascii=False) + '\n')
+            else:
+                writer = csv.writer(out)
+                with open(data_file, 'r', newline='', encoding='utf-8') as f:
+                    reader = csv.DictReader(f)
+                    # List-only files carry Category and Status after Search Query; keep them there
+                    columns = CSV_HEADER + [header for header in EXTRA_CSV_HEADERS.values()
+                                            if header in (reader.fieldnames or ())]
+                    writer.writerow(columns + ENRICHED_CSV_HEADER[len(CSV_HEADER):])
+                    for record in reader:
+                        fields = enrichment.get(place_key(record), {})
+                        writer.writerow([record.get(column, '') for column in columns] +
+                                        [fields.get('email', ''), fields.get('background', ''),
+                                         fields.get('extraction_status', '')])
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    return target
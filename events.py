@@ -0,0 +1,177 @@
+"""
+In-process event bus behind the /api/events Server-Sent Events stream
+
+Scrapers, extractors and the email sender publish small progress events
+(place extracted, email found, email sent, phase changed); each open stream
+subscribes with a filter and receives only the events it asked for.
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from config import EVENTS_CONFIG
+
+_local = threading.local()
+
+
+def current_tags():
+    """Tags (e.g. job_id) added to every event published from this thread"""
+    return dict(getattr(_local, 'tags', {}))
+
+
+@contextmanager
+def event_scope(**tags):
+    """Tag every event published from this thread inside the block, e.g. with its job_id"""
+    previous = getattr(_local, 'tags', {})
+    _local.tags = dict(previous, **tags)
+    try:
+        yield
+    finally:
+        _local.tags = previous
+
+
+class Subscription:
+    def __init__(self, bus, filters, max_queue):
+        self.filters = filters
+        self.overflowed = False
+        self._bus = bus
+        self._queue = queue.Queue(max_queue)
+
+    def matches(self, event):
+        return all(event.get(name) == value for name, value in self.filters.items())
+
+    def _offer(self, event):
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # A stalled client; it is dropped and catches up from history when it reconnects
+            self.overflowed = True
+
+    def get(self, timeout=None):
+        """Next event, or None when nothing arrived within timeout"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._bus._unsubscribe(self)
+
+
+class EventBus:
+    def __init__(self, history=None, max_queue=None):
+        """
+        Fan out published events to subscribers and keep a short history for reconnects
+
+        Args:
+            history (int): Recent events kept for clients reconnecting with Last-Event-ID
+            max_queue (int): Events buffered per subscriber before it is dropped
+        """
+        self.max_queue = max_queue or EVENTS_CONFIG['subscriber_queue']
+        self._history = deque(maxlen=history or EVENTS_CONFIG['history'])
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    @property
+    def last_id(self):
+        """ID of the latest event; clients pass it as last_id to see only what follows"""
+        with self._lock:
+            return self._seq
+
+    def publish(self, event_type, tags=None, **data):
+        """
+        Publish an event to every matching subscriber
+
+        Args:
+            event_type (str): 'place', 'email_found', 'email_sent', 'phase' or 'progress'
+            tags (dict): Routing tags; defaults to the publishing thread's event_scope
+            **data: JSON-serialisable payload
+
+        Returns:
+            dict: The published event, with its sequence number as 'id'
+        """
+        event = dict(current_tags() if tags is None else tags, **data)
+        with self._lock:
+            self._seq += 1
+            event.update(id=self._seq, type=event_type, time=time.time())
+            self._history.append(event)
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            if subscription.matches(event):
+                subscription._offer(event)
+        return event
+
+    def subscribe(self, last_id=None, **filters):
+        """
+        Start receiving events that match every filter (e.g. job_id='...')
+
+        Args:
+            last_id (int): Replay retained events published after this ID first
+
+        Returns:
+            Subscription: Call close() when the client goes away
+        """
+        subscription = Subscription(self, filters, self.max_queue)
+        with self._lock:
+            if last_id is not None:
+                for event in self._history:
+                    if event['id'] > last_id and subscription.matches(event):
+                        subscription._offer(event)
+            self._subscribers.append(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+
+def format_sse(event):
+    """Encode an event as a text/event-stream message"""
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def stream_events(subscription, keepalive=None):
+    """
+    Yield text/event-stream messages for a subscription until the client disconnects
+
+    A comment line is sent when nothing happened for `keepalive` seconds, so
+    proxies keep the connection open and a closed client is noticed.
+    """
+    keepalive = keepalive or EVENTS_CONFIG['keepalive_seconds']
+    try:
+        yield f"retry: {EVENTS_CONFIG['retry_ms']}\n\n"
+        while not subscription.overflowed:
+            event = subscription.get(timeout=keepalive)
+            yield format_sse(event) if event is not None else ": keepalive\n\n"
+    finally:
+        subscription.close()
+
+
+_bus = EventBus()
+
+
+def get_event_bus():
+    """Return the process-wide event bus"""
+    return _bus
+
+
+def publish(event_type, **data):
+    """Publish on the process-wide bus, tagged with the current thread's event_scope"""
+    return _bus.publish(event_type, **data)
+
+
+def bind_publisher():
+    """
+    Capture this thread's tags for events published from helper threads
+
+    Returns:
+        callable: publish(event_type, **data) that keeps the caller's tags
+    """
+    tags = current_tags()
+    return lambda event_type, **data: _bus.publish(event_type, tags=tags, **data)
@@ -2,12 +2,14 @@ import time
 import json
 import re
 from datetime import datetime
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
+from driver_pool import get_driver_pool
+from events import publish
+from results_store import has_email
 
 class FreeEmailExtractor:
     def __init__(self, headless=False, browser_type='firefox'):
@@ -30,48 +32,9 @@ class FreeEmailExtractor:
         self.setup_driver()
     
     def setup_driver(self):
-        """Setup the WebDriver with appropriate options"""
+        """Borrow a WebDriver from the shared pool"""
         try:
-            if self.browser_type == 'firefox':
-                options = webdriver.FirefoxOptions()
-                
-                # Common options
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                
-                # Headless mode
-                if self.headless:
-                    options.add_argument("--headless")
-                    options.add_argument("--disable-gpu")
-                    options.add_argument("--window-size=1920,1080")
-                    print("🔧 Firefox will run in headless mode")
-                else:
-                    print("🔧 Firefox will run in visible mode")
-                
-                self.driver = webdriver.Firefox(options=options)
-                
-            else:  # Chrome
-                options = webdriver.ChromeOptions()
-                
-                # Common options
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                options.add_argument("--disable-blink-features=AutomationControlled")
-                options.add_argument("--disable-extensions")
-                
-                # Headless mode
-                if self.headless:
-                    options.add_argument("--headless")
-                    options.add_argument("--disable-gpu")
-                    options.add_argument("--window-size=1920,1080")
-                    print("🔧 Chrome will run in headless mode")
-                else:
-                    print("🔧 Chrome will run in visible mode")
-                
-                # User agent to avoid detection
-                options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-                
-                self.driver = webdriver.Chrome(options=options)
+            self.driver = get_driver_pool().checkout(self.browser_type, self.headless)
             
             # Set implicit wait and window size
             self.driver.implicitly_wait(10)
@@ -577,13 +540,15 @@ Start your web search now."""
                 'error': str(e)
             }
     
-    def process_scraped_data_free(self, scraped_data, delay=45):
+    def process_scraped_data_free(self, scraped_data, delay=45, on_result=None, stop_event=None):
         """
         Process scraped data using free Copilot method
         
         Args:
             scraped_data (list): List of business data dictionaries
             delay (int): Delay between each business processing (default 45s)
+            on_result (callable): Called with each business result as soon as it is processed
+            stop_event (threading.Event): Stop before the next business once it is set
         
         Returns:
             dict: Processing results with extracted emails
@@ -614,6 +579,9 @@ Start your web search now."""
         
         # Process each business
         for i, business in enumerate(scraped_data, 1):
+            if stop_event is not None and stop_event.is_set():
+                print(f"⏹️  Email extraction stopped after {i - 1} businesses")
+                break
             print(f"\n📋 Processing {i}/{len(scraped_data)}")
             
             # Convert list format to dict if needed
@@ -653,6 +621,11 @@ Start your web search now."""
             }
             
             results['businesses'].append(business_result)
+            if has_email(business_result['email']):
+                publish('email_found', title=business_result['title'], email=business_result['email'],
+                        method='free')
+            if on_result:
+                on_result(business_result)
             
             # Add delay between businesses (except for the last one)
             if i < len(scraped_data):
@@ -670,11 +643,12 @@ Start your web search now."""
         return results
     
     def close(self):
-        """Close the browser"""
+        """Return the browser to the shared pool"""
         try:
             if self.driver:
-                self.driver.quit()
-                print("🔒 Copilot browser closed")
+                get_driver_pool().checkin(self.driver)
+                self.driver = None
+                print("🔒 Copilot browser returned to pool")
         except Exception as e:
             print(f"⚠️  Error closing browser: {e}")
 
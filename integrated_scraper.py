@@ -3,75 +3,35 @@ from selenium.webdriver.common.by import By
 from selenium import webdriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, StaleElementReferenceException, ElementClickInterceptedException
 import time
-import os
-import csv
-import json
-from datetime import datetime
-from email_extractor import EmailExtractor
-from free_email_extractor import FreeEmailExtractor
-
-def save_to_csv(data, search_query):
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"scraped_data_{timestamp}.csv"
-    
-    # Create data directory if it doesn't exist
-    import os
-    data_dir = 'data'
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-    
-    file_path = os.path.join(data_dir, filename)
-
-    with open(file_path, mode="w", newline='', encoding="utf-8") as file:
-        writer = csv.writer(file)
-        writer.writerow(["Title", "Rating & Reviews", "Address", "Website", "Phone", "Search Query"])
-        
-        data_with_query = [row + [search_query] for row in data]
-        writer.writerows(data_with_query)
-
-    print(f"Basic scraped data saved to {file_path}")
-    return filename
-
-def save_to_json(data, search_query):
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"scraped_data_{timestamp}.json"
-    
-    # Create data directory if it doesn't exist
-    import os
-    data_dir = 'data'
-    if not os.path.exists(data_dir):
-        os.makedirs(data_dir)
-    
-    file_path = os.path.join(data_dir, filename)
-    
-    json_data = {
-        "search_query": search_query,
-        "scraped_at": datetime.now().isoformat(),
-        "total_results": len(data),
-        "places": []
-    }
-    
-    for row in data:
-        place = {
-            "title": row[0],
-            "rating_and_reviews": row[1], 
-            "address": row[2],
-            "website": row[3],
-            "phone": row[4]
-        }
-        json_data["places"].append(place)
-    
-    with open(file_path, 'w', encoding='utf-8') as file:
-        json.dump(json_data, file, indent=2, ensure_ascii=False)
-    
-    print(f"Basic scraped data saved to {file_path}")
-    return filename
+import queue
+import threading
+from contextlib import contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
+from driver_pool import get_driver_pool
+from place_index import get_place_index
+from checkpoint import Checkpoint, list_checkpoints
+from output_writers import open_writer
+from results_store import get_results_store
+from enrichment import EnrichmentMerger
+from events import bind_publisher
+from config import (
+    BROWSER_CONFIG, BROWSER_PROFILES, CHROME_OPTIONS, FIREFOX_OPTIONS, HEADLESS_CONFIG, PLACE_INDEX_CONFIG,
+    SCROLL_CONFIG, SELENIUM_CONFIG, SELECTORS,
+)
+from browser_profiles import (
+    apply_request_blocking, firefox_blocking_prefs, performance_arguments, resolve_profile,
+)
+from maps_parser import (
+    count_result_cards, get_parser_pool, list_card_to_row, parse_list_cards, parse_place_row,
+    place_fields_to_row, place_id_from_href,
+)
 
-def count_available_results(driver, query):
+def count_available_results(driver, query, parse_engine='live'):
     try:
+        if parse_engine == 'html':
+            return count_result_cards(driver.page_source)
         elem_results = driver.find_elements(By.CSS_SELECTOR, 'div.Nv2PK')
         return len(elem_results)
     except Exception as e:
@@ -103,6 +63,39 @@ def get_user_scraping_choice(total_results):
         else:
             print("Please enter 1 or 2")
 
+def get_resume_choice():
+    """Offer to resume an interrupted run (returns its Checkpoint, or None for a new run)"""
+    runs = list_checkpoints()
+    if not runs:
+        return None
+    
+    print("\n=== Interrupted Runs ===")
+    for i, run in enumerate(runs, 1):
+        print(f"{i}. {run['search_query'].replace('+', ' ')} - {run['rows']} places extracted ({run['updated_at'][:16]})")
+    
+    while True:
+        choice = input("Enter a number to resume, or press Enter for a new run: ").strip()
+        if not choice:
+            return None
+        try:
+            return Checkpoint.load(runs[int(choice) - 1]['run_id'])
+        except (ValueError, IndexError):
+            print(f"Please enter a number between 1 and {len(runs)}")
+
+def get_result_limit_choice():
+    """Ask up front how many results to load (None loads the whole list)"""
+    while True:
+        choice = input("Maximum results to load (press Enter for all): ").strip()
+        if not choice:
+            return None
+        try:
+            limit = int(choice)
+            if limit >= 1:
+                return limit
+            print("Please enter a number of at least 1")
+        except ValueError:
+            print("Please enter a valid number")
+
 def get_browser_mode_choice():
     """Get user preference for browser mode"""
     print("\n=== Browser Mode Selection ===")
@@ -167,60 +160,49 @@ def get_email_extraction_choice():
         else:
             print("Please enter 1, 2, or 3")
 
-def setup_browser_options(browser_type, headless):
-    """Setup browser options based on type and mode"""
+def setup_browser_options(browser_type, headless, profile=None):
+    """Setup browser options based on type, mode and performance profile"""
+    
+    profile = resolve_profile(profile)
+    settings = BROWSER_PROFILES[profile]
+    browser_options = FIREFOX_OPTIONS if browser_type == 'firefox' else CHROME_OPTIONS
     
     if browser_type == 'firefox':
         options = webdriver.FirefoxOptions()
-        
-        # Common options
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        
-        # Headless mode
-        if headless:
-            options.add_argument("--headless")
-            print("🔧 Firefox will run in headless mode (background)")
-        else:
-            print("🔧 Firefox will run in visible mode")
-            
-        # Additional options for better performance in headless mode
-        if headless:
-            options.add_argument("--disable-gpu")
-            options.add_argument("--window-size=1920,1080")
-            
+        for name, value in firefox_blocking_prefs(profile).items():
+            options.set_preference(name, value)
     else:  # Chrome
         options = webdriver.ChromeOptions()
-        
-        # Common options
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--disable-extensions")
-        
-        # Headless mode
-        if headless:
-            options.add_argument("--headless")
-            print("🔧 Chrome will run in headless mode (background)")
-        else:
-            print("🔧 Chrome will run in visible mode")
-            
-        # Additional options for better performance in headless mode
-        if headless:
-            options.add_argument("--disable-gpu")
-            options.add_argument("--window-size=1920,1080")
-            options.add_argument("--disable-images")  # Disable images for faster loading
-            
+        if 'images' in settings['block']:
+            options.add_argument("--blink-settings=imagesEnabled=false")
         # User agent to avoid detection
-        options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+        options.add_argument(f"--user-agent={BROWSER_CONFIG['user_agent']}")
+    
+    # Common options
+    for argument in browser_options['common']:
+        options.add_argument(argument)
+    
+    # Headless mode
+    if headless:
+        for argument in browser_options['headless']:
+            options.add_argument(argument)
+        print(f"🔧 {browser_type.capitalize()} will run in headless mode (background)")
+    else:
+        print(f"🔧 {browser_type.capitalize()} will run in visible mode")
+    
+    for argument in performance_arguments(browser_type, profile):
+        options.add_argument(argument)
+    
+    options.page_load_strategy = settings['page_load_strategy']
+    print(f"⚙️  Browser profile: {profile} ({settings['description']})")
     
     return options
 
-def create_driver(browser_type, headless):
+def create_driver(browser_type, headless, profile=None):
     """Create and return a WebDriver instance"""
     
-    options = setup_browser_options(browser_type, headless)
+    profile = resolve_profile(profile)
+    options = setup_browser_options(browser_type, headless, profile)
     
     try:
         if browser_type == 'firefox':
@@ -228,11 +210,18 @@ def create_driver(browser_type, headless):
         else:  # Chrome
             driver = webdriver.Chrome(options=options)
             
-        driver.implicitly_wait(10)
+        driver.implicitly_wait(SELENIUM_CONFIG['implicit_wait'])
+        
+        page_load_timeout = SELENIUM_CONFIG['page_load_timeout']
+        if headless:
+            page_load_timeout *= HEADLESS_CONFIG['timeout_multiplier']
+        driver.set_page_load_timeout(page_load_timeout)
         
         # Set window size for headless mode
         if headless:
-            driver.set_window_size(1920, 1080)
+            driver.set_window_size(*HEADLESS_CONFIG['window_size'])
+        
+        apply_request_blocking(driver, browser_type, profile)
             
         print(f"✅ {browser_type.capitalize()} browser initialized successfully")
         return driver
@@ -246,39 +235,165 @@ def create_driver(browser_type, headless):
             print("- Chrome: Install chromedriver")
         raise
 
-def scroll_to_load_results(driver, query):
-    wait = WebDriverWait(driver, 10)
-    
+RESULTS_LOADER_SCRIPT = """
+    var feed = arguments[0], cardSelector = arguments[1], endText = arguments[2];
+    var state = feed.__scraperLoader;
+    if (!state) {
+        state = feed.__scraperLoader = {count: 0, ended: false, lastChange: Date.now()};
+        var update = function () {
+            var count = feed.querySelectorAll(cardSelector).length;
+            if (count !== state.count) {
+                state.count = count;
+                state.lastChange = Date.now();
+            }
+            var tail = feed.lastElementChild;
+            if (!state.ended && tail && (tail.textContent || '').indexOf(endText) !== -1) {
+                state.ended = true;
+            }
+        };
+        state.observer = new MutationObserver(update);
+        state.observer.observe(feed, {childList: true, subtree: true});
+        update();
+    }
+    feed.scrollTop = feed.scrollHeight;
+    return {count: state.count, ended: state.ended, idle_ms: Date.now() - state.lastChange};
+"""
+
+def find_results_sidebar(driver, query, timeout=10):
+    """Wait for the results feed of a search and return it (None if it never shows)"""
     try:
-        divSideBar = wait.until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, f"div[aria-label='Results for {query}']"))
+        return WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS['results_sidebar'].format(query=query)))
         )
-        
-        print("📜 Scrolling to load all results...")
-        keepScrolling = True
-        scroll_attempts = 0
-        max_scroll_attempts = 50
-        
-        while keepScrolling and scroll_attempts < max_scroll_attempts:
-            divSideBar.send_keys(Keys.PAGE_DOWN)
-            time.sleep(1)
-            divSideBar.send_keys(Keys.PAGE_DOWN)
-            time.sleep(1)
-            
-            try:
-                html = driver.find_element(By.TAG_NAME, "html").get_attribute('outerHTML')
-                if "You've reached the end of the list." in html:
-                    keepScrolling = False
-                    print("✅ Reached end of results.")
-            except:
-                pass
-            
-            scroll_attempts += 1
-            if scroll_attempts % 10 == 0:
-                print(f"📜 Scrolled {scroll_attempts} times...")
-                
     except TimeoutException:
+        return None
+
+def poll_results_loader(driver, sidebar):
+    """
+    Scroll the results feed to the bottom and report its loading state
+
+    The first call installs a MutationObserver on the feed that tracks the
+    card count and the end-of-list marker, so each poll is one small script
+    call instead of a full document download.
+
+    Returns:
+        dict: count, ended and idle_ms (time since the card count last changed)
+    """
+    return driver.execute_script(
+        RESULTS_LOADER_SCRIPT, sidebar, SELECTORS['result_items'], SELECTORS['end_of_results']
+    )
+
+def follow_results_loader(driver, sidebar, target_count=None, stats=None, should_stop=None):
+    """
+    Poll the results feed until the list ends, stops growing or hits a target
+
+    Yields the card count every time it grows. The idle window adapts to how
+    quickly batches have been arriving: it is a multiple of the average gap
+    between batches, clamped to SCROLL_CONFIG. Load statistics are written
+    into the stats dict as the loader runs. should_stop is an optional
+    callable checked on every poll.
+    """
+    stats = stats if stats is not None else {}
+    stats.update({'cards': 0, 'ended': False, 'stop_reason': None, 'elapsed': 0.0,
+                  'polls': 0, 'batches': 0, 'avg_batch_interval': None})
+
+    start = time.monotonic()
+    last_growth = start
+    batch_intervals = []
+
+    try:
+        while True:
+            state = poll_results_loader(driver, sidebar) or {}
+            now = time.monotonic()
+            stats['polls'] += 1
+
+            count = state.get('count', 0)
+            if count > stats['cards']:
+                if stats['cards']:
+                    batch_intervals.append(now - last_growth)
+                last_growth = now
+                stats['cards'] = count
+                stats['batches'] += 1
+                if stats['batches'] % 10 == 0:
+                    print(f"📜 Loaded {count} results so far...")
+                yield count
+
+            if batch_intervals:
+                average = sum(batch_intervals) / len(batch_intervals)
+                idle_window = average * SCROLL_CONFIG['idle_multiplier']
+            else:
+                idle_window = SCROLL_CONFIG['max_idle_window']
+            idle_window = min(max(idle_window, SCROLL_CONFIG['min_idle_window']), SCROLL_CONFIG['max_idle_window'])
+
+            if should_stop and should_stop():
+                stats['stop_reason'] = 'cancelled'
+                break
+            if target_count and stats['cards'] >= target_count:
+                stats['stop_reason'] = 'target_reached'
+                print(f"✅ Loaded the {target_count} results requested.")
+                break
+            if state.get('ended'):
+                stats['ended'] = True
+                stats['stop_reason'] = 'end_of_list'
+                print("✅ Reached end of results.")
+                break
+            if now - last_growth > idle_window:
+                stats['stop_reason'] = 'idle'
+                print(f"⏹️  No new results for {idle_window:.1f}s, stopping scroll.")
+                break
+            if now - start > SCROLL_CONFIG['max_duration']:
+                stats['stop_reason'] = 'timeout'
+                print("⚠️  Scroll time limit reached, continuing with loaded results.")
+                break
+
+            time.sleep(SCROLL_CONFIG['poll_interval'])
+    finally:
+        if stats['stop_reason'] is None:
+            stats['stop_reason'] = 'stopped_by_caller'
+        stats['elapsed'] = round(time.monotonic() - start, 2)
+        if batch_intervals:
+            stats['avg_batch_interval'] = round(sum(batch_intervals) / len(batch_intervals), 2)
+
+def scroll_to_load_results(driver, query, target_count=None, meter=None):
+    """
+    Scroll the results sidebar until the list ends or stops growing
+
+    With target_count set, scrolling stops as soon as that many result cards
+    are loaded, so small jobs do not pay for loading the whole list.
+
+    Args:
+        driver: WebDriver showing the search
+        query (str): Search query, used to find the results sidebar
+        target_count (int): Stop once this many cards are loaded
+        meter (StageMeter): Counts loaded cards for throughput and ETA reporting
+
+    Returns:
+        dict: Load statistics (cards, ended, stop_reason, elapsed, polls,
+              batches, avg_batch_interval)
+    """
+    stats = {'cards': 0, 'ended': False, 'stop_reason': 'sidebar_not_found', 'elapsed': 0.0,
+             'polls': 0, 'batches': 0, 'avg_batch_interval': None}
+
+    divSideBar = find_results_sidebar(driver, query)
+    if divSideBar is None:
         print("⚠️  Could not find results sidebar, continuing anyway...")
+        return stats
+
+    if target_count:
+        print(f"📜 Scrolling to load {target_count} results...")
+    else:
+        print("📜 Scrolling to load all results...")
+
+    if meter is not None:
+        meter.start()
+        if target_count:
+            meter.add_total(target_count)
+    for count in follow_results_loader(driver, divSideBar, target_count, stats):
+        if meter is not None:
+            meter.advance_to(count)
+
+    print(f"📊 Loaded {stats['cards']} results in {stats['elapsed']}s ({stats['polls']} polls)")
+    return stats
 
 def safe_click_element(driver, element, max_attempts=3):
     wait = WebDriverWait(driver, 10)
@@ -305,140 +420,680 @@ def safe_click_element(driver, element, max_attempts=3):
     
     return False
 
-def extract_place_info(driver):
-    wait = WebDriverWait(driver, 5)
-    
-    try:
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'h1.DUwDvf.lfPIob')))
-    except TimeoutException:
-        print("⚠️  Place details didn't load in time")
-    
-    try:
-        title = driver.find_element(By.CSS_SELECTOR, 'h1.DUwDvf.lfPIob').text
-    except:
-        title = "N/A"
+PLACE_DETAILS_SCRIPT = """
+    var s = arguments[0];
+    function textOf(root, selector) {
+        var el = root ? root.querySelector(selector) : null;
+        if (!el) return null;
+        var value = (el.innerText || el.textContent || '').trim();
+        return value || null;
+    }
+    var ratingDiv = document.querySelector(s.rating_div);
+    return {
+        title: textOf(document, s.title),
+        rating_text: textOf(ratingDiv, s.rating_value),
+        review_count: textOf(ratingDiv, s.review_count),
+        rating_raw: ratingDiv ? (ratingDiv.innerText || ratingDiv.textContent || '').trim() : null,
+        address: textOf(document, s.address),
+        website: textOf(document, s.website),
+        phone: textOf(document, s.phone)
+    };
+"""
 
+@contextmanager
+def implicit_waits_disabled(driver):
+    """Turn implicit waits off so missing elements fail fast"""
+    driver.implicitly_wait(0)
     try:
-        rating_div = driver.find_element(By.CSS_SELECTOR, 'div.F7nice')
-        
-        rating_text = "N/A"
-        review_count = "N/A"
-        
-        try:
-            rating_element = rating_div.find_element(By.CSS_SELECTOR, 'span[aria-hidden="true"]')
-            rating_text = rating_element.text
-        except:
-            pass
-        
+        yield driver
+    finally:
+        driver.implicitly_wait(SELENIUM_CONFIG['implicit_wait'])
+
+def wait_for_place_details(driver, timeout=5):
+    """Explicit readiness probe: wait until the detail panel title is present"""
+    with implicit_waits_disabled(driver):
         try:
-            review_element = rating_div.find_element(By.CSS_SELECTOR, 'span[aria-label*="reviews"]')
-            review_count = review_element.text
-        except:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, SELECTORS['title']))
+            )
+            return True
+        except TimeoutException:
+            print("⚠️  Place details didn't load in time")
+            return False
+
+def extract_place_fields(driver):
+    """
+    Read every detail panel field in one WebDriver round trip
+
+    Returns:
+        dict: title, rating_text, review_count, rating_raw, address, website
+              and phone (None when the field is missing)
+    """
+    try:
+        return driver.execute_script(PLACE_DETAILS_SCRIPT, SELECTORS) or {}
+    except Exception as e:
+        print(f"⚠️  Could not read place details: {e}")
+        return {}
+
+def extract_place_info(driver):
+    wait_for_place_details(driver)
+    return place_fields_to_row(extract_place_fields(driver))
+
+def capture_place_info(driver, parse_engine='live'):
+    """
+    Extract the open place either live or from a page_source snapshot
+
+    With parse_engine='html' the browser only snapshots the page and the
+    parsing runs in the shared parser process pool; a Future is returned.
+    """
+    if parse_engine != 'html':
+        return extract_place_info(driver)
+    wait_for_place_details(driver)
+    return get_parser_pool().submit(parse_place_row, driver.page_source)
+
+def emit_row(on_row, place_info, place_id, pending):
+    """
+    Hand a row and its place ID to on_row(row, place_id)
+
+    Snapshot parses still in flight are queued on pending and delivered in
+    order by flush_parsed_rows, on the calling thread, so on_row never runs
+    after the scrape has returned.
+    """
+    if on_row is None:
+        return
+    if isinstance(place_info, Future) or pending:
+        pending.append((place_info, place_id))
+        flush_parsed_rows(on_row, pending)
+    else:
+        on_row(place_info, place_id)
+
+def flush_parsed_rows(on_row, pending, wait=False):
+    """Deliver queued rows whose parse has finished (all of them with wait=True)"""
+    while pending:
+        place_info, place_id = pending[0]
+        if isinstance(place_info, Future):
+            if not (wait or place_info.done()):
+                return
             try:
-                full_text = rating_div.text
-                import re
-                review_match = re.search(r'\((\d+(?:,\d+)*)\)', full_text)
-                if review_match:
-                    review_count = f"({review_match.group(1)})"
-            except:
-                pass
-        
-        if rating_text != "N/A" and review_count != "N/A":
-            rating = f"{rating_text} {review_count}"
-        elif rating_text != "N/A":
-            rating = rating_text
-        elif review_count != "N/A":
-            rating = review_count
+                place_info = place_info.result()
+            except Exception as e:
+                print(f"❌ Error parsing place snapshot: {e}")
+                pending.pop(0)
+                continue
+        pending.pop(0)
+        on_row(place_info, place_id)
+
+def resolve_place_rows(rows):
+    """Wait for any snapshot parses still in flight and return plain rows"""
+    return [row.result() if isinstance(row, Future) else row for row in rows]
+
+class WebDriverCommandCounter:
+    """Count WebDriver commands sent by one or more drivers"""
+
+    def __init__(self):
+        self.total = 0
+        self.by_command = {}
+        self._lock = threading.Lock()
+        self._wrappers = {}  # id(driver) -> counted execute installed by attach
+
+    def attach(self, driver):
+        """
+        Start counting commands sent through driver
+
+        Counters nest: a counter attached inside another one (e.g. scrape_results
+        inside run_scraping) passes every command on to it, so both count.
+        """
+        if id(driver) in self._wrappers:
+            return
+        original_execute = driver.execute
+
+        def counted_execute(driver_command, params=None):
+            if counted_execute.counting:
+                with self._lock:
+                    self.total += 1
+                    self.by_command[driver_command] = self.by_command.get(driver_command, 0) + 1
+            return original_execute(driver_command, params)
+
+        counted_execute.counting = True
+        counted_execute.replaced = vars(driver).get('execute')  # None for the class method
+        self._wrappers[id(driver)] = counted_execute
+        driver.execute = counted_execute
+
+    def detach(self, driver):
+        """
+        Stop counting commands for driver
+
+        The wrapper is only unwound while it is the outermost one. A counter
+        detached before a counter attached after it just stops counting, and
+        is skipped when that later counter unwinds, so a stale wrapper is
+        never put back.
+        """
+        wrapper = self._wrappers.pop(id(driver), None)
+        if wrapper is None:
+            return
+        wrapper.counting = False
+        if vars(driver).get('execute') is not wrapper:
+            return
+        restore = wrapper.replaced
+        while restore is not None and getattr(restore, 'counting', True) is False:
+            restore = restore.replaced
+        if restore is None:
+            del driver.execute
         else:
-            rating = rating_div.text if rating_div.text.strip() else "N/A"
-            
-    except:
-        rating = "N/A"
+            driver.execute = restore
 
-    try:
-        address = driver.find_element(By.CSS_SELECTOR, 'div.Io6YTe.fontBodyMedium.kR99db.fdkmkc').text
-    except:
-        address = "N/A"
+    def per_item(self, items):
+        """Average commands per processed item"""
+        return self.total / items if items else float(self.total)
 
-    try:
-        website = driver.find_element(By.CSS_SELECTOR, 'div.rogA2c.ITvuef').text
-    except:
-        website = "N/A"
+    def snapshot(self):
+        with self._lock:
+            return {'total': self.total, 'by_command': dict(self.by_command)}
+
+CARD_INDEX_SCRIPT = """
+    var s = arguments[0];
+    function textOf(root, selector) {
+        var el = root.querySelector(selector);
+        return el ? (el.textContent || '').trim() || null : null;
+    }
+    return Array.from(document.querySelectorAll(s.result_items)).map(function (card) {
+        var link = card.querySelector(s.clickable_link + '[href]');
+        return {
+            href: link ? link.href : null,
+            title: (link && link.getAttribute('aria-label')) || textOf(card, s.card_title),
+            rating: textOf(card, s.card_rating),
+            reviews: textOf(card, s.card_reviews)
+        };
+    });
+"""
+
+def snapshot_cards(driver):
+    """
+    Index every loaded result card in a single script call
+
+    Returns:
+        list: One dict per card with 'place_id', 'href', 'title', 'rating',
+              'reviews' and 'position', in sidebar order
+    """
+    cards = driver.execute_script(CARD_INDEX_SCRIPT, SELECTORS) or []
+    for position, card in enumerate(cards):
+        card['place_id'] = place_id_from_href(card.get('href'))
+        card['position'] = position
+    return cards
+
+def find_card_link(driver, href):
+    """Return the live link element of the card with this place URL (or None)"""
+    return driver.execute_script("""
+        var links = document.querySelectorAll(arguments[0] + ' ' + arguments[1] + '[href]');
+        for (var i = 0; i < links.length; i++) {
+            if (links[i].href === arguments[2]) return links[i];
+        }
+        return null;
+    """, SELECTORS['result_items'], SELECTORS['clickable_link'], href)
+
+def collect_place_links(driver, start=0):
+    """Read the place link of every loaded result card (from index start) in a single script call"""
+    links = driver.execute_script("""
+        return Array.from(document.querySelectorAll(arguments[0])).slice(arguments[1]).map(function (card) {
+            var link = card.querySelector('a[href]');
+            return link ? link.href : null;
+        });
+    """, SELECTORS['result_items'], start)
+    return links or []
+
+def dedupe_rows(rows):
+    """Drop repeated rows while keeping the original order"""
+    seen = set()
+    unique_rows = []
+    for row in rows:
+        key = tuple(row)
+        if key in seen:
+            continue
+        seen.add(key)
+        unique_rows.append(row)
+    return unique_rows
+
+def _pool_key_for(driver):
+    """Return the (browser_type, headless, profile) used to borrow sibling browsers"""
+    key = get_driver_pool().key_for(driver)
+    if key:
+        return key
+    browser_type = 'chrome' if 'chrome' in driver.capabilities.get('browserName', '') else 'firefox'
+    return browser_type, BROWSER_CONFIG['default_headless'], BROWSER_CONFIG['default_profile']
+
+def scrape_place_links(driver, links, workers=1, parse_engine='live', command_counter=None, place_index=None,
+                       checkpoint=None, on_row=None, stop_event=None):
+    """
+    Extract place details by opening each place URL directly
 
+    No clicks or fixed sleeps are involved: each worker loads a place URL and
+    waits only for the detail panel title. Worker 1 reuses the given driver;
+    the others are borrowed from the driver pool. Workers pull URLs from a
+    shared queue, so a worker that fails to get a browser simply leaves its
+    share to the others.
+
+    Args:
+        driver: WebDriver already on the search results page
+        links (list): Place URLs in result order
+        workers (int): Number of browsers to run at the same time
+        parse_engine (str): 'live' reads fields over WebDriver, 'html' parses
+            page_source snapshots in the parser process pool
+        command_counter (WebDriverCommandCounter): Also count worker browsers' commands
+        place_index (PlaceIndex): Record every scraped place in this index
+        checkpoint (Checkpoint): Journal each place as soon as it is extracted
+        on_row (callable): on_row(row, place_id), called as soon as a place is extracted
+            (from worker threads); a row identical to one already delivered is not
+            passed on or journaled again
+        stop_event (threading.Event): Workers stop taking new places once it is set
+
+    Returns:
+        list: Place rows in the original result order
+    """
+    pool = get_driver_pool()
+    browser_type, headless, profile = _pool_key_for(driver)
+    workers = max(1, min(workers, len(links)))
+
+    tasks = queue.Queue()
+    for index, href in enumerate(links):
+        tasks.put((index, href))
+
+    rows = {}
+    rows_lock = threading.Lock()
+    delivered = set()
+    cursors = {}  # place ID -> position in links, journaled with the row
+
+    def deliver(row, place_id):
+        # The same place can be listed under two links; only its first row is kept
+        with rows_lock:
+            if tuple(row) in delivered:
+                return
+            delivered.add(tuple(row))
+        if checkpoint is not None:
+            checkpoint.add(place_id, row, cursors.get(place_id))
+        if on_row is not None:
+            on_row(row, place_id)
+
+    def run_worker(worker_id):
+        worker_driver = driver
+        if worker_id > 1:
+            try:
+                worker_driver = pool.checkout(browser_type, headless, timeout=10, profile=profile)
+            except Exception as e:
+                print(f"⚠️  [worker {worker_id}] No browser available, leaving its share to others: {e}")
+                return 0
+            if command_counter:
+                command_counter.attach(worker_driver)
+
+        done = 0
+        pending = []
+        try:
+            while not (stop_event is not None and stop_event.is_set()):
+                try:
+                    index, href = tasks.get_nowait()
+                except queue.Empty:
+                    break
+
+                try:
+                    worker_driver.get(href)
+                    place_info = capture_place_info(worker_driver, parse_engine)
+                except Exception as e:
+                    print(f"❌ [worker {worker_id}] Error processing result {index + 1}: {e}")
+                    continue
+
+                done += 1
+                cursors[place_id_from_href(href)] = index + 1
+                emit_row(deliver, place_info, place_id_from_href(href), pending)
+                with rows_lock:
+                    rows[index] = place_info
+                    overall = len(rows)
+                label = place_info[0] if isinstance(place_info, list) else 'snapshot captured'
+                print(f"📋 [worker {worker_id}] {done} done, {overall}/{len(links)} overall - {label}")
+        finally:
+            flush_parsed_rows(deliver, pending, wait=True)
+            if worker_driver is not driver:
+                if command_counter:
+                    command_counter.detach(worker_driver)
+                pool.checkin(worker_driver)
+
+        print(f"🏁 [worker {worker_id}] Finished after {done} places")
+        return done
+
+    if workers > 1:
+        print(f"⚡ Extracting {len(links)} places with {workers} parallel browsers...")
+    else:
+        print(f"🧭 Opening {len(links)} place URLs directly...")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(run_worker, range(1, workers + 1)))
+
+    indexes = sorted(rows)
+    resolved = resolve_place_rows([rows[index] for index in indexes])
+    if place_index is not None:
+        place_index.record((place_id_from_href(links[index]), links[index], row)
+                           for index, row in zip(indexes, resolved))
+    return dedupe_rows(resolved)
+
+def stream_results(driver, search_query, max_results=None, load_stats=None, checkpoint=None, on_row=None,
+                   stop_event=None):
+    """
+    Scrape places while the results list is still loading
+
+    A producer thread keeps scrolling the sidebar in the given driver and
+    queues each newly discovered place URL. This generator consumes the queue
+    in a second browser borrowed from the driver pool and yields each row as
+    soon as it is extracted, so the first results arrive seconds after the
+    search starts instead of after the full scroll.
+
+    Args:
+        driver: WebDriver already on the search results page
+        search_query (str): Query shown in the results sidebar label
+        max_results (int): Places wanted for the whole run (None for all). Places
+            already in the checkpoint count towards it; they are still listed,
+            so the list is loaded up to max_results cards and only the rest queued
+        load_stats (dict): Optional dict that receives the list load stats
+        checkpoint (Checkpoint): Skip places already journaled and journal new ones
+        on_row (callable): on_row(row, place_id), called before each row is yielded
+        stop_event (threading.Event): Stop loading and extracting once it is set
+
+    Yields:
+        list: One place row per extracted place
+    """
+    pool = get_driver_pool()
+    browser_type, headless, profile = _pool_key_for(driver)
+    links = queue.Queue()
+    stop = threading.Event()
+    done_marker = object()
+    load_stats = load_stats if load_stats is not None else {}
+    publish_event = bind_publisher()
+    remaining = max_results or None
+    if max_results and checkpoint is not None:
+        remaining = max(0, max_results - len(checkpoint.rows))
+
+    def stopped():
+        return stop.is_set() or (stop_event is not None and stop_event.is_set())
+
+    def produce():
+        try:
+            sidebar = find_results_sidebar(driver, search_query)
+            if sidebar is None:
+                print("⚠️  Could not find results sidebar, nothing to stream")
+                return
+            seen = set()
+            scanned = 0
+            queued = 0
+            for count in follow_results_loader(driver, sidebar, max_results, load_stats, stopped):
+                for href in collect_place_links(driver, scanned):
+                    if checkpoint is not None and place_id_from_href(href) in checkpoint.done_ids:
+                        continue
+                    if href and href not in seen and (remaining is None or queued < remaining):
+                        seen.add(href)
+                        links.put(href)
+                        queued += 1
+                scanned = count
+                if stopped() or (remaining is not None and queued >= remaining):
+                    break
+            print(f"📜 Producer finished: {queued} places queued")
+        except Exception as e:
+            print(f"❌ Error while loading results: {e}")
+        finally:
+            links.put(done_marker)
+
+    print(f"🌊 Streaming results for '{search_query}' (limit: {'all' if remaining is None else remaining})...")
+    # Borrow the consumer browser first: if that fails no producer is left scrolling
+    consumer_driver = pool.checkout(browser_type, headless, profile=profile)
+    producer = threading.Thread(target=produce, daemon=True)
+    extracted = 0
+    seen_rows = set()
     try:
-        phone = driver.find_element(By.CSS_SELECTOR, 'button[data-item-id^="phone"] .Io6YTe').text
-    except:
-        phone = "N/A"
+        producer.start()
+        while True:
+            href = links.get()
+            if href is done_marker or (stop_event is not None and stop_event.is_set()):
+                break
+            try:
+                consumer_driver.get(href)
+                place_info = extract_place_info(consumer_driver)
+            except Exception as e:
+                print(f"❌ Error processing streamed result: {e}")
+                continue
+            if tuple(place_info) in seen_rows:
+                continue
+            seen_rows.add(tuple(place_info))
+            if checkpoint is not None:
+                checkpoint.add(place_id_from_href(href), place_info, extracted + 1)
+            publish_event('place', title=place_info[0], place_id=place_id_from_href(href),
+                          search_query=search_query)
+            if on_row is not None:
+                on_row(place_info, place_id_from_href(href))
+            extracted += 1
+            print(f"📋 [{extracted}] Extracted info for: {place_info[0]}")
+            yield place_info
+    finally:
+        stop.set()
+        if producer.is_alive():
+            producer.join()
+        pool.checkin(consumer_driver)
+        print(f"🎉 Streaming completed. Extracted {extracted} places.")
 
-    return [title, rating, address, website, phone]
+def scrape_list_cards(driver, max_results=None, skip_place_ids=None, on_row=None):
+    """
+    Extract every loaded result card from the list without opening details
 
-def scrape_results(driver, search_query, max_results=None):
-    wait = WebDriverWait(driver, 10)
-    
+    One page_source snapshot is parsed offline, so the cost is a single
+    WebDriver round trip regardless of the number of results. Website and
+    phone only exist in the detail panel and are marked 'N/A'.
+
+    Returns:
+        list: Place rows [title, rating, address, 'N/A', 'N/A', category, status]
+    """
+    cards = parse_list_cards(driver.page_source)
+    rows = []
+    seen_ids = set(skip_place_ids or ())
+    for card in cards:
+        if card['place_id'] is None or card['place_id'] in seen_ids:
+            continue  # Sponsored cards without a place link, or duplicates
+        seen_ids.add(card['place_id'])
+        rows.append(list_card_to_row(card))
+        if on_row is not None:
+            on_row(rows[-1], card['place_id'])
+        if max_results and len(rows) >= max_results:
+            break
+    print(f"📋 Read {len(rows)} places from the results list (no detail panels opened)")
+    return rows
+
+def scrape_results(driver, search_query, max_results=None, workers=1, navigation_mode='click',
+                   parse_engine='live', command_counter=None, list_only=False, skip_place_ids=None,
+                   place_index=None, known_places=None, checkpoint=None, on_row=None, stop_event=None,
+                   meter=None):
+    """
+    Extract place details for the loaded result cards
+
+    Cards are indexed once with snapshot_cards and then addressed by place
+    ID, so WebDriver traffic grows linearly with the number of results.
+
+    Args:
+        driver: WebDriver on the search results page
+        search_query (str): The search query
+        max_results (int): Maximum places to extract (None for all)
+        workers (int): Parallel browsers (implies direct navigation when > 1)
+        navigation_mode (str): 'click' result cards or open place URLs 'direct'
+        parse_engine (str): 'live' WebDriver reads or 'html' snapshot parsing
+        command_counter (WebDriverCommandCounter): Optional counter to report into
+        list_only (bool): Only read the list cards; website and phone are 'N/A' and the
+            rows also carry the card's category and status
+        skip_place_ids (set): Place IDs already scraped elsewhere; their cards are not opened
+        place_index (PlaceIndex): Persistent index checked before opening a card;
+            newly scraped places are added to it (not used with list_only)
+        known_places (str): What to do with indexed places: 'refresh' returns the
+            stored row updated from the card, 'skip' leaves them out, 'rescrape'
+            opens them again
+        checkpoint (Checkpoint): Journal each extracted place and skip places the
+            journal already holds, so an interrupted run can be resumed
+        on_row (callable): on_row(row, place_id), called as soon as a place is
+            extracted, e.g. to stream results to disk
+        stop_event (threading.Event): Stop opening places once it is set; rows
+            extracted so far are still returned
+        meter (StageMeter): Counts extracted places for throughput and ETA reporting;
+            places reused from the index are not counted
+
+    Returns:
+        list: Place rows [title, rating, address, website, phone]
+    """
     print(f"🚀 Starting to scrape results (limit: {max_results if max_results else 'all'})...")
+    
+    # Every extracted place is published to /api/events, tagged with the caller's job
+    publish_event = bind_publisher()
+    
+    def on_place(row, place_id=None, reused=False):
+        if meter is not None and not reused:
+            meter.tick()
+        publish_event('place', title=row[0], place_id=place_id, search_query=search_query)
+        if on_row is not None:
+            on_row(row, place_id)
+    
+    if checkpoint is not None and checkpoint.done_ids:
+        print(f"⏩ Resuming: {len(checkpoint.done_ids)} places already extracted")
+        skip_place_ids = set(skip_place_ids or ()) | checkpoint.done_ids
+    
+    if list_only:
+        return scrape_list_cards(driver, max_results, skip_place_ids, on_place)
+    
     time.sleep(3)
     
     data = []
-    processed_urls = set()
+    data_cards = []
+    reused = []
+    pending = []
+    processed_ids = set()
+    known_places = known_places or PLACE_INDEX_CONFIG['known_places']
+    counter = command_counter or WebDriverCommandCounter()
+    counter.attach(driver)
     
     try:
-        elem_results = driver.find_elements(By.CSS_SELECTOR, 'div.Nv2PK')
-        total_available = len(elem_results)
+        cards = snapshot_cards(driver)
+        if skip_place_ids:
+            cards = [card for card in cards if card['place_id'] not in skip_place_ids]
+        total_available = len(cards)
         
         results_to_process = min(max_results, total_available) if max_results else total_available
+        cards = cards[:results_to_process]
         
         print(f"📊 Found {total_available} results, will process {results_to_process}")
         
-        for i in range(results_to_process):
-            try:
-                elem_results = driver.find_elements(By.CSS_SELECTOR, 'div.Nv2PK')
-                
-                if i >= len(elem_results):
-                    print(f"⚠️  Result {i + 1} no longer available, stopping...")
+        if place_index is not None and known_places != 'rescrape':
+            cards, reused = place_index.split_known(cards, known_places)
+            if len(cards) < results_to_process:
+                print(f"⏭️  {results_to_process - len(cards)} places already indexed, "
+                      f"opening {len(cards)} new ones")
+            results_to_process = len(cards)
+        
+        if meter is not None:
+            meter.start()
+            meter.add_total(results_to_process)
+        
+        if workers > 1 or navigation_mode == 'direct':
+            # Parallel workers always navigate by URL; clicking needs the shared sidebar
+            links_by_id = {}
+            for card in cards:
+                if card['href']:
+                    links_by_id.setdefault(card['place_id'], card['href'])
+            links = list(links_by_id.values())
+            data = scrape_place_links(driver, links, workers, parse_engine, counter, place_index, checkpoint,
+                                      on_place, stop_event)
+        else:
+            for i, card in enumerate(cards):
+                if stop_event is not None and stop_event.is_set():
+                    print(f"⏹️  Stopped after {len(data)} places")
                     break
-                    
-                result = elem_results[i]
-                
-                print(f"🔍 Processing result {i + 1}/{results_to_process}")
-                
-                clickable_elements = result.find_elements(By.CSS_SELECTOR, 'a')
-                if not clickable_elements:
-                    print(f"⚠️  No clickable element found in result {i + 1}")
-                    continue
-                
-                query_result = clickable_elements[0]
-                
                 try:
-                    href = query_result.get_attribute('href')
-                    if href in processed_urls:
+                    print(f"🔍 Processing result {i + 1}/{results_to_process}")
+                    
+                    if not card['href']:
+                        print(f"⚠️  No clickable element found in result {i + 1}")
+                        continue
+                    
+                    if card['place_id'] in processed_ids:
                         print(f"⏭️  Skipping duplicate result {i + 1}")
                         continue
-                    processed_urls.add(href)
-                except:
-                    pass
-                
-                if safe_click_element(driver, query_result):
-                    print(f"✅ Successfully clicked result {i + 1}")
+                    processed_ids.add(card['place_id'])
                     
-                    place_info = extract_place_info(driver)
-                    data.append(place_info)
-                    print(f"📋 Extracted info for: {place_info[0]}")
+                    query_result = find_card_link(driver, card['href'])
+                    if query_result is None:
+                        print(f"⚠️  Result {i + 1} no longer available, skipping...")
+                        continue
                     
-                    time.sleep(1)
-                else:
-                    print(f"❌ Failed to click result {i + 1}, skipping...")
+                    if safe_click_element(driver, query_result):
+                        print(f"✅ Successfully clicked result {i + 1}")
+                        
+                        place_info = capture_place_info(driver, parse_engine)
+                        data.append(place_info)
+                        data_cards.append(card)
+                        if checkpoint is not None:
+                            checkpoint.add(card['place_id'], place_info, card['position'] + 1)
+                        emit_row(on_place, place_info, card['place_id'], pending)
+                        if isinstance(place_info, list):
+                            print(f"📋 Extracted info for: {place_info[0]}")
+                        else:
+                            print(f"📸 Captured snapshot of result {i + 1} for parsing")
+                        
+                        time.sleep(1)
+                    else:
+                        print(f"❌ Failed to click result {i + 1}, skipping...")
+                        continue
+                        
+                except Exception as e:
+                    print(f"❌ Error processing result {i + 1}: {e}")
                     continue
-                    
-            except Exception as e:
-                print(f"❌ Error processing result {i + 1}: {e}")
-                continue
     
     except Exception as e:
         print(f"❌ Error finding results: {e}")
+    finally:
+        counter.detach(driver)
     
+    flush_parsed_rows(on_place, pending, wait=True)
+    data = resolve_place_rows(data)
+    if place_index is not None and data_cards:
+        place_index.record((card['place_id'], card['href'], row) for card, row in zip(data_cards, data))
+    if reused:
+        print(f"♻️  Reused {len(reused)} places from the place index")
+        for place_id, row in reused:
+            on_place(row, place_id, reused=True)
+            data.append(row)
     print(f"🎉 Scraping completed. Extracted {len(data)} places.")
+    print(f"🔢 WebDriver commands: {counter.total} total, {counter.per_item(len(data)):.1f} per place")
     return data
 
+def scrape_query(driver, search_query, max_results=None, workers=1, navigation_mode='click',
+                 parse_engine='live', list_only=False, place_index=None, known_places=None, on_row=None):
+    """
+    Run one search end to end without prompting: navigate, load results, extract places
+
+    Args:
+        driver: WebDriver to run the search in
+        search_query (str): Query with location, e.g. "dentists in Austin"
+        max_results (int): Maximum places to extract (None for all)
+        workers (int): Parallel browsers for detail extraction
+        navigation_mode (str): 'click' result cards or open place URLs 'direct'
+        parse_engine (str): 'live' WebDriver reads or 'html' snapshot parsing
+        list_only (bool): Only read the list cards; website and phone are 'N/A'
+        place_index (PlaceIndex): Skip or lightly refresh places scraped in earlier runs
+        known_places (str): 'refresh', 'skip' or 'rescrape' (see scrape_results)
+        on_row (callable): on_row(row, place_id), called as soon as a place is extracted
+
+    Returns:
+        tuple: (place rows, results-loading stats)
+    """
+    driver.get(f"https://www.google.com/maps/search/{search_query.replace(' ', '+')}")
+    load_stats = scroll_to_load_results(driver, search_query, target_count=max_results)
+    
+    if count_available_results(driver, search_query, parse_engine) == 0:
+        return [], load_stats
+    
+    rows = scrape_results(driver, search_query, max_results, workers=workers,
+                          navigation_mode=navigation_mode, parse_engine=parse_engine,
+                          list_only=list_only, place_index=place_index, known_places=known_places,
+                          on_row=on_row)
+    return rows, load_stats
+
 def convert_scraped_data_to_dict_format(scraped_data):
     """Convert scraped data from list format to dictionary format for email extraction"""
     dict_data = []
@@ -461,8 +1116,16 @@ def main():
     browser_type = get_browser_choice()
     headless_mode = get_browser_mode_choice()
     
-    storage_choice = input("Choose storage format (1 for CSV, 2 for JSON): ").strip()
-    query = input("Enter the search query with location: ").replace(" ", "+")
+    storage_choice = input("Choose storage format (1 for CSV, 2 for JSON, 3 for JSON Lines): ").strip()
+    storage_format = {'2': 'json', '3': 'jsonl'}.get(storage_choice, 'csv')
+    checkpoint = get_resume_choice()
+    if checkpoint:
+        query = checkpoint.search_query
+        result_limit = checkpoint.settings.get('max_results')
+        print(f"⏩ Resuming '{query.replace('+', ' ')}' with {len(checkpoint.rows)} places already extracted")
+    else:
+        query = input("Enter the search query with location: ").replace(" ", "+")
+        result_limit = get_result_limit_choice()
     
     # Get email extraction preference
     email_extraction_method = get_email_extraction_choice()
@@ -482,8 +1145,9 @@ def main():
     
     time.sleep(1)
 
-    # Create driver with selected options
-    driver = create_driver(browser_type, headless_mode)
+    # Borrow a driver with selected options
+    pool = get_driver_pool()
+    driver = pool.checkout(browser_type, headless_mode)
     
     try:
         print(f"🌐 Navigating to Google Maps...")
@@ -491,66 +1155,66 @@ def main():
         
         query_display = query.replace("+", " ")
         
-        scroll_to_load_results(driver, query_display)
+        scroll_to_load_results(driver, query_display, target_count=result_limit)
         
         total_results = count_available_results(driver, query_display)
         
-        if total_results == 0:
+        if total_results == 0 and not (checkpoint and checkpoint.rows):
             print("❌ No results found. Exiting...")
             return
         
-        results_to_scrape = get_user_scraping_choice(total_results)
+        if checkpoint:
+            results_to_scrape = result_limit or total_results
+        else:
+            results_to_scrape = get_user_scraping_choice(total_results)
+            checkpoint = Checkpoint.create(query, {'max_results': results_to_scrape})
+        
+        # Basic data is written to disk and to the results store row by row while scraping
+        store = get_results_store()
+        store_run_id = store.start_run(query_display, checkpoint.run_id)
+        writer = open_writer(storage_format, query_display)
+        recorder = store.recorder(store_run_id, query_display)
         
-        scraped_data = scrape_results(driver, query_display, results_to_scrape)
+        def on_row(row, place_id=None):
+            writer.write_row(row)
+            recorder.write_row(row, place_id)
+        
+        previous_rows = list(checkpoint.rows)
+        for place_id, row in checkpoint.entries:
+            on_row(row, place_id)
+        remaining = max(0, results_to_scrape - len(previous_rows))
+        scraped_data = previous_rows
+        try:
+            if remaining:
+                scraped_data = previous_rows + scrape_results(driver, query_display, remaining,
+                                                              place_index=get_place_index(), checkpoint=checkpoint,
+                                                              on_row=on_row)
+        finally:
+            recorder.close()
         
         if not scraped_data:
+            writer.discard()
+            store.finish_run(store_run_id, status='empty')
             print("❌ No data was scraped. Exiting...")
             return
         
         print(f"\n🎯 === Phase 1 Complete: Scraped {len(scraped_data)} places ===")
         
-        # Save basic data first
-        if storage_choice == '2':
-            basic_filename = save_to_json(scraped_data, query_display)
-        else:
-            basic_filename = save_to_csv(scraped_data, query_display)
+        basic_filename = writer.close()
+        print(f"Basic scraped data saved to {writer.path}")
+        store.finish_run(store_run_id, output_file=basic_filename)
+        checkpoint.finish(basic_filename)
         
         # Phase 2: Email extraction based on chosen method
         if email_extraction_method == 'api':
             print(f"\n💰 === Phase 2: Starting API Email Extraction ===")
             
+            from email_extractor import EmailExtractor
             extractor = EmailExtractor(perplexity_api_key)
-            enhanced_data = extractor.process_scraped_data(scraped_data, delay=2)
-            
-            # Handle API extraction results (existing code)
-            if storage_choice == '2':
-                print("\n📝 === Updating JSON file with API email extraction results ===")
-                
-                with open(basic_filename, 'r', encoding='utf-8') as f:
-                    json_data = json.load(f)
-                
-                for i, place in enumerate(json_data['places']):
-                    if i < len(enhanced_data):
-                        place['email'] = enhanced_data[i]['email']
-                        place['background'] = enhanced_data[i]['background']
-                        place['extraction_status'] = enhanced_data[i]['extraction_status']
-                        place['extraction_method'] = 'api'
-                        if 'error_details' in enhanced_data[i]:
-                            place['error_details'] = enhanced_data[i]['error_details']
-                
-                successful_extractions = len([c for c in enhanced_data if c['extraction_status'] == 'success'])
-                json_data['extraction_summary'] = {
-                    'method': 'api',
-                    'successful': successful_extractions,
-                    'failed': len(enhanced_data) - successful_extractions
-                }
-                
-                with open(basic_filename, 'w', encoding='utf-8') as f:
-                    json.dump(json_data, f, indent=2, ensure_ascii=False)
-                
-                print(f"✅ Updated JSON file {basic_filename} with API email extraction results")
-            else:
-                extractor.save_enhanced_data_to_csv(enhanced_data, query_display)
+            # Each result is merged into the saved data by place as soon as it is extracted
+            with EnrichmentMerger(writer.path, store, store_run_id, method='api') as merger:
+                enhanced_data = extractor.process_scraped_data(scraped_data, delay=2, on_result=merger.add)
+            print(f"✅ Saved email extraction results to {merger.path}")
             
             successful_extractions = len([c for c in enhanced_data if c['extraction_status'] == 'success'])
             
@@ -568,37 +1232,15 @@ def main():
             dict_scraped_data = convert_scraped_data_to_dict_format(scraped_data)
             
             # Initialize free email extractor
+            from free_email_extractor import FreeEmailExtractor
             free_extractor = FreeEmailExtractor(headless=chatgpt_headless, browser_type=browser_type)
             
             try:
                 # Process with free method
-                free_results = free_extractor.process_scraped_data_free(dict_scraped_data, delay=15)
-                
-                if storage_choice == '2':
-                    print("\n📝 === Updating JSON file with FREE email extraction progress ===")
-                    
-                    with open(basic_filename, 'r', encoding='utf-8') as f:
-                        json_data = json.load(f)
-                    
-                    # Add phase 1 results
-                    for i, place in enumerate(json_data['places']):
-                        place['extraction_method'] = 'free'
-                        place['extraction_status'] = 'phase1_complete'
-                        place['phase1_processed'] = i < free_results['processed']
-                        place['notes'] = 'Phase 1 complete - prompt sent to ChatGPT. Phase 2 will parse responses.'
-                    
-                    json_data['extraction_summary'] = {
-                        'method': 'free',
-                        'phase': 1,
-                        'processed': free_results['processed'],
-                        'failed': free_results['failed'],
-                        'notes': 'Phase 1 complete. Phase 2 (response parsing) not yet implemented.'
-                    }
-                    
-                    with open(basic_filename, 'w', encoding='utf-8') as f:
-                        json.dump(json_data, f, indent=2, ensure_ascii=False)
-                    
-                    print(f"✅ Updated JSON file {basic_filename} with FREE email extraction Phase 1 results")
+                with EnrichmentMerger(writer.path, store, store_run_id, method='free') as merger:
+                    free_results = free_extractor.process_scraped_data_free(dict_scraped_data, delay=15,
+                                                                            on_result=merger.add)
+                print(f"✅ Saved email extraction results to {merger.path}")
                 
                 successful_extractions = free_results['processed']
                 
@@ -632,7 +1274,8 @@ def main():
     except Exception as e:
         print(f"❌ An error occurred during scraping: {e}")
     finally:
-        driver.quit()
+        pool.checkin(driver)
+        pool.shutdown()
         print("🔒 Main browser closed. Session ended.")
 
 if __name__ == "__main__":
@@ -0,0 +1,273 @@
+import queue
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+from config import JOB_CONFIG
+from events import event_scope, get_event_bus
+
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+# Job parameters that are never returned by the API
+SECRET_PARAM_SUFFIXES = ('_key', 'password')
+
+# Status fields in every snapshot; anything else set with Job.update is a detail
+STATUS_FIELDS = ('progress', 'message', 'total_found', 'scraped_count', 'output_file', 'run_id', 'store_run_id',
+                 'stages')
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+class Job:
+    def __init__(self, target, kind, params):
+        """
+        One background task with its own status, result rows and cancel flag
+
+        Args:
+            target (callable): target(job, **params), run on a worker thread
+            kind (str): What the job does, e.g. 'scrape'
+            params (dict): Keyword arguments passed to target
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.params = params
+        self.target = target
+        self.state = QUEUED
+        self.created_at = _now()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.rows = []  # Result rows in the order they were produced; row N has cursor N + 1
+        self.cancel_event = threading.Event()
+        self._done = threading.Event()
+        self.status = {'progress': 0, 'message': 'Queued', 'total_found': 0, 'scraped_count': 0}
+        self._lock = threading.Lock()
+
+    @property
+    def is_active(self):
+        return self.state in ACTIVE_STATES
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def update(self, **fields):
+        """Set status fields (message, progress, counts...) and publish them as a 'progress' event"""
+        with self._lock:
+            self.status.update(fields)
+        get_event_bus().publish('progress', tags={'job_id': self.id}, **fields)
+
+    def add_row(self, row):
+        """Append a result row; clients fetch new rows with rows_since"""
+        with self._lock:
+            self.rows.append(row)
+
+    def rows_since(self, since=0, limit=None):
+        """
+        Result rows added after a cursor
+
+        Args:
+            since (int): Cursor from the previous call (0 for the first)
+            limit (int): Most rows to return
+
+        Returns:
+            tuple: (rows, next cursor, total rows so far)
+        """
+        with self._lock:
+            since = max(0, min(since, len(self.rows)))
+            end = len(self.rows) if limit is None else min(len(self.rows), since + limit)
+            return self.rows[since:end], end, len(self.rows)
+
+    def _set_state(self, state, error=None):
+        with self._lock:
+            self.state = state
+            if state == RUNNING:
+                self.started_at = _now()
+            elif state not in ACTIVE_STATES:
+                self.finished_at = _now()
+            if error is not None:
+                self.error = error
+        get_event_bus().publish('phase', tags={'job_id': self.id}, state=state, error=error)
+        if state not in ACTIVE_STATES:
+            self._done.set()
+
+    def wait(self, timeout=None):
+        """Block until the job has finished, failed or been cancelled; returns False on timeout"""
+        return self._done.wait(timeout)
+
+    def snapshot(self, details=False):
+        """
+        JSON-ready view of the job
+
+        The default view has the same small set of fields however many rows
+        the job has produced; rows are read separately with rows_since.
+
+        Args:
+            details (bool): Also include the parameters and the detail stats
+                (page load, results loading, tiling, WebDriver commands)
+
+        Returns:
+            dict: id, kind, state, is_running, STATUS_FIELDS, result_count and timestamps
+        """
+        with self._lock:
+            data = {field: self.status.get(field) for field in STATUS_FIELDS}
+            data.update({
+                'id': self.id,
+                'kind': self.kind,
+                'state': self.state,
+                'is_running': self.state in ACTIVE_STATES,
+                'result_count': len(self.rows),
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'error': self.error,
+            })
+            if details:
+                data['params'] = {name: value for name, value in self.params.items()
+                                  if not name.endswith(SECRET_PARAM_SUFFIXES)}
+                data['details'] = {name: value for name, value in self.status.items() if name not in STATUS_FIELDS}
+            return data
+
+
+class JobManager:
+    def __init__(self, max_concurrent=None, max_finished=None):
+        """
+        Queue background jobs and run a bounded number of them at a time
+
+        Args:
+            max_concurrent (int): Jobs running at the same time
+            max_finished (int): Finished, failed and cancelled jobs kept for inspection
+        """
+        self.max_concurrent = max_concurrent or JOB_CONFIG['max_concurrent']
+        self.max_finished = max_finished or JOB_CONFIG['max_finished']
+        self._queue = queue.Queue()
+        self._jobs = OrderedDict()  # job id -> Job, in submission order
+        self._lock = threading.Lock()
+        self._workers = []
+
+    def _start_workers(self):
+        while len(self._workers) < self.max_concurrent:
+            worker = threading.Thread(target=self._work, name=f'job-worker-{len(self._workers) + 1}', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(self, target, kind='scrape', **params):
+        """
+        Queue a job; it starts as soon as a worker is free
+
+        Args:
+            target (callable): target(job, **params)
+            kind (str): Job type shown in listings
+            **params: Keyword arguments for target
+
+        Returns:
+            Job: The queued job
+        """
+        job = Job(target, kind, params)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._start_workers()
+        self._queue.put(job)
+        print(f"📥 Queued {kind} job {job.id}")
+        return job
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if not job.cancelled:
+                    self._run(job)
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job):
+        job._set_state(RUNNING)
+        job.update(message='Starting...')
+        try:
+            # Events published while the job runs (places, emails) carry its ID
+            with event_scope(job_id=job.id):
+                job.target(job, **job.params)
+        except Exception as e:
+            print(f"❌ Job {job.id} failed: {e}")
+            job._set_state(FAILED, error=str(e))
+        else:
+            job._set_state(CANCELLED if job.cancelled else FINISHED)
+        self._prune()
+
+    def cancel(self, job_id):
+        """
+        Ask a job to stop; a queued job is cancelled at once
+
+        Running jobs check their cancel_event between places and stop
+        cleanly, keeping what they already saved.
+
+        Returns:
+            Job: The job, or None when the ID is unknown
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.cancel_event.set()
+        if job.state == QUEUED:
+            job._set_state(CANCELLED)
+            job.update(message='Cancelled before it started')
+            self._prune()
+        elif job.state == RUNNING:
+            job.update(message='Cancelling...')
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        """All retained jobs, newest first"""
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def latest(self):
+        """Most recently submitted job, or None"""
+        with self._lock:
+            return next(reversed(self._jobs.values()), None)
+
+    def queue_position(self, job):
+        """Jobs waiting ahead of a queued job (0 = next to start), or None when it is not queued"""
+        if job.state != QUEUED:
+            return None
+        with self._lock:
+            waiting = [other for other in self._jobs.values() if other.state == QUEUED]
+        return waiting.index(job) if job in waiting else None
+
+    def snapshot(self, job, details=False):
+        data = job.snapshot(details)
+        data['queue_position'] = self.queue_position(job)
+        return data
+
+    def _prune(self):
+        """Drop the oldest finished jobs beyond max_finished"""
+        with self._lock:
+            done = [job_id for job_id, job in self._jobs.items() if not job.is_active]
+            for job_id in done[:max(0, len(done) - self.max_finished)]:
+                del self._jobs[job_id]
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """Return the process-wide job manager, creating it on first use"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+        return _manager
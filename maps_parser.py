@@ -0,0 +1,230 @@
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
+
+from config import PARSER_CONFIG, SELECTORS
+
+# Checked without importing, so modules that only need the helpers below
+# (e.g. place_index.format_rating) do not load bs4 and lxml
+HTML_PARSER = 'lxml' if find_spec('lxml') is not None else 'html.parser'
+
+
+def _make_soup(html):
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html or '', HTML_PARSER)
+
+
+def _text_of(root, selector):
+    """Return the whitespace-normalized text of the first match, or None"""
+    if root is None:
+        return None
+    element = root.select_one(selector)
+    if element is None:
+        return None
+    value = ' '.join(element.get_text(' ', strip=True).split())
+    return value or None
+
+
+def format_rating(rating_text, review_count, rating_raw):
+    """Combine rating and review count into the 'Rating & Reviews' column"""
+    rating_text = rating_text or "N/A"
+
+    if not review_count:
+        review_match = re.search(r'\((\d+(?:,\d+)*)\)', rating_raw or '')
+        review_count = f"({review_match.group(1)})" if review_match else "N/A"
+
+    if rating_text != "N/A" and review_count != "N/A":
+        return f"{rating_text} {review_count}"
+    elif rating_text != "N/A":
+        return rating_text
+    elif review_count != "N/A":
+        return review_count
+    return rating_raw.strip() if rating_raw and rating_raw.strip() else "N/A"
+
+
+def parse_place_html(html):
+    """
+    Extract detail panel fields from a page_source snapshot
+
+    Args:
+        html (str): page_source of a Maps place page
+
+    Returns:
+        dict: title, rating_text, review_count, rating_raw, address, website
+              and phone (None when the field is missing)
+    """
+    soup = _make_soup(html)
+    rating_div = soup.select_one(SELECTORS['rating_div'])
+
+    rating_raw = None
+    if rating_div is not None:
+        rating_raw = ' '.join(rating_div.get_text(' ', strip=True).split()) or None
+
+    return {
+        'title': _text_of(soup, SELECTORS['title']),
+        'rating_text': _text_of(rating_div, SELECTORS['rating_value']),
+        'review_count': _text_of(rating_div, SELECTORS['review_count']),
+        'rating_raw': rating_raw,
+        'address': _text_of(soup, SELECTORS['address']),
+        'website': _text_of(soup, SELECTORS['website']),
+        'phone': _text_of(soup, SELECTORS['phone']),
+    }
+
+
+def place_fields_to_row(fields):
+    """Convert a place field dict to the scraper's five-column row"""
+    return [
+        fields.get('title') or "N/A",
+        format_rating(fields.get('rating_text'), fields.get('review_count'), fields.get('rating_raw')),
+        fields.get('address') or "N/A",
+        fields.get('website') or "N/A",
+        fields.get('phone') or "N/A",
+    ]
+
+
+def parse_place_row(html):
+    """Parse a place page snapshot straight into a five-column row"""
+    return place_fields_to_row(parse_place_html(html))
+
+
+PLACE_ID_PATTERNS = [
+    re.compile(r'!19s(ChIJ[\w-]+)'),                  # Google place ID
+    re.compile(r'!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)'),  # Feature ID (ends with the CID)
+    re.compile(r'[?&]cid=(\d+)'),                       # Classic CID links
+]
+
+
+def place_id_from_href(href):
+    """
+    Derive a stable place identifier from a Maps place URL
+
+    Prefers the ChIJ place ID, then the 0x...:0x... feature ID, then a cid
+    query parameter. Falls back to the URL path without query string.
+    """
+    if not href:
+        return None
+    for pattern in PLACE_ID_PATTERNS:
+        match = pattern.search(href)
+        if match:
+            return match.group(1)
+    return href.split('?')[0]
+
+
+def parse_result_cards(html):
+    """
+    Extract the result cards from a search results page snapshot
+
+    Returns:
+        list: One dict per card with 'place_id', 'href', 'title', 'rating'
+              and 'reviews'
+    """
+    return [_card_summary(card) for card in _make_soup(html).select(SELECTORS['result_items'])]
+
+
+def _card_summary(card):
+    link = card.select_one(f"{SELECTORS['clickable_link']}[href]")
+    href = link.get('href') if link is not None else None
+    return {
+        'place_id': place_id_from_href(href),
+        'href': href,
+        'title': (link.get('aria-label') if link is not None else None) or _text_of(card, SELECTORS['card_title']),
+        'rating': _text_of(card, SELECTORS['card_rating']),
+        'reviews': _text_of(card, SELECTORS['card_reviews']),
+    }
+
+
+def _card_detail_lines(card):
+    """Split a card's info lines ('Category · Address', 'Open · Closes 10 PM') into parts"""
+    lines = []
+    for element in card.select(SELECTORS['card_details']):
+        # Skip wrapper blocks and the rating line; keep only leaf info lines
+        if element.select_one(SELECTORS['card_details']) or element.select_one(SELECTORS['card_rating']):
+            continue
+        parts = [part.strip() for part in element.get_text(' ', strip=True).split('·')]
+        parts = [' '.join(part.split()) for part in parts if part]
+        if parts:
+            lines.append(parts)
+    return lines
+
+
+def parse_list_cards(html):
+    """
+    Extract everything a result card shows without opening its detail panel
+
+    Returns:
+        list: One dict per card with place_id, href, title, rating, reviews,
+              category, address and status (None when not shown)
+    """
+    cards = []
+    for card in _make_soup(html).select(SELECTORS['result_items']):
+        summary = _card_summary(card)
+        lines = _card_detail_lines(card)
+        first_line = lines[0] if lines else []
+        summary.update({
+            'category': first_line[0] if len(first_line) > 1 else None,
+            'address': first_line[-1] if first_line else None,
+            'status': ' · '.join(lines[1]) if len(lines) > 1 else None,
+        })
+        cards.append(summary)
+    return cards
+
+
+def list_card_to_row(card):
+    """
+    Convert a list card to a place row; detail-only fields are 'N/A'
+
+    The five usual columns are followed by the card's category and
+    open/closed status (output_writers.LIST_CARD_FIELDS).
+    """
+    return [
+        card.get('title') or "N/A",
+        format_rating(card.get('rating'), card.get('reviews'), None),
+        card.get('address') or "N/A",
+        "N/A",  # Website is only shown in the detail panel
+        "N/A",  # Phone is only shown in the detail panel
+        card.get('category') or "N/A",
+        card.get('status') or "N/A",
+    ]
+
+
+def count_result_cards(html):
+    """Count loaded result cards in a search results page snapshot"""
+    return len(_make_soup(html).select(SELECTORS['result_items']))
+
+
+def is_end_of_list(html):
+    """Check whether the results list snapshot shows the end-of-list marker"""
+    return SELECTORS['end_of_results'] in (html or '')
+
+
+_parser_pool = None
+_parser_pool_lock = threading.Lock()
+
+
+def get_parser_pool():
+    """Return the shared process pool used for CPU-bound HTML parsing"""
+    global _parser_pool
+    with _parser_pool_lock:
+        if _parser_pool is None:
+            _parser_pool = ProcessPoolExecutor(max_workers=PARSER_CONFIG['processes'])
+        return _parser_pool
+
+
+def parse_place_pages(pages, processes=None):
+    """
+    Parse many place page snapshots across CPU cores
+
+    Args:
+        pages (list): page_source strings
+        processes (int): Worker processes (defaults to PARSER_CONFIG)
+
+    Returns:
+        list: Five-column rows in the same order as pages
+    """
+    if processes == 1 or len(pages) <= 1:
+        return [parse_place_row(html) for html in pages]
+    if processes:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            return list(executor.map(parse_place_row, pages))
+    return list(get_parser_pool().map(parse_place_row, pages))
@@ -0,0 +1,183 @@
+import csv
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+CSV_HEADER = ["Title", "Rating & Reviews", "Address", "Website", "Phone", "Search Query"]
+PLACE_FIELDS = ["title", "rating_and_reviews", "address", "website", "phone"]
+
+# Extra fields a list card shows (list-only rows carry them after the phone column)
+LIST_CARD_FIELDS = ["category", "status"]
+EXTRA_CSV_HEADERS = {"category": "Category", "status": "Status"}
+
+
+def row_to_place(row):
+    """
+    Convert a place row [title, rating, address, website, phone] into a place dict
+
+    Values after the phone column (category and status of list-only rows)
+    are added under LIST_CARD_FIELDS.
+    """
+    place = {field: row[i] if len(row) > i else 'N/A' for i, field in enumerate(PLACE_FIELDS)}
+    place.update(zip(LIST_CARD_FIELDS, row[len(PLACE_FIELDS):]))
+    return place
+
+
+class RowWriter(ABC):
+    def __init__(self, path, search_query, mode='w', extra_fields=()):
+        """
+        Write scraped rows to disk one at a time
+
+        Every row is flushed as soon as it is written, so partial results are
+        readable while the scrape is still running and memory use does not
+        grow with the number of places. Safe to call from several threads.
+
+        Args:
+            path (str): Output file
+            search_query (str): Query stored alongside the rows
+            mode (str): 'w' to overwrite, 'x' to fail with FileExistsError if the file exists
+            extra_fields (tuple): LIST_CARD_FIELDS the rows carry after the phone column;
+                CSV files get a column for each, JSON formats add them whenever present
+        """
+        self.path = path
+        self.extra_fields = tuple(extra_fields)
+        self.filename = os.path.basename(path)
+        self.search_query = search_query
+        self.count = 0
+        self.closed = False
+        self._lock = threading.Lock()
+        self._file = open(path, mode, newline='', encoding='utf-8')
+        self._start()
+        self._file.flush()
+
+    def _start(self):
+        pass
+
+    @abstractmethod
+    def _write(self, row, search_query):
+        """Write one row to self._file in the format of the subclass"""
+
+    def _finish(self):
+        pass
+
+    def write_row(self, row, search_query=None):
+        """Append one place row and flush it to disk (search_query overrides the file's query)"""
+        with self._lock:
+            self._write(row, search_query or self.search_query)
+            self.count += 1
+            self._file.flush()
+
+    def write_rows(self, rows, search_query=None):
+        for row in rows:
+            self.write_row(row, search_query)
+
+    def close(self):
+        """Finalize the file and return its name"""
+        with self._lock:
+            if not self.closed:
+                self._finish()
+                self._file.close()
+                self.closed = True
+        return self.filename
+
+    def discard(self):
+        """Close and delete the file (e.g. when nothing was scraped)"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class CsvRowWriter(RowWriter):
+    def _start(self):
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_HEADER + [EXTRA_CSV_HEADERS[field] for field in self.extra_fields])
+
+    def _write(self, row, search_query):
+        extras = (list(row[len(PLACE_FIELDS):]) + ['N/A'] * len(self.extra_fields))[:len(self.extra_fields)]
+        self._writer.writerow((*row[:len(PLACE_FIELDS)], search_query, *extras))
+
+
+class JsonlRowWriter(RowWriter):
+    def _write(self, row, search_query):
+        place = row_to_place(row)
+        place['search_query'] = search_query
+        self._file.write(json.dumps(place, ensure_ascii=False) + '\n')
+
+
+class JsonRowWriter(RowWriter):
+    """
+    Writes the usual {search_query, scraped_at, places, total_results} document
+    incrementally: the places array stays open while rows are appended and the
+    envelope is closed with the final count in close(). Until then the file is
+    an unterminated JSON document; use JSON Lines for readable partial output.
+    """
+
+    def _start(self):
+        self._file.write('{\n')
+        self._file.write(f'  "search_query": {json.dumps(self.search_query, ensure_ascii=False)},\n')
+        self._file.write(f'  "scraped_at": {json.dumps(datetime.now().isoformat())},\n')
+        self._file.write('  "places": [')
+
+    def _write(self, row, search_query):
+        place = row_to_place(row)
+        if search_query != self.search_query:
+            place['search_query'] = search_query
+        place = json.dumps(place, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+        self._file.write(('\n    ' if self.count == 0 else ',\n    ') + place)
+
+    def _finish(self):
+        self._file.write('\n  ]' if self.count else ']')
+        self._file.write(f',\n  "total_results": {self.count}\n}}\n')
+
+
+WRITERS = {'csv': CsvRowWriter, 'json': JsonRowWriter, 'jsonl': JsonlRowWriter}
+
+
+def open_writer(storage_format, search_query, data_dir='data', extra_fields=()):
+    """
+    Create a timestamped scraped_data_* file in the data directory
+
+    The file is created exclusively: when another job started in the same
+    second, a _2, _3... suffix is added instead of truncating its file.
+
+    Args:
+        storage_format (str): 'csv', 'json' or 'jsonl'
+        search_query (str): Query stored alongside the rows
+        data_dir (str): Output directory
+        extra_fields (tuple): Extra row fields to store (LIST_CARD_FIELDS for list-only runs)
+
+    Returns:
+        RowWriter: Writer for the new file
+    """
+    if storage_format not in WRITERS:
+        raise ValueError(f"Unsupported storage format: {storage_format}")
+    os.makedirs(data_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    attempt = 1
+    while True:
+        suffix = f"_{attempt}" if attempt > 1 else ""
+        path = os.path.join(data_dir, f"scraped_data_{timestamp}{suffix}.{storage_format}")
+        try:
+            return WRITERS[storage_format](path, search_query, mode='x', extra_fields=extra_fields)
+        except FileExistsError:
+            attempt += 1
+
+
+def read_jsonl(path):
+    """Read the place dicts of a JSON Lines file, skipping a torn last line"""
+    places = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                places.append(json.loads(line))
+            except ValueError:
+                continue
+    return places
@@ -0,0 +1,165 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from config import PLACE_INDEX_CONFIG
+from maps_parser import format_rating
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS places (
+        place_id TEXT PRIMARY KEY,
+        href TEXT,
+        row_json TEXT NOT NULL,
+        first_seen TEXT NOT NULL,
+        last_seen TEXT NOT NULL,
+        last_scraped TEXT NOT NULL,
+        times_seen INTEGER NOT NULL DEFAULT 1
+    )
+"""
+
+# SQLite limits the number of host parameters in one statement
+LOOKUP_CHUNK = 500
+
+
+class PlaceIndex:
+    def __init__(self, path=None, refresh_after_days=None):
+        """
+        Persistent index of scraped places keyed by the place ID from the card href
+
+        Args:
+            path (str): SQLite database file (':memory:' for a throwaway index)
+            refresh_after_days (int): Re-scrape known places older than this many days
+        """
+        self.path = path or PLACE_INDEX_CONFIG['path']
+        if refresh_after_days is None:
+            refresh_after_days = PLACE_INDEX_CONFIG['refresh_after_days']
+        self.refresh_after = timedelta(days=refresh_after_days)
+
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(SCHEMA)
+
+    def lookup(self, place_ids):
+        """
+        Fetch index entries for the given place IDs
+
+        Returns:
+            dict: place_id -> {'row', 'last_scraped', 'times_seen'} for known places
+        """
+        place_ids = [place_id for place_id in set(place_ids) if place_id]
+        entries = {}
+        with self._lock:
+            for start in range(0, len(place_ids), LOOKUP_CHUNK):
+                chunk = place_ids[start:start + LOOKUP_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                for place_id, row_json, last_scraped, times_seen in self._conn.execute(
+                        f"SELECT place_id, row_json, last_scraped, times_seen FROM places "
+                        f"WHERE place_id IN ({placeholders})", chunk):
+                    entries[place_id] = {
+                        'row': json.loads(row_json),
+                        'last_scraped': datetime.fromisoformat(last_scraped),
+                        'times_seen': times_seen,
+                    }
+        return entries
+
+    def is_stale(self, entry, now=None):
+        """True when a known place was last scraped too long ago to trust"""
+        return (now or datetime.now()) - entry['last_scraped'] > self.refresh_after
+
+    def split_known(self, cards, known_places='refresh'):
+        """
+        Separate result cards that must be scraped from places already in the index
+
+        Known places are never opened. In 'refresh' mode their stored row is
+        returned with title and rating updated from the card; in 'skip' mode
+        they are left out of the results entirely. Stale entries are scraped
+        again like new places.
+
+        Args:
+            cards (list): Card dicts from snapshot_cards()
+            known_places (str): 'refresh' or 'skip'
+
+        Returns:
+            tuple: (cards to scrape, (place_id, row) pairs reused from the index)
+        """
+        entries = self.lookup(card['place_id'] for card in cards)
+        now = datetime.now()
+
+        to_scrape, reused, seen = [], [], []
+        for card in cards:
+            entry = entries.get(card['place_id'])
+            if entry is None or self.is_stale(entry, now):
+                to_scrape.append(card)
+                continue
+
+            row = list(entry['row'])
+            row[0] = card.get('title') or row[0]
+            if card.get('rating'):
+                row[1] = format_rating(card['rating'], card.get('reviews'), None)
+            seen.append((card['place_id'], row))
+            if known_places == 'refresh':
+                reused.append((card['place_id'], row))
+
+        self.touch(seen)
+        return to_scrape, reused
+
+    def touch(self, places):
+        """Mark (place_id, row) pairs as seen again, storing the refreshed row"""
+        if not places:
+            return
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE places SET row_json = ?, last_seen = ?, times_seen = times_seen + 1 WHERE place_id = ?",
+                [(json.dumps(row, ensure_ascii=False), now, place_id) for place_id, row in places]
+            )
+
+    def record(self, places):
+        """
+        Store freshly scraped places
+
+        Args:
+            places (list): (place_id, href, row) tuples; entries without a place ID are ignored
+        """
+        now = datetime.now().isoformat()
+        values = [(place_id, href, json.dumps(row, ensure_ascii=False), now, now, now)
+                  for place_id, href, row in places if place_id]
+        if not values:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO places (place_id, href, row_json, first_seen, last_seen, last_scraped)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(place_id) DO UPDATE SET
+                    href = excluded.href,
+                    row_json = excluded.row_json,
+                    last_seen = excluded.last_seen,
+                    last_scraped = excluded.last_scraped,
+                    times_seen = times_seen + 1
+            """, values)
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_place_index():
+    """Return the process-wide place index, opening it on first use"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = PlaceIndex()
+        return _index
@@ -0,0 +1,177 @@
+"""
+Per-stage progress counters: items done, throughput, moving-average latency and ETA
+
+A scraping job runs through stages (loading the results list, extracting
+places, email enrichment). Each stage has a StageMeter that is ticked once per
+item; the ProgressTracker combines them into one weighted percentage and
+reports changes to the job status.
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+
+from config import PROGRESS_CONFIG
+
+PENDING = 'pending'
+RUNNING = 'running'
+FINISHED = 'finished'
+
+
+class StageMeter:
+    def __init__(self, name, total=None, window=None, on_change=None):
+        """
+        Count the items of one stage and estimate when it will finish
+
+        Args:
+            name (str): Stage name, e.g. 'scrape'
+            total (int): Items expected (None when unknown; no ETA then)
+            window (int): Recent items averaged for the latency and rate
+            on_change (callable): on_change(meter, force) after every tick
+        """
+        self.name = name
+        self.total = total
+        self.done = 0
+        self.state = PENDING
+        self._latencies = deque(maxlen=window or PROGRESS_CONFIG['latency_window'])
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._started = None
+        self._last = None
+        self._finished = None
+
+    def _start(self, now):
+        if self._started is None:
+            self._started = self._last = now
+            self.state = RUNNING
+
+    def start(self):
+        """Start the clock without counting an item (ticks start it too)"""
+        with self._lock:
+            self._start(time.monotonic())
+        self._changed(force=True)
+
+    def add_total(self, count):
+        """Expect count more items, e.g. once per tile of a tiled search"""
+        with self._lock:
+            self.total = (self.total or 0) + count
+        self._changed()
+
+    def tick(self, count=1):
+        """
+        Record finished items
+
+        The time since the previous tick is shared among the items, so with
+        parallel workers the latency is the time per completed item.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._start(now)
+            if count <= 0:
+                return
+            elapsed = now - self._last
+            self._last = now
+            self.done += count
+            if elapsed > 0:  # Not when this tick started the clock
+                for _ in range(min(count, self._latencies.maxlen)):
+                    self._latencies.append(elapsed / count)
+        self._changed()
+
+    def advance_to(self, done):
+        """Record progress given as a running total, e.g. cards loaded so far"""
+        self.tick(done - self.done)
+
+    def finish(self):
+        with self._lock:
+            now = time.monotonic()
+            self._start(now)
+            self._finished = now
+            self.state = FINISHED
+        self._changed(force=True)
+
+    def _changed(self, force=False):
+        if self._on_change is not None:
+            self._on_change(self, force)
+
+    def fraction(self):
+        """Share of the stage that is done, between 0 and 1"""
+        if self.state == FINISHED:
+            return 1.0
+        if not self.total:
+            return 0.0
+        return min(1.0, self.done / self.total)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: state, done, total, elapsed_s, items_per_minute, avg_latency_s,
+                  eta_seconds and eta (ISO time); unknown values are None
+        """
+        with self._lock:
+            now = time.monotonic()
+            elapsed = ((self._finished or now) - self._started) if self._started is not None else 0.0
+            latency = sum(self._latencies) / len(self._latencies) if self._latencies else None
+            remaining = max(0, self.total - self.done) if self.total is not None else None
+            eta_seconds = None
+            if self.state == RUNNING and latency is not None and remaining is not None:
+                eta_seconds = remaining * latency
+            return {
+                'state': self.state,
+                'done': self.done,
+                'total': self.total,
+                'elapsed_s': round(elapsed, 1),
+                'items_per_minute': round(60 / latency, 1) if latency else None,
+                'avg_latency_s': round(latency, 2) if latency is not None else None,
+                'eta_seconds': round(eta_seconds) if eta_seconds is not None else None,
+                'eta': ((datetime.now() + timedelta(seconds=eta_seconds)).isoformat(timespec='seconds')
+                        if eta_seconds is not None else None),
+            }
+
+
+class ProgressTracker:
+    def __init__(self, stages, on_change=None, min_interval=None):
+        """
+        Combine the meters of a job's stages into one progress report
+
+        Args:
+            stages (list): Stage names in the order they run
+            on_change (callable): on_change(report) with the snapshot() dict
+            min_interval (float): Seconds between reports (finishes are always reported)
+        """
+        weights = PROGRESS_CONFIG['stage_weights']
+        self.meters = {name: StageMeter(name, on_change=self._meter_changed) for name in stages}
+        self._weights = {name: weights.get(name, 1) for name in stages}
+        self._on_change = on_change
+        self._min_interval = PROGRESS_CONFIG['update_interval'] if min_interval is None else min_interval
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """The meter of one stage, or None when the job does not run that stage"""
+        return self.meters.get(name)
+
+    def _meter_changed(self, meter, force):
+        if self._on_change is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_report < self._min_interval:
+                return
+            self._last_report = now
+        self._on_change(self.snapshot())
+
+    def percent(self):
+        total_weight = sum(self._weights.values())
+        if not total_weight:
+            return 0
+        done = sum(self._weights[name] * meter.fraction() for name, meter in self.meters.items())
+        return int(100 * done / total_weight)
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: progress (weighted percent over all stages) and stages (name -> StageMeter.snapshot())
+        """
+        return {'progress': self.percent(),
+                'stages': {name: meter.snapshot() for name, meter in self.meters.items()}}
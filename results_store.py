@@ -0,0 +1,376 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from config import RESULTS_STORE_CONFIG
+from output_writers import LIST_CARD_FIELDS, PLACE_FIELDS
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        search_query TEXT NOT NULL,
+        checkpoint_id TEXT,
+        started_at TEXT NOT NULL,
+        finished_at TEXT,
+        status TEXT NOT NULL DEFAULT 'running',
+        output_file TEXT,
+        total_results INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_runs_query ON runs (search_query);
+    CREATE INDEX IF NOT EXISTS idx_runs_checkpoint ON runs (checkpoint_id);
+
+    CREATE TABLE IF NOT EXISTS places (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        place_id TEXT,
+        title TEXT,
+        rating_and_reviews TEXT,
+        address TEXT,
+        website TEXT,
+        phone TEXT,
+        search_query TEXT,
+        category TEXT,
+        status TEXT,
+        scraped_at TEXT NOT NULL,
+        UNIQUE (run_id, position)
+    );
+    CREATE INDEX IF NOT EXISTS idx_places_place_id ON places (place_id);
+    CREATE INDEX IF NOT EXISTS idx_places_query ON places (search_query);
+
+    CREATE TABLE IF NOT EXISTS enrichment (
+        place_ref INTEGER PRIMARY KEY REFERENCES places (id) ON DELETE CASCADE,
+        email TEXT,
+        has_email INTEGER NOT NULL DEFAULT 0,
+        background TEXT,
+        extraction_status TEXT,
+        source TEXT,
+        updated_at TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_enrichment_has_email ON enrichment (has_email, place_ref);
+"""
+
+ENRICHMENT_FIELDS = ["email", "background", "extraction_status", "source"]
+
+PLACE_COLUMNS = ', '.join(f"p.{field}" for field in ['place_id', *PLACE_FIELDS, 'search_query', *LIST_CARD_FIELDS])
+ENRICHMENT_COLUMNS = ', '.join(f"e.{field}" for field in ENRICHMENT_FIELDS)
+
+# Prefix of data source names that refer to a stored run instead of a file
+RUN_SOURCE_PREFIX = 'run:'
+
+
+def has_email(email):
+    return bool(email) and email != 'N/A'
+
+
+def parse_run_source(name):
+    """Return the run ID of a 'run:<id>' data source name, or None for a file name"""
+    if not name or not name.startswith(RUN_SOURCE_PREFIX):
+        return None
+    try:
+        return int(name[len(RUN_SOURCE_PREFIX):])
+    except ValueError:
+        return None
+
+
+class RunRecorder:
+    def __init__(self, store, run_id, search_query, start_position=0):
+        """
+        Buffer the rows of one run and insert them in batched transactions
+
+        Has the on_row(row, place_id) signature of the scrapers and is safe to
+        call from several threads. Call close() to write the last batch.
+
+        Args:
+            store (ResultsStore): Store to write to
+            run_id (int): Run the rows belong to
+            search_query (str): Query stored with each row
+            start_position (int): Position of the first recorded row
+        """
+        self.store = store
+        self.run_id = run_id
+        self.search_query = search_query
+        self.position = start_position
+        self.batch_size = RESULTS_STORE_CONFIG['batch_size']
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def write_row(self, row, place_id=None, search_query=None):
+        with self._lock:
+            self._buffer.append((self.position, place_id, row, search_query or self.search_query))
+            self.position += 1
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+
+    def write_rows(self, rows, search_query=None):
+        for row in rows:
+            self.write_row(row, search_query=search_query)
+
+    def _flush(self):
+        if self._buffer:
+            self.store.insert_places(self.run_id, self._buffer)
+            self._buffer = []
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def close(self):
+        self.flush()
+
+
+class ResultsStore:
+    def __init__(self, path=None):
+        """
+        SQLite store of scraping runs, their places and email enrichment
+
+        Places are indexed by place ID, run and query, and enrichment by
+        email presence, so previews and campaigns read only the rows they
+        need instead of parsing whole output files.
+
+        Args:
+            path (str): SQLite database file (':memory:' for a throwaway store)
+        """
+        self.path = path or RESULTS_STORE_CONFIG['path']
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA foreign_keys = ON")
+            self._conn.executescript(SCHEMA)
+            columns = {column['name'] for column in self._conn.execute("PRAGMA table_info(places)")}
+            for field in LIST_CARD_FIELDS:
+                # Stores created before list-only rows kept their list card fields
+                if field not in columns:
+                    self._conn.execute(f"ALTER TABLE places ADD COLUMN {field} TEXT")
+
+    def start_run(self, search_query, checkpoint_id=None):
+        """
+        Register a run, or reopen the unfinished run of a resumed checkpoint
+
+        A reopened run is emptied; the resumed scrape records the journaled
+        rows again before continuing.
+
+        Returns:
+            int: Run ID
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self._conn:
+            existing = None
+            if checkpoint_id:
+                existing = self._conn.execute(
+                    "SELECT id FROM runs WHERE checkpoint_id = ? AND status != 'finished' ORDER BY id DESC LIMIT 1",
+                    (checkpoint_id,)).fetchone()
+            if existing:
+                self._conn.execute("DELETE FROM places WHERE run_id = ?", (existing['id'],))
+                self._conn.execute("UPDATE runs SET status = 'running', started_at = ? WHERE id = ?",
+                                   (now, existing['id']))
+                return existing['id']
+            return self._conn.execute(
+                "INSERT INTO runs (search_query, checkpoint_id, started_at) VALUES (?, ?, ?)",
+                (search_query, checkpoint_id, now)).lastrowid
+
+    def recorder(self, run_id, search_query):
+        """Batched on_row(row, place_id) callback that records rows into a run"""
+        return RunRecorder(self, run_id, search_query)
+
+    def insert_places(self, run_id, entries):
+        """
+        Insert one batch of places in a single transaction
+
+        Args:
+            run_id (int): Run the places belong to
+            entries (list): (position, place_id, row, search_query) tuples; list-only rows
+                carry their LIST_CARD_FIELDS after the phone column
+        """
+        now = datetime.now().isoformat()
+        extras = range(len(PLACE_FIELDS), len(PLACE_FIELDS) + len(LIST_CARD_FIELDS))
+        values = [(run_id, position, place_id,
+                   *(row[i] if len(row) > i else 'N/A' for i in range(len(PLACE_FIELDS))),
+                   search_query, *(row[i] if len(row) > i else None for i in extras), now)
+                  for position, place_id, row, search_query in entries]
+        with self._lock, self._conn:
+            self._conn.executemany(f"""
+                INSERT OR REPLACE INTO places (run_id, position, place_id, {', '.join(PLACE_FIELDS)},
+                                               search_query, {', '.join(LIST_CARD_FIELDS)}, scraped_at)
+                VALUES ({', '.join('?' * (len(PLACE_FIELDS) + len(LIST_CARD_FIELDS) + 5))})
+            """, values)
+
+    def finish_run(self, run_id, status='finished', output_file=None):
+        """Close a run, storing its final place count and output file"""
+        with self._lock, self._conn:
+            self._conn.execute("""
+                UPDATE runs SET status = ?, output_file = ?, finished_at = ?,
+                    total_results = (SELECT COUNT(*) FROM places WHERE run_id = ?)
+                WHERE id = ?
+            """, (status, output_file, datetime.now().isoformat(), run_id, run_id))
+
+    def record_run(self, search_query, rows, output_file=None):
+        """Store a complete run in one go (e.g. one query of a batch)"""
+        run_id = self.start_run(search_query)
+        self.insert_places(run_id, [(i, None, row, search_query) for i, row in enumerate(rows)])
+        self.finish_run(run_id, output_file=output_file)
+        return run_id
+
+    def get_run(self, run_id):
+        with self._lock:
+            run = self._conn.execute("SELECT * FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return dict(run) if run else None
+
+    def run_version(self, run_id):
+        """String that changes whenever places or enrichment of a run change (for ETags)"""
+        with self._lock:
+            version = self._conn.execute("""
+                SELECT r.status, r.finished_at, COUNT(p.id), MAX(p.id), MAX(e.updated_at), COUNT(e.place_ref)
+                FROM runs r LEFT JOIN places p ON p.run_id = r.id LEFT JOIN enrichment e ON e.place_ref = p.id
+                WHERE r.id = ?
+            """, (run_id,)).fetchone()
+        return ':'.join(str(value) for value in version)
+
+    def list_runs(self, limit=None):
+        """
+        Runs newest first, with their place and email counts
+
+        Returns:
+            list: Run dicts (id, search_query, started_at, status, places, emails, ...)
+        """
+        with self._lock:
+            runs = self._conn.execute("""
+                SELECT r.*,
+                    (SELECT COUNT(*) FROM places p WHERE p.run_id = r.id) AS places,
+                    (SELECT COUNT(*) FROM places p JOIN enrichment e ON e.place_ref = p.id
+                     WHERE p.run_id = r.id AND e.has_email = 1) AS emails
+                FROM runs r ORDER BY r.id DESC LIMIT ?
+            """, (-1 if limit is None else limit,)).fetchall()
+        return [dict(run) for run in runs]
+
+    def _place_query(self, select, run_id, search_query, has_email):
+        clauses, params = [], []
+        if run_id is not None:
+            clauses.append("p.run_id = ?")
+            params.append(run_id)
+        if search_query is not None:
+            clauses.append("p.search_query = ?")
+            params.append(search_query)
+        if has_email is not None:
+            clauses.append("COALESCE(e.has_email, 0) = ?")
+            params.append(1 if has_email else 0)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return (f"SELECT {select} FROM places p LEFT JOIN enrichment e ON e.place_ref = p.id {where}",
+                params)
+
+    def get_places(self, run_id=None, offset=0, limit=None, has_email=None, search_query=None):
+        """
+        Page through stored places with their enrichment
+
+        Args:
+            run_id (int): Only places of this run
+            offset (int): Places to skip
+            limit (int): Maximum number of places (None for all)
+            has_email (bool): Only places with (True) or without (False) an email
+            search_query (str): Only places found by this query
+
+        Returns:
+            list: Place dicts in scrape order
+        """
+        sql, params = self._place_query(f"{PLACE_COLUMNS}, {ENRICHMENT_COLUMNS}", run_id, search_query, has_email)
+        sql += " ORDER BY p.run_id, p.position LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [self._place_dict(row) for row in rows]
+
+    def count_places(self, run_id=None, has_email=None, search_query=None):
+        sql, params = self._place_query("COUNT(*)", run_id, search_query, has_email)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def _place_dict(self, row):
+        return {key: row[key] for key in row.keys()
+                if key != 'position' and (row[key] is not None or key in PLACE_FIELDS)}
+
+    def iter_places(self, run_id, batch_size=None, has_email=None):
+        """
+        Yield every place of a run (with enrichment) in scrape order, one batch per query
+
+        Batches are fetched by position rather than OFFSET, so each query
+        starts from the index instead of skipping the rows already read.
+        """
+        batch_size = batch_size or RESULTS_STORE_CONFIG['batch_size']
+        sql, params = self._place_query(f"p.position, {PLACE_COLUMNS}, {ENRICHMENT_COLUMNS}",
+                                        run_id, None, has_email)
+        sql += " AND p.position > ? ORDER BY p.position LIMIT ?"
+        position = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(sql, params + [position, batch_size]).fetchall()
+            for row in rows:
+                yield self._place_dict(row)
+            if len(rows) < batch_size:
+                return
+            position = rows[-1]['position']
+
+    def iter_rows(self, run_id, batch_size=None):
+        """Yield (row, search_query) for every place of a run without loading it all at once"""
+        for place in self.iter_places(run_id, batch_size):
+            row = [place[field] for field in PLACE_FIELDS]
+            row += [place[field] for field in LIST_CARD_FIELDS if field in place]
+            yield row, place['search_query']
+
+    def set_enrichment(self, run_id, places):
+        """
+        Attach email extraction results to the places of a run, in one transaction
+
+        Places are matched by place ID when the result carries one, otherwise
+        by title and address.
+
+        Args:
+            run_id (int): Run the places were scraped in
+            places (list): Dicts with title, address, email, background, extraction_status, ...
+
+        Returns:
+            int: Number of places updated
+        """
+        now = datetime.now().isoformat()
+        updated = 0
+        with self._lock, self._conn:
+            for place in places:
+                if place.get('place_id'):
+                    match = self._conn.execute(
+                        "SELECT id FROM places WHERE run_id = ? AND place_id = ?",
+                        (run_id, place['place_id'])).fetchone()
+                else:
+                    match = self._conn.execute(
+                        "SELECT id FROM places WHERE run_id = ? AND title = ? AND address = ?",
+                        (run_id, place.get('title'), place.get('address'))).fetchone()
+                if match is None:
+                    continue
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO enrichment
+                        (place_ref, email, has_email, background, extraction_status, source, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (match['id'], place.get('email'), int(has_email(place.get('email'))), place.get('background'),
+                      place.get('extraction_status'), place.get('source'), now))
+                updated += 1
+        return updated
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_results_store():
+    """Return the process-wide results store, opening it on first use"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResultsStore()
+        return _store
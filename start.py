@@ -8,21 +8,20 @@ import sys
 import subprocess
 import webbrowser
 import time
+from importlib.util import find_spec
+
+REQUIRED_MODULES = ['flask', 'selenium', 'pandas', 'openai', 'requests']
 
 def check_dependencies():
-    """Check if required dependencies are installed"""
+    """Check if required dependencies are installed (without importing them; app.py runs in its own process)"""
     print("🔍 Checking dependencies...")
     
-    try:
-        import flask
-        import selenium
-        import pandas
-        import openai
-        import requests
+    missing = [module for module in REQUIRED_MODULES if find_spec(module) is None]
+    if not missing:
         print("✅ All required packages are installed")
         return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
+    else:
+        print(f"❌ Missing dependency: {', '.join(missing)}")
         print("📦 Installing dependencies...")
         try:
             subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
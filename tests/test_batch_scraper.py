@@ -0,0 +1,121 @@
+import csv
+import json
+
+import pytest
+
+import batch_scraper
+from output_writers import CSV_HEADER
+from driver_pool import DriverPool
+from results_store import ResultsStore
+
+
+class FakeDriver:
+    def quit(self):
+        pass
+
+
+def make_pool():
+    pool = DriverPool(size=2, factory=lambda browser_type, headless, profile: FakeDriver())
+    pool.reset = lambda driver: None
+    return pool
+
+
+OPTIONS = {'workers': 2, 'browser_type': 'chrome', 'headless': True, 'profile': 'fast',
+           'retry_attempts': 2, 'retry_backoff': 0}
+
+
+def test_load_queries_from_csv_applies_default_limit(tmp_path):
+    path = tmp_path / 'queries.csv'
+    path.write_text("query,max_results\ndentists in Austin,20\ncafes in Austin,\n,5\n", encoding='utf-8')
+
+    jobs = batch_scraper.load_queries(str(path), default_max_results=50)
+
+    assert jobs == [{'query': 'dentists in Austin', 'max_results': 20, 'area': None, 'zoom': None},
+                    {'query': 'cafes in Austin', 'max_results': 50, 'area': None, 'zoom': None}]
+
+
+def test_load_queries_from_yaml(tmp_path):
+    pytest.importorskip('yaml')
+    path = tmp_path / 'queries.yaml'
+    path.write_text("queries:\n  - plumbers in Reno\n  - query: bakeries\n    max_results: 10\n"
+                    "    area: Reno, NV\n    zoom: 14\n", encoding='utf-8')
+
+    jobs = batch_scraper.load_queries(str(path), default_max_results=30)
+
+    assert jobs == [{'query': 'plumbers in Reno', 'max_results': 30, 'area': None, 'zoom': None},
+                    {'query': 'bakeries', 'max_results': 10, 'area': 'Reno, NV', 'zoom': 14}]
+
+
+def test_run_query_retries_until_success(monkeypatch):
+    calls = []
+
+    def flaky_scrape(driver, query, max_results, **kwargs):
+        calls.append(query)
+        if len(calls) < 2:
+            raise RuntimeError("results sidebar not found")
+        return [['Cafe', '4.5', 'Main St', 'N/A', 'N/A']], {'stop_reason': 'end_of_list'}
+
+    monkeypatch.setattr(batch_scraper, 'scrape_query', flaky_scrape)
+    monkeypatch.setattr(batch_scraper, 'get_place_index', lambda: None)
+    summary = batch_scraper.run_query({'query': 'cafes', 'max_results': 5}, OPTIONS, make_pool())
+
+    assert summary['status'] == 'ok'
+    assert summary['attempts'] == 2
+    assert summary['results'] == 1
+    assert summary['error'] is None
+
+
+def test_run_batch_writes_output_and_summary(monkeypatch, tmp_path):
+    def scrape(driver, query, max_results, **kwargs):
+        if query == 'broken':
+            raise RuntimeError("boom")
+        return [[query.title(), 'N/A', 'N/A', 'N/A', 'N/A']], {}
+
+    monkeypatch.setattr(batch_scraper, 'scrape_query', scrape)
+    monkeypatch.setattr(batch_scraper, 'get_driver_pool', make_pool)
+    monkeypatch.setattr(batch_scraper, 'get_place_index', lambda: None)
+    jobs = [{'query': 'cafes', 'max_results': 5}, {'query': 'broken', 'max_results': 5},
+            {'query': 'bars', 'max_results': 5}]
+    store = ResultsStore(':memory:')
+    output = batch_scraper.BatchOutput(str(tmp_path), 'csv', store=store)
+
+    summaries = batch_scraper.run_batch(jobs, OPTIONS, output)
+
+    assert [s['status'] for s in summaries] == ['ok', 'failed', 'ok']
+    assert summaries[1]['attempts'] == 3
+    with open(output.path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == CSV_HEADER
+    assert sorted(row[5] for row in rows[1:]) == ['bars', 'cafes']
+    with open(output.summary_path, encoding='utf-8') as f:
+        summary = json.load(f)
+    assert summary['succeeded'] == 2 and summary['failed'] == 1
+    assert summary['total_results'] == 2
+    assert sorted(run['search_query'] for run in store.list_runs()) == ['bars', 'cafes']
+
+
+def test_load_queries_reports_bad_limits_by_row(tmp_path):
+    path = tmp_path / 'queries.csv'
+    path.write_text("query,max_results\ndentists in Austin,20\ncafes in Austin,twenty\nbars,5.5\n",
+                    encoding='utf-8')
+
+    with pytest.raises(ValueError) as error:
+        batch_scraper.load_queries(str(path))
+
+    assert "row 3 ('cafes in Austin'): max_results must be a whole number, got 'twenty'" in str(error.value)
+    assert "row 4 ('bars')" in str(error.value)
+
+
+def test_run_query_retries_empty_results_and_missing_sidebar(monkeypatch):
+    outcomes = [([], {'stop_reason': 'end_of_list'}), ([], {'stop_reason': 'sidebar_not_found'}),
+                ([['Cafe', '4.5', 'Main St', 'N/A', 'N/A']], {'stop_reason': 'end_of_list'})]
+    monkeypatch.setattr(batch_scraper, 'scrape_query', lambda driver, query, max_results, **kwargs: outcomes.pop(0))
+    monkeypatch.setattr(batch_scraper, 'get_place_index', lambda: None)
+
+    summary = batch_scraper.run_query({'query': 'cafes', 'max_results': 5}, OPTIONS, make_pool())
+    assert (summary['status'], summary['attempts'], summary['results']) == ('ok', 3, 1)
+
+    outcomes.extend([([], {'stop_reason': 'sidebar_not_found'})] * 3)
+    summary = batch_scraper.run_query({'query': 'cafes', 'max_results': 5}, OPTIONS, make_pool())
+    assert (summary['status'], summary['attempts']) == ('failed', 3)
+    assert summary['error'] == "results did not load (sidebar_not_found)"
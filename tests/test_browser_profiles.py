@@ -0,0 +1,21 @@
+from browser_profiles import (
+    blocked_url_patterns, firefox_blocking_prefs, performance_arguments, resolve_profile,
+)
+
+
+def test_unknown_profile_falls_back_to_default():
+    assert resolve_profile('turbo') == 'compat'
+    assert resolve_profile(None) == 'compat'
+    assert resolve_profile('fast') == 'fast'
+
+
+def test_fast_profile_blocks_more_than_compat():
+    assert blocked_url_patterns('compat') == []
+    assert any('fonts.gstatic.com' in pattern for pattern in blocked_url_patterns('fast'))
+    assert firefox_blocking_prefs('fast')['permissions.default.image'] == 2
+
+
+def test_performance_flags_never_disable_javascript():
+    for browser_type in ('chrome', 'firefox'):
+        assert '--disable-javascript' not in performance_arguments(browser_type, 'fast')
+    assert performance_arguments('chrome', 'balanced') == []
@@ -0,0 +1,92 @@
+from concurrent.futures import Future
+
+import pytest
+
+import app as web_app
+from checkpoint import Checkpoint, list_checkpoints
+from config import CHECKPOINT_CONFIG
+from job_manager import Job
+from results_store import ResultsStore
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(tmp_path, monkeypatch):
+    monkeypatch.setitem(CHECKPOINT_CONFIG, 'directory', str(tmp_path))
+    return tmp_path
+
+
+def row(title):
+    return [title, 'N/A', 'N/A', 'N/A', 'N/A']
+
+
+def test_journal_survives_reopen_without_duplicates():
+    checkpoint = Checkpoint.create('cafes+in+Reno', {'max_results': 400})
+    checkpoint.add('ChIJa', row('Cafe A'), cursor=1)
+    checkpoint.add('ChIJb', row('Cafe B'), cursor=2)
+    checkpoint.add('ChIJa', row('Cafe A'), cursor=3)  # Same place seen again after a reload
+    with open(checkpoint.path, 'a', encoding='utf-8') as f:
+        f.write('{"type": "row", "place_id": "ChIJc", "ro')  # Crash mid-write
+
+    resumed = Checkpoint.load(checkpoint.run_id)
+
+    assert resumed.search_query == 'cafes+in+Reno'
+    assert resumed.settings['max_results'] == 400
+    assert resumed.rows == [row('Cafe A'), row('Cafe B')]
+    assert resumed.done_ids == {'ChIJa', 'ChIJb'}
+    assert resumed.cursor == 2
+
+
+def test_finished_runs_are_not_offered_for_resume():
+    interrupted = Checkpoint.create('bars')
+    interrupted.add('ChIJa', row('Bar A'), cursor=1)
+    completed = Checkpoint.create('pubs')
+    completed.finish('scraped_data_1.csv')
+
+    runs = list_checkpoints()
+
+    assert [run['run_id'] for run in runs] == [interrupted.run_id]
+    assert runs[0]['rows'] == 1
+    assert len(list_checkpoints(include_finished=True)) == 2
+
+
+def test_snapshot_rows_are_journaled_when_parsed():
+    checkpoint = Checkpoint.create('gyms')
+    pending = Future()
+
+    checkpoint.add('ChIJg', pending, cursor=1)
+    assert checkpoint.rows == []
+
+    pending.set_result(row('Gym'))
+    assert Checkpoint.load(checkpoint.run_id).rows == [row('Gym')]
+
+
+def test_resumed_request_restores_every_saved_setting():
+    settings = {'max_results': 400, 'workers': 3, 'navigation_mode': 'direct', 'parse_engine': 'html',
+                'streaming': False, 'list_only': True, 'browser_profile': 'fast', 'tile_area': 'Reno, NV',
+                'tile_zoom': 14, 'known_places': 'skip'}
+    checkpoint = Checkpoint.create('cafes+in+Reno', settings)
+
+    params = web_app._parse_scrape_request({'resume_run_id': checkpoint.run_id, 'search_query': 'bars',
+                                            'list_only': False, 'browser_profile': 'compat'})
+
+    assert params['search_query'] == 'cafes+in+Reno'
+    assert {name: params[name] for name in settings} == settings
+
+
+def test_failed_run_closes_its_checkpoint(tmp_path, monkeypatch):
+    class BrokenPool:
+        def checkout(self, *args, **kwargs):
+            raise RuntimeError('no browser')
+
+        def checkin(self, driver):
+            pass
+
+    monkeypatch.setattr(web_app, 'get_driver_pool', BrokenPool)
+    monkeypatch.setattr(web_app, 'get_results_store', lambda: ResultsStore(str(tmp_path / 'results.db')))
+    job = Job(web_app.run_scraping, 'scrape', {})
+
+    with pytest.raises(RuntimeError):
+        web_app.run_scraping(job, 'cafes', 'firefox', True, 'csv', 'skip', '', 10)
+
+    assert list_checkpoints() == []
+    assert list_checkpoints(include_finished=True)[0]['finished']
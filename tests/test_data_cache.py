@@ -0,0 +1,72 @@
+import os
+
+import app as web_app
+from data_cache import DataFileCache, select_places
+from enrichment import EnrichmentMerger
+from output_writers import open_writer
+
+
+def saved_csv(directory, titles):
+    with open_writer('csv', 'cafes', data_dir=str(directory)) as writer:
+        for title in titles:
+            writer.write_row([title, 'N/A', 'Main St', 'N/A', 'N/A'])
+    return writer.path
+
+
+def test_cache_reuses_parsed_file_until_it_changes(tmp_path):
+    path = saved_csv(tmp_path, ['Cafe A', 'Cafe B'])
+    cache = DataFileCache(max_entries=2)
+
+    first = cache.get(path)
+    assert [place['title'] for place in first['places']] == ['Cafe A', 'Cafe B']
+    assert cache.get(path) is first
+
+    with EnrichmentMerger(path) as merger:
+        merger.add({'title': 'Cafe B', 'address': 'Main St', 'email': 'b@cafe.com'})
+    refreshed = cache.get(path)
+    assert refreshed is not first
+    assert refreshed['emails'] == 1
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    paths = []
+    for i in range(3):
+        directory = tmp_path / str(i)
+        paths.append(saved_csv(directory, [f'Cafe {i}']))
+    cache = DataFileCache(max_entries=2)
+
+    entry = cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+
+    assert cache.get(paths[0]) is entry
+    assert list(cache._entries) == [paths[2], paths[0]]
+
+
+def test_select_places_filters_pages_and_projects():
+    places = [{'title': f'Cafe {i}', 'email': 'N/A' if i % 2 else f'{i}@cafe.com', 'phone': '555'}
+              for i in range(6)]
+
+    page, total = select_places(places, offset=1, limit=1, columns=['title'], email_filter=True)
+
+    assert total == 3
+    assert page == [{'title': 'Cafe 2'}]
+
+
+def test_preview_endpoint_pages_and_honours_etag(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = saved_csv(tmp_path / 'data', ['Cafe A', 'Cafe B', 'Cafe C'])
+    client = web_app.app.test_client()
+    url = f'/api/preview-data/{os.path.basename(path)}?offset=1&limit=1&columns=title'
+
+    response = client.get(url)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['places'] == [{'title': 'Cafe B'}]
+    assert body['total_results'] == 3
+
+    repeat = client.get(url, headers={'If-None-Match': response.headers['ETag']})
+    assert repeat.status_code == 304
+    assert repeat.data == b''
@@ -0,0 +1,57 @@
+import csv
+import gzip
+import io
+import os
+
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header
+
+import app as web_app
+from downloads import choose_encoding, compress_chunks, export_chunks
+from results_store import ResultsStore
+
+
+def test_gzip_stream_round_trips():
+    chunks = [b'Title,Phone\n', b'Cafe A,555\n' * 1000, b'']
+
+    compressed = b''.join(compress_chunks(iter(chunks), 'gzip'))
+
+    assert gzip.decompress(compressed) == b''.join(chunks)
+
+
+def test_choose_encoding_follows_accept_encoding():
+    assert choose_encoding(parse_accept_header('gzip, deflate')) == 'gzip'
+    assert choose_encoding(parse_accept_header('gzip;q=0')) is None
+    assert choose_encoding(parse_accept_header('')) is None
+
+
+def test_csv_export_includes_enrichment():
+    store = ResultsStore(':memory:')
+    run_id = store.record_run('cafes', [['Cafe A', '4.5 (10)', 'Main St', 'N/A', '555'],
+                                        ['Cafe B', 'N/A', 'High St', 'N/A', 'N/A']])
+    store.set_enrichment(run_id, [{'title': 'Cafe A', 'address': 'Main St', 'email': 'a@cafe.com'}])
+
+    text = b''.join(export_chunks(store, run_id, 'csv')).decode('utf-8')
+
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [(row['Title'], row['Email'], row['Search Query']) for row in rows] == [
+        ('Cafe A', 'a@cafe.com', 'cafes'), ('Cafe B', '', 'cafes')]
+
+
+def test_download_compresses_and_serves_ranges(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs('data')
+    content = b'Title,Phone\n' + b'Cafe A,555\n' * 2000
+    with open(os.path.join('data', 'scraped_data_1.csv'), 'wb') as f:
+        f.write(content)
+    client = web_app.app.test_client()
+
+    compressed = client.get('/api/download/scraped_data_1.csv', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(compressed.data) == content
+
+    partial = client.get('/api/download/scraped_data_1.csv',
+                         headers=Headers({'Accept-Encoding': 'gzip', 'Range': 'bytes=12-21'}))
+    assert partial.status_code == 206
+    assert 'Content-Encoding' not in partial.headers
+    assert partial.data == content[12:22]
@@ -0,0 +1,155 @@
+import threading
+
+import pytest
+
+from driver_pool import DriverPool
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current = handle
+
+
+class FakeDriver:
+    def __init__(self):
+        self.window_handles = ['main']
+        self.current = 'main'
+        self.switch_to = FakeSwitchTo(self)
+        self.alive = True
+        self.quit_called = False
+        self.visited = []
+        self.cookies_cleared = 0
+
+    @property
+    def current_window_handle(self):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return self.current
+
+    @property
+    def title(self):
+        if not self.alive:
+            raise RuntimeError("session deleted")
+        return ''
+
+    def close(self):
+        self.window_handles.remove(self.current)
+
+    def execute_script(self, script, *args):
+        return None
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+        self.alive = False
+
+
+def make_pool(size=2, **kwargs):
+    created = []
+
+    def factory(browser_type, headless, profile):
+        driver = FakeDriver()
+        created.append(driver)
+        return driver
+
+    return DriverPool(size=size, factory=factory, checkout_timeout=0.2, **kwargs), created
+
+
+def test_returned_driver_is_reused_warm():
+    pool, created = make_pool()
+
+    first = pool.checkout('firefox', False)
+    pool.checkin(first)
+    second = pool.checkout('firefox', False)
+
+    assert second is first
+    assert len(created) == 1
+
+
+def test_reset_closes_extra_tabs_and_clears_state():
+    pool, _ = make_pool()
+
+    driver = pool.checkout('chrome', True)
+    driver.window_handles.append('popup')
+    pool.checkin(driver)
+
+    assert driver.window_handles == ['main']
+    assert driver.cookies_cleared == 1
+    assert driver.visited[-1] == 'about:blank'
+
+
+def test_unhealthy_driver_is_replaced():
+    pool, created = make_pool()
+
+    driver = pool.checkout('firefox', False)
+    pool.checkin(driver)
+    driver.alive = False
+
+    replacement = pool.checkout('firefox', False)
+    assert replacement is not driver
+    assert len(created) == 2
+
+
+def test_checkout_times_out_when_pool_exhausted():
+    pool, _ = make_pool(size=1)
+    pool.checkout('firefox', False)
+
+    with pytest.raises(TimeoutError):
+        pool.checkout('firefox', False, timeout=0.05)
+
+
+def test_waiting_checkout_gets_driver_when_returned():
+    pool, created = make_pool(size=1)
+    held = pool.checkout('firefox', False)
+    timer = threading.Timer(0.05, pool.checkin, args=(held,))
+    timer.start()
+
+    driver = pool.checkout('firefox', False, timeout=2)
+    timer.join()
+
+    assert driver is held
+    assert len(created) == 1
+
+
+def test_idle_driver_of_other_kind_is_evicted_for_room():
+    pool, created = make_pool(size=1)
+    firefox = pool.checkout('firefox', False)
+    pool.checkin(firefox)
+
+    chrome = pool.checkout('chrome', False)
+
+    assert chrome is not firefox
+    assert firefox.quit_called
+    assert pool.key_for(chrome) == ('chrome', False, 'compat')
+
+
+def test_driver_recycled_after_max_uses():
+    pool, created = make_pool(max_uses=2)
+
+    for _ in range(3):
+        pool.checkin(pool.checkout('firefox', False))
+
+    assert len(created) == 2
+    assert created[0].quit_called
+
+
+def test_shutdown_quits_idle_drivers():
+    pool, created = make_pool()
+    pool.checkin(pool.checkout('firefox', False))
+
+    pool.shutdown()
+
+    assert created[0].quit_called
+    with pytest.raises(RuntimeError):
+        pool.checkout('firefox', False)
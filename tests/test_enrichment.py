@@ -0,0 +1,76 @@
+import csv
+import json
+
+from enrichment import EnrichmentMerger, apply_enrichment, load_enrichment, sidecar_path, write_enriched_copy
+from output_writers import LIST_CARD_FIELDS, open_writer
+from results_store import ResultsStore
+
+
+def saved_file(tmp_path, storage_format):
+    with open_writer(storage_format, 'cafes', data_dir=str(tmp_path)) as writer:
+        writer.write_row(['Cafe A', '4.5 (10)', 'Main St', 'cafea.com', '555'])
+        writer.write_row(['Cafe B', '4.0 (3)', 'High St', 'N/A', 'N/A'])
+    return writer.path
+
+
+def test_merger_appends_in_batches_and_matches_by_place(tmp_path):
+    path = saved_file(tmp_path, 'json')
+    with open(path, encoding='utf-8') as f:
+        original = f.read()
+    store = ResultsStore(':memory:')
+    run_id = store.record_run('cafes', [['Cafe A', '4.5 (10)', 'Main St', 'cafea.com', '555'],
+                                        ['Cafe B', '4.0 (3)', 'High St', 'N/A', 'N/A']])
+
+    merger = EnrichmentMerger(path, store, run_id, method='api', batch_size=2)
+    # Results arrive out of list order and are matched by title and address
+    merger.add({'title': 'Cafe B', 'address': ' high st ', 'email': 'N/A', 'extraction_status': 'failed'})
+    assert load_enrichment(path) == {}
+    merger.add({'title': 'Cafe A', 'address': 'Main St', 'email': 'a@cafe.com', 'extraction_status': 'success'})
+    merger.close()
+
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == original
+    with open(path, encoding='utf-8') as f:
+        places = apply_enrichment(json.load(f)['places'], path)
+    assert [place['email'] for place in places] == ['a@cafe.com', 'N/A']
+    assert places[0]['extraction_method'] == 'api'
+    assert [place['title'] for place in store.get_places(run_id, has_email=True)] == ['Cafe A']
+
+
+def test_later_results_win_and_torn_lines_are_ignored(tmp_path):
+    path = saved_file(tmp_path, 'jsonl')
+    with EnrichmentMerger(path, batch_size=1) as merger:
+        merger.add({'title': 'Cafe A', 'address': 'Main St', 'email': 'N/A', 'extraction_status': 'failed'})
+        merger.add({'title': 'Cafe A', 'address': 'Main St', 'email': 'a@cafe.com', 'extraction_status': 'success'})
+    with open(sidecar_path(path), 'a', encoding='utf-8') as f:
+        f.write('{"key": "cafe b|hi')
+
+    assert load_enrichment(path) == {'cafe a|main st': {'email': 'a@cafe.com', 'extraction_status': 'success'}}
+
+
+def test_enriched_copy_for_csv(tmp_path):
+    path = saved_file(tmp_path, 'csv')
+    assert write_enriched_copy(path) == path
+
+    with EnrichmentMerger(path) as merger:
+        merger.add({'title': 'Cafe A', 'address': 'Main St', 'email': 'a@cafe.com', 'background': 'Roastery'})
+    copy = write_enriched_copy(path)
+
+    with open(copy, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['Email'] for row in rows] == ['a@cafe.com', '']
+    assert rows[0]['Background'] == 'Roastery' and rows[0]['Search Query'] == 'cafes'
+
+
+def test_enriched_copy_keeps_list_card_columns(tmp_path):
+    with open_writer('csv', 'cafes', data_dir=str(tmp_path), extra_fields=LIST_CARD_FIELDS) as writer:
+        writer.write_row(['Cafe A', '4.5 (10)', 'Main St', 'N/A', 'N/A', 'Coffee shop', 'Open'])
+        writer.write_row(['Cafe B', '4.0 (3)', 'High St', 'N/A', 'N/A', 'Cafe', 'Closed'])
+    with EnrichmentMerger(writer.path) as merger:
+        merger.add({'title': 'Cafe B', 'address': 'High St', 'email': 'b@cafe.com'})
+
+    with open(write_enriched_copy(writer.path), newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+
+    assert [(row['Category'], row['Status'], row['Email']) for row in rows] == [
+        ('Coffee shop', 'Open', ''), ('Cafe', 'Closed', 'b@cafe.com')]
@@ -0,0 +1,65 @@
+import json
+import threading
+
+import app as web_app
+from events import EventBus, bind_publisher, event_scope, get_event_bus
+from job_manager import JobManager
+
+
+def test_subscribers_get_matching_events_and_replay_on_reconnect():
+    bus = EventBus(history=10)
+    job_a = bus.subscribe(job_id='a')
+    campaign = bus.subscribe(channel='campaign')
+
+    first = bus.publish('place', tags={'job_id': 'a'}, title='Cafe A')
+    bus.publish('place', tags={'job_id': 'b'}, title='Cafe B')
+    bus.publish('email_sent', channel='campaign', success=True)
+
+    assert job_a.get(0)['title'] == 'Cafe A' and job_a.get(0) is None
+    assert campaign.get(0)['type'] == 'email_sent'
+    replayed = bus.subscribe(last_id=first['id'] - 1, job_id='a')
+    assert replayed.get(0)['id'] == first['id']
+
+
+def test_event_scope_tags_events_from_helper_threads():
+    bus = get_event_bus()
+    subscription = bus.subscribe(job_id='job-1')
+    with event_scope(job_id='job-1'):
+        publish_event = bind_publisher()
+    worker = threading.Thread(target=publish_event, args=('place',), kwargs={'title': 'Cafe A'})
+    worker.start()
+    worker.join()
+
+    assert subscription.get(1)['title'] == 'Cafe A'
+    subscription.close()
+
+
+def test_jobs_publish_progress_and_phase_events():
+    subscription = get_event_bus().subscribe()
+    manager = JobManager(max_concurrent=1)
+    job = manager.submit(lambda job: job.update(message='Scraping...'))
+    job.wait(5)
+
+    events = []
+    while (event := subscription.get(0.1)) is not None:
+        if event.get('job_id') == job.id:
+            events.append((event['type'], event.get('state') or event.get('message')))
+    subscription.close()
+    assert events == [('phase', 'running'), ('progress', 'Starting...'), ('progress', 'Scraping...'),
+                      ('phase', 'finished')]
+
+
+def test_events_endpoint_streams_server_sent_events():
+    client = web_app.app.test_client()
+    response = client.get('/api/events?job_id=stream-test', buffered=False)
+    chunks = iter(response.response)
+
+    assert response.mimetype == 'text/event-stream'
+    assert next(chunks).startswith(b'retry:')
+    get_event_bus().publish('place', tags={'job_id': 'stream-test'}, title='Cafe A')
+    message = next(chunks).decode('utf-8')
+    response.close()
+
+    lines = dict(line.split(': ', 1) for line in message.strip().split('\n'))
+    assert lines['event'] == 'place'
+    assert json.loads(lines['data'])['title'] == 'Cafe A'
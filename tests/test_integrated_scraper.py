@@ -0,0 +1,371 @@
+import threading
+import time
+
+import pytest
+
+import integrated_scraper
+from config import SCROLL_CONFIG, SELENIUM_CONFIG
+from events import event_scope, get_event_bus
+from integrated_scraper import (
+    CARD_INDEX_SCRIPT, RESULTS_LOADER_SCRIPT, WebDriverCommandCounter, dedupe_rows, implicit_waits_disabled,
+    scrape_place_links, scroll_to_load_results, snapshot_cards, stream_results,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class LoaderDriver:
+    """Answers loader polls with a scripted list of feed states (the last one repeats)"""
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        self.scripts.append(script)
+        if callable(self.states[0]):
+            return self.states[0](len(self.scripts))
+        return self.states.pop(0) if len(self.states) > 1 else self.states[0]
+
+
+def run_loader(monkeypatch, states, target_count=None):
+    clock = FakeClock()
+    monkeypatch.setattr(integrated_scraper.time, 'monotonic', clock.monotonic)
+    monkeypatch.setattr(integrated_scraper.time, 'sleep', clock.sleep)
+    monkeypatch.setattr(integrated_scraper, 'find_results_sidebar', lambda driver, query: object())
+    driver = LoaderDriver(states)
+    return driver, scroll_to_load_results(driver, 'cafes', target_count=target_count)
+
+
+def test_loader_polls_with_the_mutation_observer_script(monkeypatch):
+    driver, stats = run_loader(monkeypatch, [{'count': 7, 'ended': True}])
+
+    assert 'MutationObserver' in RESULTS_LOADER_SCRIPT
+    assert driver.scripts == [RESULTS_LOADER_SCRIPT]
+    assert (stats['cards'], stats['stop_reason']) == (7, 'end_of_list')
+
+
+def test_loader_stops_once_the_target_is_loaded(monkeypatch):
+    states = [{'count': 10}, {'count': 20}, {'count': 30}, {'count': 40}]
+    driver, stats = run_loader(monkeypatch, states, target_count=25)
+
+    assert (stats['cards'], stats['stop_reason'], stats['polls']) == (30, 'target_reached', 3)
+    assert stats['batches'] == 3
+
+
+def test_loader_stops_at_the_end_of_the_list(monkeypatch):
+    states = [{'count': 20}, {'count': 20}, {'count': 25, 'ended': True}]
+    driver, stats = run_loader(monkeypatch, states, target_count=100)
+
+    assert stats['cards'] == 25 and stats['batches'] == 2
+    assert stats['ended'] and stats['stop_reason'] == 'end_of_list'
+
+
+def test_loader_stops_when_the_list_stops_growing(monkeypatch):
+    driver, stats = run_loader(monkeypatch, [{'count': 20}])
+
+    assert stats['cards'] == 20
+    assert stats['stop_reason'] == 'idle'
+    assert stats['elapsed'] > SCROLL_CONFIG['max_idle_window']
+    assert stats['elapsed'] < SCROLL_CONFIG['max_idle_window'] + 2 * SCROLL_CONFIG['poll_interval']
+
+
+def test_loader_gives_up_after_max_duration(monkeypatch):
+    monkeypatch.setitem(SCROLL_CONFIG, 'max_duration', 5)
+    driver, stats = run_loader(monkeypatch, [lambda poll: {'count': poll}])
+
+    assert stats['stop_reason'] == 'timeout'
+    assert stats['cards'] == stats['polls']
+    assert 5 < stats['elapsed'] <= 5 + SCROLL_CONFIG['poll_interval']
+
+
+class PlaceDriver:
+    capabilities = {'browserName': 'firefox'}
+
+    def __init__(self):
+        self.current_url = None
+        self.visited = []
+
+    def get(self, url):
+        self.current_url = url
+        self.visited.append(url)
+
+
+class FakePool:
+    def __init__(self):
+        self.checked_out = []
+        self.checked_in = []
+        self._lock = threading.Lock()
+
+    def key_for(self, driver):
+        return None
+
+    def checkout(self, browser_type, headless, timeout=None, profile=None):
+        driver = PlaceDriver()
+        with self._lock:
+            self.checked_out.append(driver)
+        return driver
+
+    def checkin(self, driver):
+        with self._lock:
+            self.checked_in.append(driver)
+
+
+def place_url(n):
+    return f'https://www.google.com/maps/place/Cafe+{n}/data=!1s0x{n}:0x{n}'
+
+
+def fake_places(monkeypatch, titles):
+    """Serve rows from a URL -> title map; later URLs finish first"""
+    pool = FakePool()
+    monkeypatch.setattr(integrated_scraper, 'get_driver_pool', lambda: pool)
+
+    def extract(driver):
+        index = list(titles).index(driver.current_url)
+        time.sleep(0.002 * (len(titles) - index))
+        return [titles[driver.current_url], 'N/A', 'Main St', 'N/A', 'N/A']
+
+    monkeypatch.setattr(integrated_scraper, 'extract_place_info', extract)
+    return pool
+
+
+def test_parallel_workers_keep_result_order_and_drop_duplicates(monkeypatch):
+    titles = {place_url(n): f'Cafe {n}' for n in range(8)}
+    titles[place_url(8)] = 'Cafe 3'  # The same place listed twice
+    pool = fake_places(monkeypatch, titles)
+
+    rows = scrape_place_links(PlaceDriver(), list(titles), workers=3)
+
+    assert [row[0] for row in rows] == [f'Cafe {n}' for n in range(8)]
+    assert len(pool.checked_out) == 2 and set(pool.checked_in) == set(pool.checked_out)
+
+
+class JournalStub:
+    def __init__(self, entries=()):
+        self.added = []
+        self.rows = [row for _, row in entries]
+        self.done_ids = {place_id for place_id, _ in entries}
+
+    def add(self, place_id, row, cursor=None):
+        self.added.append((place_id, row[0], cursor))
+
+
+def test_duplicate_rows_are_emitted_and_journaled_once(monkeypatch):
+    titles = {place_url(n): f'Cafe {n}' for n in range(4)}
+    titles[place_url(4)] = 'Cafe 1'  # The same place listed twice
+    fake_places(monkeypatch, titles)
+    journal = JournalStub()
+    emitted = []
+
+    rows = scrape_place_links(PlaceDriver(), list(titles), workers=2, checkpoint=journal,
+                              on_row=lambda row, place_id: emitted.append(row[0]))
+
+    assert sorted(emitted) == ['Cafe 0', 'Cafe 1', 'Cafe 2', 'Cafe 3']
+    assert sorted(title for _, title, _ in journal.added) == sorted(emitted)
+    assert all(cursor == int(place_id[2]) + 1 for place_id, _, cursor in journal.added)
+    assert [row[0] for row in rows] == ['Cafe 0', 'Cafe 1', 'Cafe 2', 'Cafe 3']
+
+
+def test_dedupe_rows_keeps_first_occurrence():
+    rows = [['A', '1'], ['B', '2'], ['A', '1'], ['A', '3']]
+
+    assert dedupe_rows(rows) == [['A', '1'], ['B', '2'], ['A', '3']]
+
+
+class WaitDriver:
+    def __init__(self):
+        self.waits = []
+
+    def implicitly_wait(self, seconds):
+        self.waits.append(seconds)
+
+
+def test_implicit_waits_are_off_inside_the_block_and_restored_after_errors():
+    driver = WaitDriver()
+
+    with pytest.raises(RuntimeError):
+        with implicit_waits_disabled(driver):
+            assert driver.waits == [0]
+            raise RuntimeError('element missing')
+
+    assert driver.waits == [0, SELENIUM_CONFIG['implicit_wait']]
+
+
+def test_direct_navigation_opens_each_url_in_the_given_browser(monkeypatch):
+    titles = {place_url(n): f'Cafe {n}' for n in range(3)}
+    pool = fake_places(monkeypatch, titles)
+    driver = PlaceDriver()
+
+    rows = scrape_place_links(driver, list(titles), workers=1)
+
+    assert driver.visited == list(titles)
+    assert [row[0] for row in rows] == ['Cafe 0', 'Cafe 1', 'Cafe 2']
+    assert pool.checked_out == []
+
+
+def test_direct_navigation_stops_when_asked(monkeypatch):
+    titles = {place_url(n): f'Cafe {n}' for n in range(5)}
+    fake_places(monkeypatch, titles)
+    stop = threading.Event()
+
+    rows = scrape_place_links(PlaceDriver(), list(titles), workers=1,
+                              on_row=lambda row, place_id: stop.set() if row[0] == 'Cafe 1' else None,
+                              stop_event=stop)
+
+    assert [row[0] for row in rows] == ['Cafe 0', 'Cafe 1']
+
+
+def fake_stream(monkeypatch, titles):
+    """Load every URL of titles in one batch and extract rows from the URL -> title map"""
+    pool = FakePool()
+    loads = []
+    monkeypatch.setattr(integrated_scraper, 'get_driver_pool', lambda: pool)
+    monkeypatch.setattr(integrated_scraper, 'find_results_sidebar', lambda driver, query: object())
+
+    def loader(driver, sidebar, target_count, stats, should_stop):
+        loads.append(target_count)
+        yield len(titles)
+
+    monkeypatch.setattr(integrated_scraper, 'follow_results_loader', loader)
+    monkeypatch.setattr(integrated_scraper, 'collect_place_links', lambda driver, start: list(titles)[start:])
+    monkeypatch.setattr(integrated_scraper, 'extract_place_info',
+                        lambda driver: [titles[driver.current_url], 'N/A', 'Main St', 'N/A', 'N/A'])
+    return pool, loads
+
+
+def test_streaming_does_not_start_loading_without_a_consumer_browser(monkeypatch):
+    pool, loads = fake_stream(monkeypatch, {place_url(1): 'Cafe 1'})
+
+    def no_browser(*args, **kwargs):
+        raise RuntimeError('pool exhausted')
+
+    monkeypatch.setattr(pool, 'checkout', no_browser)
+
+    with pytest.raises(RuntimeError):
+        list(stream_results(PlaceDriver(), 'cafes'))
+    assert loads == []
+
+
+def test_streaming_stops_when_asked_and_returns_the_browser(monkeypatch):
+    titles = {place_url(n): f'Cafe {n}' for n in range(5)}
+    pool, loads = fake_stream(monkeypatch, titles)
+    stop = threading.Event()
+
+    rows = list(stream_results(PlaceDriver(), 'cafes', stop_event=stop,
+                               on_row=lambda row, place_id: stop.set() if row[0] == 'Cafe 1' else None))
+
+    assert [row[0] for row in rows] == ['Cafe 0', 'Cafe 1']
+    assert pool.checked_in == pool.checked_out and len(pool.checked_out) == 1
+
+
+def test_resumed_streaming_loads_the_full_target_and_queues_the_rest(monkeypatch):
+    titles = {place_url(n): f'Cafe {n}' for n in range(6)}
+    pool, loads = fake_stream(monkeypatch, titles)
+    journal = JournalStub([(f'0x{n}:0x{n}', [f'Cafe {n}']) for n in range(2)])
+
+    rows = list(stream_results(PlaceDriver(), 'cafes', max_results=4, checkpoint=journal))
+
+    # The journaled places are still listed, so loading stops at the run's limit, not at what is left
+    assert loads == [4]
+    assert [row[0] for row in rows] == ['Cafe 2', 'Cafe 3']
+    assert [place_id for place_id, _, _ in journal.added] == ['0x2:0x2', '0x3:0x3']
+
+
+def test_streamed_places_are_published_as_events(monkeypatch):
+    titles = {place_url(n): f'Cafe {n}' for n in range(2)}
+    fake_stream(monkeypatch, titles)
+    subscription = get_event_bus().subscribe(job_id='stream-job')
+
+    with event_scope(job_id='stream-job'):
+        rows = list(stream_results(PlaceDriver(), 'cafes'))
+
+    events = [subscription.get(0), subscription.get(0)]
+    subscription.close()
+    assert len(rows) == 2
+    assert [(event['type'], event['title'], event['place_id']) for event in events] == [
+        ('place', 'Cafe 0', '0x0:0x0'), ('place', 'Cafe 1', '0x1:0x1')]
+
+
+class CommandDriver:
+    def __init__(self, cards=None):
+        self.cards = cards or []
+        self.sent = []
+
+    def execute(self, driver_command, params=None):
+        self.sent.append(driver_command)
+        return {'value': None}
+
+    def execute_script(self, script, *args):
+        self.execute('executeScript', {'script': script})
+        return [dict(card) for card in self.cards]
+
+
+def test_snapshot_cards_indexes_cards_in_one_script_call():
+    driver = CommandDriver([
+        {'href': place_url(1), 'title': 'Cafe 1', 'rating': '4.5', 'reviews': '(10)'},
+        {'href': None, 'title': 'Sponsored', 'rating': None, 'reviews': None},
+    ])
+
+    cards = snapshot_cards(driver)
+
+    assert driver.sent == ['executeScript']
+    assert [(card['place_id'], card['title']) for card in cards] == [('0x1:0x1', 'Cafe 1'), (None, 'Sponsored')]
+    assert 'querySelectorAll' in CARD_INDEX_SCRIPT
+
+
+def test_command_counter_counts_by_command_and_detaches():
+    driver = CommandDriver()
+    counter = WebDriverCommandCounter()
+
+    counter.attach(driver)
+    counter.attach(driver)
+    driver.execute('get')
+    driver.execute('findElement')
+    driver.execute('findElement')
+    counter.detach(driver)
+    driver.execute('get')
+
+    assert counter.snapshot() == {'total': 3, 'by_command': {'get': 1, 'findElement': 2}}
+    assert counter.per_item(2) == 1.5
+    assert 'execute' not in vars(driver) and driver.sent[-1] == 'get'
+
+
+def test_nested_command_counters_both_count():
+    driver = CommandDriver()
+    outer, inner = WebDriverCommandCounter(), WebDriverCommandCounter()
+
+    outer.attach(driver)
+    inner.attach(driver)
+    driver.execute('get')
+    inner.detach(driver)
+    driver.execute('findElement')
+    outer.detach(driver)
+    driver.execute('quit')
+
+    assert (outer.total, inner.total) == (2, 1)
+    assert driver.sent == ['get', 'findElement', 'quit']
+
+
+def test_command_counters_detached_out_of_order_leave_no_stale_wrapper():
+    driver = CommandDriver()
+    outer, inner = WebDriverCommandCounter(), WebDriverCommandCounter()
+
+    outer.attach(driver)
+    inner.attach(driver)
+    outer.detach(driver)
+    driver.execute('get')
+    inner.detach(driver)
+    driver.execute('quit')
+
+    assert (outer.total, inner.total) == (0, 1)
+    assert 'execute' not in vars(driver)
+    assert driver.sent == ['get', 'quit']
@@ -0,0 +1,97 @@
+import threading
+
+import app as web_app
+from job_manager import CANCELLED, FAILED, FINISHED, QUEUED, RUNNING, JobManager
+
+
+def blocking_job(started, release):
+    def target(job, name):
+        started.set()
+        release.wait(5)
+        job.add_row([name])
+    return target
+
+
+def test_jobs_beyond_the_limit_wait_in_the_queue():
+    manager = JobManager(max_concurrent=1)
+    started, release = threading.Event(), threading.Event()
+    first = manager.submit(blocking_job(started, release), name='a')
+    second = manager.submit(blocking_job(threading.Event(), release), name='b')
+
+    started.wait(5)
+    assert (first.state, second.state) == (RUNNING, QUEUED)
+    assert manager.snapshot(second)['queue_position'] == 0
+
+    release.set()
+    assert first.wait(5) and second.wait(5)
+    assert (first.state, second.state) == (FINISHED, FINISHED)
+    assert second.rows_since(0) == ([['b']], 1, 1)
+    assert [job.id for job in manager.list_jobs()] == [second.id, first.id]
+
+
+def test_cancel_stops_queued_and_running_jobs():
+    manager = JobManager(max_concurrent=1)
+    started = threading.Event()
+
+    def until_cancelled(job):
+        started.set()
+        job.cancel_event.wait(5)
+
+    running = manager.submit(until_cancelled)
+    queued = manager.submit(until_cancelled)
+    started.wait(5)
+
+    manager.cancel(queued.id)
+    assert queued.state == CANCELLED
+    manager.cancel(running.id)
+    assert running.wait(5)
+    assert running.state == CANCELLED
+    assert manager.cancel('missing') is None
+
+
+def test_failed_jobs_record_the_error_and_old_jobs_are_dropped():
+    manager = JobManager(max_concurrent=2, max_finished=2)
+
+    def broken(job, api_key):
+        raise RuntimeError('browser crashed')
+
+    jobs = [manager.submit(broken, api_key='secret') for _ in range(3)]
+    for job in jobs:
+        job.wait(5)
+
+    snapshot = manager.snapshot(jobs[-1], details=True)
+    assert snapshot['state'] == FAILED and snapshot['error'] == 'browser crashed'
+    assert 'api_key' not in snapshot['params']
+    assert len(manager.list_jobs()) == 2
+
+
+def test_jobs_api_rejects_missing_query_and_unknown_jobs():
+    client = web_app.app.test_client()
+
+    assert client.post('/api/jobs', json={}).status_code == 400
+    assert client.get('/api/jobs/unknown').status_code == 404
+    assert client.post('/api/jobs/unknown/cancel').status_code == 404
+    assert 'jobs' in client.get('/api/jobs').get_json()
+
+
+def test_status_stays_small_and_results_come_by_cursor():
+    manager = web_app.job_manager
+
+    def scrape(job):
+        for i in range(3):
+            job.add_row([f'Cafe {i}', 'N/A', 'Main St', 'N/A', 'N/A'])
+        job.update(scraped_count=3, load_stats={'cards': 3, 'rounds': 2})
+
+    job = manager.submit(scrape)
+    job.wait(5)
+    client = web_app.app.test_client()
+
+    status = client.get(f'/api/jobs/{job.id}').get_json()
+    assert status['result_count'] == 3 and 'results' not in status and 'details' not in status
+    assert client.get(f'/api/jobs/{job.id}?details=1').get_json()['details']['load_stats']['cards'] == 3
+
+    first = client.get(f'/api/jobs/{job.id}/results?limit=2').get_json()
+    assert [row['title'] for row in first['rows']] == ['Cafe 0', 'Cafe 1'] and not first['complete']
+    rest = client.get(f'/api/jobs/{job.id}/results?since={first["next"]}').get_json()
+    assert [row['title'] for row in rest['rows']] == ['Cafe 2'] and rest['complete']
+    assert client.get(f'/api/jobs/{job.id}/results?since={rest["next"]}').get_json()['rows'] == []
@@ -0,0 +1,86 @@
+import os
+
+from maps_parser import (
+    count_result_cards, format_rating, is_end_of_list, list_card_to_row, parse_list_cards, parse_place_html,
+    parse_place_pages, parse_place_row, parse_result_cards, place_id_from_href,
+)
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_parse_place_html_reads_every_field():
+    fields = parse_place_html(load_fixture('place_detail.html'))
+
+    assert fields['title'] == "Joe's Pizza"
+    assert fields['rating_text'] == '4.5'
+    assert fields['review_count'] == '(12,345)'
+    assert fields['address'] == '7 Carmine St, New York, NY 10014, United States'
+    assert fields['website'] == 'joespizzanyc.com'
+    assert fields['phone'] == '(212) 366-1182'
+
+
+def test_parse_place_row_matches_scraper_layout():
+    row = parse_place_row(load_fixture('place_detail.html'))
+
+    assert row == [
+        "Joe's Pizza",
+        '4.5 (12,345)',
+        '7 Carmine St, New York, NY 10014, United States',
+        'joespizzanyc.com',
+        '(212) 366-1182',
+    ]
+
+
+def test_sparse_listing_marks_missing_fields():
+    row = parse_place_row(load_fixture('place_detail_sparse.html'))
+
+    assert row == ['Corner Laundromat', 'No reviews', 'N/A', 'N/A', 'N/A']
+
+
+def test_format_rating_falls_back_to_raw_text():
+    assert format_rating(None, None, '4.2(87)') == '(87)'
+    assert format_rating('4.2', None, None) == '4.2'
+    assert format_rating(None, None, None) == 'N/A'
+
+
+def test_result_cards_and_end_marker():
+    html = load_fixture('results_list.html')
+    cards = parse_result_cards(html)
+
+    assert count_result_cards(html) == 3
+    assert [card['title'] for card in cards] == ["Joe's Pizza", 'Prince Street Pizza', 'Sponsored card without link']
+    assert cards[0]['href'].startswith('https://www.google.com/maps/place/')
+    assert is_end_of_list(html)
+
+
+def test_parse_place_pages_keeps_order_across_processes():
+    pages = [load_fixture('place_detail.html'), load_fixture('place_detail_sparse.html')]
+
+    rows = parse_place_pages(pages, processes=2)
+
+    assert [row[0] for row in rows] == ["Joe's Pizza", 'Corner Laundromat']
+
+
+def test_place_id_from_href_prefers_stable_ids():
+    cards = parse_result_cards(load_fixture('results_list.html'))
+
+    assert cards[0]['place_id'] == 'ChIJs7bSe5NZwokRRB1evNxsWk0'
+    assert cards[1]['place_id'] == '0x89c2598eb2a2e6a9:0x7a3c0e4ba5e8a4a8'
+    assert cards[2]['place_id'] is None
+    assert place_id_from_href('https://maps.google.com/?cid=1234567') == '1234567'
+
+
+def test_list_cards_expose_fields_without_detail_panel():
+    cards = parse_list_cards(load_fixture('results_list.html'))
+
+    assert cards[0]['category'] == 'Pizza'
+    assert cards[0]['address'] == '7 Carmine St'
+    assert cards[0]['status'] == 'Open 24 hours'
+    assert cards[1]['status'] == 'Closed · Opens 11:30 AM'
+    assert list_card_to_row(cards[1]) == ['Prince Street Pizza', '4.6 (9,870)', '27 Prince St A', 'N/A', 'N/A',
+                                          'Pizza', 'Closed · Opens 11:30 AM']
@@ -0,0 +1,84 @@
+import csv
+import json
+
+import pytest
+
+from output_writers import CSV_HEADER, LIST_CARD_FIELDS, RowWriter, open_writer, read_jsonl
+
+ROWS = [
+    ['Cafe "A"', '4.5 (120)', '1 Main St', 'cafea.com', '555-0100'],
+    ['Café B', 'N/A', '2 Side St', 'N/A', 'N/A'],
+]
+
+
+def test_csv_writer_appends_query_column(tmp_path):
+    with open_writer('csv', 'cafes in Reno', str(tmp_path)) as writer:
+        writer.write_rows(ROWS)
+
+    with open(writer.path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == CSV_HEADER
+    assert rows[1:] == [row + ['cafes in Reno'] for row in ROWS]
+
+
+@pytest.mark.parametrize('rows', [ROWS, []])
+def test_json_writer_finalizes_envelope(tmp_path, rows):
+    writer = open_writer('json', 'cafes in Reno', str(tmp_path))
+    writer.write_rows(rows)
+    assert writer.close() == writer.filename
+
+    with open(writer.path, encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['search_query'] == 'cafes in Reno'
+    assert data['total_results'] == len(rows)
+    assert [place['title'] for place in data['places']] == [row[0] for row in rows]
+    assert list(data) == ['search_query', 'scraped_at', 'places', 'total_results']
+
+
+def test_jsonl_rows_are_readable_before_close(tmp_path):
+    writer = open_writer('jsonl', 'cafes in Reno', str(tmp_path))
+    writer.write_row(ROWS[0])
+
+    places = read_jsonl(writer.path)
+    assert places == [{'title': 'Cafe "A"', 'rating_and_reviews': '4.5 (120)', 'address': '1 Main St',
+                       'website': 'cafea.com', 'phone': '555-0100', 'search_query': 'cafes in Reno'}]
+
+    writer.write_row(ROWS[1], search_query='coffee in Reno')
+    writer.close()
+    assert [place['search_query'] for place in read_jsonl(writer.path)] == ['cafes in Reno', 'coffee in Reno']
+
+
+def test_row_writer_needs_a_write_implementation(tmp_path):
+    path = tmp_path / 'rows.txt'
+
+    with pytest.raises(TypeError):
+        RowWriter(str(path), 'cafes in Reno')
+    assert not path.exists()
+
+
+def test_writers_opened_in_the_same_second_get_their_own_files(tmp_path):
+    first = open_writer('csv', 'cafes in Reno', str(tmp_path))
+    second = open_writer('csv', 'bars in Reno', str(tmp_path))
+    assert first.path != second.path
+
+    first.write_row(ROWS[0])
+    first.close()
+    second.close()
+    with open(first.path, newline='', encoding='utf-8') as f:
+        assert list(csv.reader(f))[1:] == [ROWS[0] + ['cafes in Reno']]
+
+
+def test_list_card_category_and_status_are_stored(tmp_path):
+    row = ROWS[1] + ['Cafe', 'Open 24 hours']
+    with open_writer('csv', 'cafes in Reno', str(tmp_path), extra_fields=LIST_CARD_FIELDS) as writer:
+        writer.write_row(row)
+    with open(writer.path, newline='', encoding='utf-8') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == CSV_HEADER + ['Category', 'Status']
+    assert rows[1] == ROWS[1] + ['cafes in Reno', 'Cafe', 'Open 24 hours']
+
+    writer = open_writer('jsonl', 'cafes in Reno', str(tmp_path))
+    writer.write_row(row)
+    writer.close()
+    assert read_jsonl(writer.path)[0]['category'] == 'Cafe'
+    assert read_jsonl(writer.path)[0]['status'] == 'Open 24 hours'
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+from place_index import PlaceIndex
+
+
+def card(place_id, title, rating=None, reviews=None):
+    return {'place_id': place_id, 'href': f'https://www.google.com/maps/place/{place_id}',
+            'title': title, 'rating': rating, 'reviews': reviews}
+
+
+def test_record_and_lookup_round_trip():
+    index = PlaceIndex(':memory:')
+    index.record([('ChIJa', 'https://maps/a', ['Cafe A', '4.5 (10)', 'Main St', 'cafea.com', '555']),
+                  (None, 'https://maps/ad', ['Sponsored', 'N/A', 'N/A', 'N/A', 'N/A'])])
+
+    entries = index.lookup(['ChIJa', 'ChIJb'])
+
+    assert list(entries) == ['ChIJa']
+    assert entries['ChIJa']['row'] == ['Cafe A', '4.5 (10)', 'Main St', 'cafea.com', '555']
+    assert index.count() == 1
+
+
+def test_split_known_refreshes_rating_without_opening():
+    index = PlaceIndex(':memory:')
+    index.record([('ChIJa', 'https://maps/a', ['Cafe A', '4.5 (10)', 'Main St', 'cafea.com', '555'])])
+    cards = [card('ChIJa', 'Cafe A', '4.6', '(12)'), card('ChIJb', 'Cafe B')]
+
+    to_scrape, reused = index.split_known(cards, 'refresh')
+
+    assert [c['place_id'] for c in to_scrape] == ['ChIJb']
+    assert reused == [('ChIJa', ['Cafe A', '4.6 (12)', 'Main St', 'cafea.com', '555'])]
+    assert index.lookup(['ChIJa'])['ChIJa']['times_seen'] == 2
+
+    to_scrape, reused = index.split_known(cards, 'skip')
+    assert [c['place_id'] for c in to_scrape] == ['ChIJb']
+    assert reused == []
+
+
+def test_stale_places_are_scraped_again():
+    index = PlaceIndex(':memory:', refresh_after_days=7)
+    index.record([('ChIJa', 'https://maps/a', ['Cafe A', 'N/A', 'N/A', 'N/A', 'N/A'])])
+    entry = index.lookup(['ChIJa'])['ChIJa']
+
+    assert not index.is_stale(entry)
+    assert index.is_stale(entry, now=datetime.now() + timedelta(days=8))
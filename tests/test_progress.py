@@ -0,0 +1,60 @@
+import progress
+from progress import ProgressTracker, StageMeter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_meter_reports_rate_latency_and_eta(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(progress.time, 'monotonic', clock)
+    meter = StageMeter('scrape', total=10, window=2)
+
+    meter.start()
+    for seconds in (1, 3, 3):
+        clock.now += seconds
+        meter.tick()
+    snapshot = meter.snapshot()
+
+    assert (snapshot['state'], snapshot['done'], snapshot['elapsed_s']) == ('running', 3, 7.0)
+    assert snapshot['avg_latency_s'] == 3.0 and snapshot['items_per_minute'] == 20.0
+    assert snapshot['eta_seconds'] == 21
+
+    meter.finish()
+    assert meter.snapshot()['eta'] is None and meter.fraction() == 1.0
+
+
+def test_meter_follows_running_totals(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(progress.time, 'monotonic', clock)
+    meter = StageMeter('load', total=40)
+
+    meter.start()
+    clock.now += 2
+    meter.advance_to(20)
+
+    snapshot = meter.snapshot()
+    assert snapshot['done'] == 20 and snapshot['avg_latency_s'] == 0.1 and snapshot['eta_seconds'] == 2
+
+
+def test_tracker_weights_stages_and_throttles_reports(monkeypatch):
+    monkeypatch.setitem(progress.PROGRESS_CONFIG, 'stage_weights', {'load': 10, 'scrape': 90})
+    reports = []
+    tracker = ProgressTracker(['load', 'scrape'], on_change=reports.append, min_interval=60)
+
+    tracker.stage('load').finish()
+    scrape = tracker.stage('scrape')
+    scrape.add_total(3)
+    scrape.tick()
+    scrape.tick()
+
+    assert tracker.percent() == 70
+    assert [report['progress'] for report in reports] == [10]
+    scrape.finish()
+    assert reports[-1]['progress'] == 100 and reports[-1]['stages']['scrape']['done'] == 2
+    assert tracker.stage('enrichment') is None
@@ -0,0 +1,86 @@
+import sqlite3
+
+from config import RESULTS_STORE_CONFIG
+from results_store import SCHEMA, ResultsStore, parse_run_source
+
+
+def row(title, address='Main St'):
+    return [title, '4.5 (10)', address, 'N/A', '555']
+
+
+def test_recorder_batches_rows_until_close(monkeypatch):
+    monkeypatch.setitem(RESULTS_STORE_CONFIG, 'batch_size', 2)
+    store = ResultsStore(':memory:')
+    run_id = store.start_run('cafes')
+    recorder = store.recorder(run_id, 'cafes')
+
+    recorder.write_row(row('Cafe A'), 'ChIJa')
+    assert store.count_places(run_id) == 0
+    recorder.write_row(row('Cafe B'), 'ChIJb')
+    recorder.write_row(row('Cafe C'), None)
+    assert store.count_places(run_id) == 2
+    recorder.close()
+    store.finish_run(run_id, output_file='scraped_data_1.csv')
+
+    places = store.get_places(run_id)
+    assert [place['title'] for place in places] == ['Cafe A', 'Cafe B', 'Cafe C']
+    assert places[0]['place_id'] == 'ChIJa' and 'place_id' not in places[2]
+    run = store.list_runs()[0]
+    assert run['total_results'] == 3 and run['status'] == 'finished' and run['emails'] == 0
+
+
+def test_enrichment_filters_places_by_email():
+    store = ResultsStore(':memory:')
+    run_id = store.record_run('cafes', [row('Cafe A'), row('Cafe B'), row('Cafe C')])
+
+    updated = store.set_enrichment(run_id, [
+        {'title': 'Cafe A', 'address': 'Main St', 'email': 'a@cafe.com', 'extraction_status': 'success'},
+        {'title': 'Cafe B', 'address': 'Main St', 'email': 'N/A', 'extraction_status': 'failed'},
+        {'title': 'Unknown', 'address': 'Elsewhere', 'email': 'x@y.com'},
+    ])
+
+    assert updated == 2
+    with_email = store.get_places(run_id, has_email=True)
+    assert [(place['title'], place['email']) for place in with_email] == [('Cafe A', 'a@cafe.com')]
+    assert store.count_places(run_id, has_email=False) == 2
+    assert [place['title'] for place in store.get_places(run_id, offset=1, limit=1)] == ['Cafe B']
+
+
+def test_resumed_checkpoint_reuses_its_run():
+    store = ResultsStore(':memory:')
+    first = store.start_run('cafes', checkpoint_id='run_1')
+    store.insert_places(first, [(0, 'ChIJa', row('Cafe A'), 'cafes')])
+
+    resumed = store.start_run('cafes', checkpoint_id='run_1')
+
+    assert resumed == first
+    assert store.count_places(first) == 0
+    store.finish_run(first)
+    assert store.start_run('cafes', checkpoint_id='run_1') != first
+
+
+def test_iter_places_reads_a_run_in_batches():
+    store = ResultsStore(':memory:')
+    run_id = store.record_run('cafes', [row(f'Cafe {i}') for i in range(5)])
+    store.record_run('bars', [row('Bar A')])
+
+    places = list(store.iter_places(run_id, batch_size=2))
+
+    assert [place['title'] for place in places] == [f'Cafe {i}' for i in range(5)]
+    assert parse_run_source(f'run:{run_id}') == run_id
+    assert parse_run_source('scraped_data_1.csv') is None
+
+
+def test_list_card_fields_are_stored_and_added_to_old_stores(tmp_path):
+    path = str(tmp_path / 'results.db')
+    with sqlite3.connect(path) as conn:
+        conn.executescript(SCHEMA.replace("category TEXT,", "").replace("status TEXT,\n        scraped_at", "scraped_at"))
+    conn.close()
+    store = ResultsStore(path)
+
+    run_id = store.record_run('cafes', [row('Cafe A') + ['Coffee shop', 'Open'], row('Cafe B')])
+
+    places = store.get_places(run_id)
+    assert (places[0]['category'], places[0]['status']) == ('Coffee shop', 'Open')
+    assert 'category' not in places[1]
+    assert [stored for stored, _ in store.iter_rows(run_id)] == [row('Cafe A') + ['Coffee shop', 'Open'], row('Cafe B')]
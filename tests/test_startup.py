@@ -0,0 +1,19 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_after_import(module, candidates):
+    code = f"import sys; import {module}; print(','.join(name for name in {candidates!r} if name in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+def test_web_app_defers_heavy_imports():
+    assert loaded_after_import('app', ['selenium', 'openai', 'pandas', 'bs4', 'integrated_scraper']) == []
+
+
+def test_cli_defers_email_extractors():
+    assert loaded_after_import('integrated_scraper', ['email_extractor', 'free_email_extractor', 'openai']) == []
@@ -0,0 +1,116 @@
+import pytest
+
+import tiling
+from config import TILING_CONFIG
+
+AUSTIN = (30.10, -97.95, 30.52, -97.56)
+
+
+def test_parse_bbox():
+    assert tiling.parse_bbox("30.1,-97.95,30.52,-97.56") == AUSTIN
+    assert tiling.parse_bbox("Austin, TX") is None
+    assert tiling.parse_bbox("30.5,-97.9,30.1,-97.5") is None  # south above north
+
+
+def test_plan_tiles_covers_bbox_with_viewport_sized_tiles():
+    tiles = tiling.plan_tiles(AUSTIN, zoom=13)
+    lat_span, lng_span = tiling.viewport_span(13, 30.31)
+
+    assert len(tiles) > 1
+    assert min(t['south'] for t in tiles) == pytest.approx(AUSTIN[0])
+    assert max(t['east'] for t in tiles) == pytest.approx(AUSTIN[3])
+    for tile in tiles:
+        assert tile['north'] - tile['south'] <= lat_span
+        assert tile['east'] - tile['west'] <= lng_span
+    # Zooming in by one level needs about four times as many tiles
+    assert len(tiling.plan_tiles(AUSTIN, zoom=14)) >= 3 * len(tiles)
+
+
+def test_subdivide_and_tile_url():
+    tile = {'south': 0.0, 'west': 0.0, 'north': 2.0, 'east': 2.0, 'zoom': 12, 'depth': 0}
+    children = tiling.subdivide(tile)
+
+    assert len(children) == 4
+    assert {(c['south'], c['west']) for c in children} == {(0.0, 0.0), (0.0, 1.0), (1.0, 0.0), (1.0, 1.0)}
+    assert all(c['zoom'] == 13 and c['depth'] == 1 for c in children)
+    assert tiling.tile_url("coffee shops", children[0]) == \
+        "https://www.google.com/maps/search/coffee+shops/@0.500000,0.500000,13z"
+
+
+class TileDriver:
+    url = None
+
+    def get(self, url):
+        self.url = url
+
+
+def fake_scrape_results(monkeypatch, cards_for, failing=()):
+    """Scrape the cards of the current tile; places in failing fail on their first attempt"""
+    scraped = []
+    attempted = set()
+
+    def fake_scrape(driver, query, max_results, skip_place_ids=None, on_row=None, **kwargs):
+        rows = []
+        for card in cards_for(driver):
+            place_id = card['place_id']
+            if place_id in skip_place_ids or (max_results and len(rows) >= max_results):
+                continue
+            if place_id in failing and place_id not in attempted:
+                attempted.add(place_id)
+                continue
+            scraped.append(place_id)
+            rows.append([place_id, 'N/A', 'N/A', 'N/A', 'N/A'])
+            on_row(rows[-1], place_id)
+        return rows
+
+    monkeypatch.setattr(tiling, 'scrape_results', fake_scrape)
+    return scraped
+
+
+def test_scrape_tiled_splits_capped_tiles_and_dedupes(monkeypatch):
+    cap = TILING_CONFIG['result_cap']
+    root = {'south': 0.0, 'west': 0.0, 'north': 1.0, 'east': 1.0, 'zoom': 12, 'depth': 0}
+
+    def fake_scroll(driver, query):
+        return {'cards': cap if driver.url.endswith(',12z') else 3}
+
+    def fake_cards(driver):
+        # Neighbouring quadrants share one place on their border
+        index = driver.url.split('@')[1]
+        return [{'place_id': f'{index}-{n}'} for n in range(2)] + [{'place_id': 'shared'}]
+
+    monkeypatch.setattr(tiling, 'plan_tiles', lambda bbox, zoom: [root])
+    monkeypatch.setattr(tiling, 'scroll_to_load_results', fake_scroll)
+    monkeypatch.setattr(tiling, 'snapshot_cards', fake_cards)
+    scraped = fake_scrape_results(monkeypatch, fake_cards)
+
+    rows, stats = tiling.scrape_tiled(TileDriver(), 'cafes', '0,0,1,1')
+
+    assert stats['tiles_split'] == 1
+    assert stats['tiles_searched'] == 5
+    assert len(rows) == 9  # 4 tiles x 2 own places + the shared one once
+    assert scraped.count('shared') == 1
+    assert stats['unique_places'] == 9
+
+
+def test_places_that_failed_in_one_tile_are_retried_in_the_next(monkeypatch):
+    tiles = [{'south': float(n), 'west': 0.0, 'north': n + 1.0, 'east': 1.0, 'zoom': 14, 'depth': 0}
+             for n in range(2)]
+    tile_cards = {'0.5': ['a', 'shared'], '1.5': ['shared', 'b']}
+
+    def fake_cards(driver):
+        south = driver.url.split('@')[1].split(',')[0].rstrip('0')
+        return [{'place_id': place_id} for place_id in tile_cards[south]]
+
+    monkeypatch.setattr(tiling, 'plan_tiles', lambda bbox, zoom: tiles)
+    monkeypatch.setattr(tiling, 'scroll_to_load_results', lambda driver, query: {'cards': 2})
+    monkeypatch.setattr(tiling, 'snapshot_cards', fake_cards)
+    scraped = fake_scrape_results(monkeypatch, fake_cards, failing={'shared'})
+    seen = []
+
+    rows, stats = tiling.scrape_tiled(TileDriver(), 'cafes', '0,0,2,1',
+                                      on_row=lambda row, place_id: seen.append(place_id))
+
+    assert scraped == ['a', 'shared', 'b']
+    assert seen == scraped and len(rows) == 3
+    assert stats['unique_places'] == 3
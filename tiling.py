@@ -0,0 +1,210 @@
+"""
+Geographic tiling: split a large area into map viewports so one query can
+return more than the ~120 places Maps lists for a single search.
+"""
+
+import math
+from collections import deque
+
+import requests
+
+from config import TILING_CONFIG
+from integrated_scraper import scrape_results, scroll_to_load_results, snapshot_cards
+
+
+def parse_bbox(text):
+    """
+    Parse "south,west,north,east" into a bounding box tuple
+
+    Returns:
+        tuple: (south, west, north, east) or None if text is not a bounding box
+    """
+    try:
+        south, west, north, east = (float(part) for part in text.split(','))
+    except (AttributeError, ValueError):
+        return None
+    if not (-90 <= south < north <= 90 and -180 <= west < east <= 180):
+        return None
+    return south, west, north, east
+
+
+def geocode_bbox(area):
+    """
+    Look up the bounding box of a city or region with OpenStreetMap Nominatim
+
+    Args:
+        area (str): Place name, e.g. "Austin, TX"
+
+    Returns:
+        tuple: (south, west, north, east)
+    """
+    response = requests.get(
+        TILING_CONFIG['geocoder_url'],
+        params={'q': area, 'format': 'json', 'limit': 1},
+        headers={'User-Agent': 'Google-Maps-Scrapper/2.0 (area tiling)'},
+        timeout=TILING_CONFIG['geocoder_timeout'],
+    )
+    response.raise_for_status()
+    matches = response.json()
+    if not matches:
+        raise ValueError(f"Could not find an area called '{area}'")
+    south, north, west, east = (float(value) for value in matches[0]['boundingbox'])
+    return south, west, north, east
+
+
+def resolve_area(area):
+    """Return the bounding box for "south,west,north,east" or a place name"""
+    return parse_bbox(area) or geocode_bbox(area)
+
+
+def viewport_span(zoom, latitude):
+    """
+    Degrees of latitude and longitude visible in the map viewport at a zoom level
+
+    Web Mercator shows 256 px per world width at zoom 0; latitude degrees
+    shrink with cos(latitude) away from the equator.
+
+    Returns:
+        tuple: (lat_span, lng_span)
+    """
+    width_px, height_px = TILING_CONFIG['viewport_px']
+    degrees_per_px = 360.0 / (256 * 2 ** zoom)
+    lng_span = width_px * degrees_per_px
+    lat_span = height_px * degrees_per_px * math.cos(math.radians(latitude))
+    return lat_span, lng_span
+
+
+def plan_tiles(bbox, zoom=None):
+    """
+    Cover a bounding box with a grid of viewport-sized tiles
+
+    Args:
+        bbox (tuple): (south, west, north, east)
+        zoom (int): Zoom level of the tiles
+
+    Returns:
+        list: Tile dicts with south, west, north, east, zoom and depth
+    """
+    zoom = zoom or TILING_CONFIG['default_zoom']
+    south, west, north, east = bbox
+    lat_span, lng_span = viewport_span(zoom, (south + north) / 2)
+    rows = max(1, math.ceil((north - south) / lat_span))
+    cols = max(1, math.ceil((east - west) / lng_span))
+    row_height = (north - south) / rows
+    col_width = (east - west) / cols
+
+    return [{
+        'south': south + r * row_height,
+        'west': west + c * col_width,
+        'north': south + (r + 1) * row_height,
+        'east': west + (c + 1) * col_width,
+        'zoom': zoom,
+        'depth': 0,
+    } for r in range(rows) for c in range(cols)]
+
+
+def subdivide(tile):
+    """Split a tile into four quadrants one zoom level closer"""
+    mid_lat = (tile['south'] + tile['north']) / 2
+    mid_lng = (tile['west'] + tile['east']) / 2
+    quadrants = [
+        (tile['south'], tile['west'], mid_lat, mid_lng),
+        (tile['south'], mid_lng, mid_lat, tile['east']),
+        (mid_lat, tile['west'], tile['north'], mid_lng),
+        (mid_lat, mid_lng, tile['north'], tile['east']),
+    ]
+    return [{
+        'south': south, 'west': west, 'north': north, 'east': east,
+        'zoom': tile['zoom'] + 1,
+        'depth': tile['depth'] + 1,
+    } for south, west, north, east in quadrants]
+
+
+def tile_url(query, tile):
+    """Search URL centred on the tile at the tile's zoom level"""
+    lat = (tile['south'] + tile['north']) / 2
+    lng = (tile['west'] + tile['east']) / 2
+    return f"https://www.google.com/maps/search/{query.replace(' ', '+')}/@{lat:.6f},{lng:.6f},{tile['zoom']}z"
+
+
+def is_capped(card_count):
+    """True when a tile returned about as many cards as Maps will ever list"""
+    return card_count >= TILING_CONFIG['result_cap'] * TILING_CONFIG['saturation_ratio']
+
+
+def scrape_tiled(driver, query, area, zoom=None, max_results=None, workers=1, navigation_mode='click',
+                 parse_engine='live', list_only=False, place_index=None, known_places=None, checkpoint=None,
+                 on_row=None, stop_event=None, meter=None):
+    """
+    Run a query over every tile of an area, splitting tiles that hit the result cap
+
+    Each tile is a separate viewport search. Places already scraped in an
+    earlier tile are recognised by place ID and never opened again.
+
+    Args:
+        driver: WebDriver to run the sub-searches in
+        query (str): Search query without location, e.g. "dentists"
+        area (str): "south,west,north,east" or a place name to geocode
+        zoom (int): Starting zoom level
+        max_results (int): Stop after this many unique places (None for all)
+        workers, navigation_mode, parse_engine, list_only, place_index, known_places, checkpoint,
+        on_row, stop_event, meter: Passed to scrape_results; a set stop_event also ends the tile loop
+
+    Returns:
+        tuple: (place rows, tiling stats)
+    """
+    bbox = resolve_area(area)
+    pending = deque(plan_tiles(bbox, zoom))
+    stats = {'bbox': bbox, 'tiles_planned': len(pending), 'tiles_searched': 0, 'tiles_split': 0,
+             'capped_at_max_zoom': 0, 'cards_seen': 0, 'unique_places': 0}
+    print(f"🧩 Covering {area} with {len(pending)} tiles")
+
+    rows = []
+    seen_ids = set()  # Places scraped so far; later tiles skip them
+    listed_ids = set()  # Every place a tile listed, scraped or not
+
+    def on_place(row, place_id=None):
+        # Only places that were actually extracted count as seen, so cards cut off
+        # by max_results or whose extraction failed can still come from a later tile
+        if place_id:
+            seen_ids.add(place_id)
+        if on_row is not None:
+            on_row(row, place_id)
+
+    while pending:
+        if max_results and len(rows) >= max_results:
+            break
+        if stop_event is not None and stop_event.is_set():
+            break
+
+        tile = pending.popleft()
+        stats['tiles_searched'] += 1
+        print(f"🗺️  Tile {stats['tiles_searched']} (zoom {tile['zoom']}, {len(pending)} queued)")
+        driver.get(tile_url(query, tile))
+        load_stats = scroll_to_load_results(driver, query)
+
+        if is_capped(load_stats['cards']):
+            if tile['zoom'] < TILING_CONFIG['max_zoom']:
+                # The four quadrants cover the same ground, so this tile is not scraped
+                print(f"✂️  Tile hit the result cap ({load_stats['cards']} cards), splitting it")
+                pending.extend(subdivide(tile))
+                stats['tiles_split'] += 1
+                continue
+            stats['capped_at_max_zoom'] += 1
+
+        tile_ids = {card['place_id'] for card in snapshot_cards(driver) if card['place_id']}
+        stats['cards_seen'] += len(tile_ids)
+        listed_ids |= tile_ids
+        if not tile_ids - seen_ids:
+            continue
+
+        remaining = max_results - len(rows) if max_results else None
+        rows.extend(scrape_results(driver, query, remaining, workers=workers, navigation_mode=navigation_mode,
+                                   parse_engine=parse_engine, list_only=list_only, skip_place_ids=seen_ids,
+                                   place_index=place_index, known_places=known_places, checkpoint=checkpoint,
+                                   on_row=on_place, stop_event=stop_event, meter=meter))
+
+    stats['unique_places'] = len(listed_ids)
+    print(f"🧩 Tiling finished: {len(rows)} places from {stats['tiles_searched']} tiles "
+          f"({stats['tiles_split']} split)")
+    return rows, stats
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the web UI and CLI entry points
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+each entry point, reports the cumulative import time and the slowest
+imports, and exits non-zero when a module goes over its budget.
+
+Usage:
+    python utils/import_benchmark.py
+    python utils/import_benchmark.py app --budget-ms 300 --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed per entry point, in milliseconds
+BUDGETS_MS = {
+    'app': 500,
+    'integrated_scraper': 600,
+    'batch_scraper': 700,
+}
+
+# Heavy packages that must not be loaded just by importing the entry point
+DEFERRED_MODULES = {
+    'app': ['selenium', 'openai', 'pandas', 'bs4'],
+}
+
+
+def measure_imports(module, runs=3):
+    """
+    Import a module in fresh interpreters and parse the -X importtime report
+
+    Args:
+        module (str): Module to import
+        runs (int): Interpreters to start; the fastest run is kept to reduce noise
+
+    Returns:
+        tuple: (total milliseconds, {imported module: cumulative microseconds}, loaded deferred modules)
+    """
+    deferred = DEFERRED_MODULES.get(module, [])
+    code = (f"import sys; import {module}; "
+            f"print(','.join(name for name in {deferred!r} if name in sys.modules))")
+    best = None
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                                cwd=ROOT, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+        timings = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+            timings[name] = int(cumulative)
+        loaded = [name for name in result.stdout.strip().split(',') if name]
+        total_ms = timings.get(module, 0) / 1000
+        if best is None or total_ms < best[0]:
+            best = (total_ms, timings, loaded)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import time of the entry points against a budget")
+    parser.add_argument('modules', nargs='*', default=list(BUDGETS_MS), help="Modules to measure")
+    parser.add_argument('--budget-ms', type=float, help="Budget for every module (overrides the defaults)")
+    parser.add_argument('--top', type=int, default=10, help="Slowest imports to list per module")
+    parser.add_argument('--runs', type=int, default=3, help="Interpreters started per module")
+    args = parser.parse_args()
+
+    failed = []
+    for module in args.modules:
+        budget = args.budget_ms or BUDGETS_MS.get(module, 1000)
+        total_ms, timings, loaded = measure_imports(module, args.runs)
+        within = total_ms <= budget and not loaded
+        print(f"{'✅' if within else '❌'} {module}: {total_ms:.0f} ms (budget {budget:.0f} ms)")
+        if loaded:
+            print(f"   ⚠️  Loaded at import time: {', '.join(loaded)}")
+        slowest = sorted((name for name in timings if name != module), key=timings.get, reverse=True)
+        for name in slowest[:args.top]:
+            print(f"   {timings[name] / 1000:8.1f} ms  {name}")
+        if not within:
+            failed.append(module)
+
+    if failed:
+        print(f"\n❌ Over budget: {', '.join(failed)}")
+        sys.exit(1)
+    print("\n✅ All entry points are within budget")
+
+
+if __name__ == "__main__":
+    main()